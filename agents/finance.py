@@ -1,22 +1,97 @@
-from pydantic_ai import Agent, RunContext
+from typing import Optional
+from datetime import datetime
+from pydantic_ai import Agent, RunContext, FunctionToolset
 from finance.repositories.transaction_repository import TransactionRepository
 from core.dependencies import FinanceDependencies
 from finance.services.ledger import LedgerService
 from finance.services.advisor import AdvisorService
 from finance.services.categories import CategoryService
+from finance.services.insights import InsightService
+from finance.services.fast_path import FastPathService
+from finance.budget import current_month
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType
 from core.observability import log_and_handle_error
+from core.metrics import AgentMetrics
 from prompts.persona import FINANCIAL_PERSONA, SUMMARY_TEMPLATE
 from core.settings import settings
 
+# Ledger tools live in a shared toolset so the strategy agent and the web router
+# can call them directly instead of running a nested finance_agent conversation.
+finance_toolset = FunctionToolset()
+
+def ledger_snapshot(ctx: RunContext[FinanceDependencies]) -> str:
+    """
+    Current balances, month-to-date spend and newest transactions, so simple questions need no tool call.
+    Re-evaluated on every run; the digest itself is only rebuilt when the ledger changes.
+    """
+    return ctx.deps.ledger_digest()
+
+def build_finance_agent(model=None) -> Agent:
+    """
+    A Finance Agent bound to `model`. Agents are never mutated after construction,
+    so one instance can serve any number of concurrent runs.
+    """
+    agent = Agent(
+        model,
+        name='finance_agent',
+        deps_type=FinanceDependencies,
+        system_prompt=FINANCIAL_PERSONA,
+        toolsets=[finance_toolset],
+        # LLM latency / tokens and per-tool latency
+        capabilities=[AgentMetrics()]
+    )
+    agent.system_prompt(dynamic=True)(ledger_snapshot)
+    return agent
+
 # Initialize the Professional Financial Assistant
-# We don't define the model here anymore to allow injection
-finance_agent = Agent(
-    'openai:gpt-4o', # Default, will be overridden by container
-    deps_type=FinanceDependencies,
-    system_prompt=FINANCIAL_PERSONA
-)
-
-@finance_agent.tool
+# Default instance; pass run(model=...) or use core.container.create_finance_agent for another model
+finance_agent = build_finance_agent('openai:gpt-4o')
+
+# Tools that never modify the ledger; runs that only call these can be answered from cache
+READ_ONLY_TOOLS = {
+    "view_history", "get_financial_advice", "get_budget_plan",
+    "spending_summary", "top_merchants", "month_over_month", "recent_transactions",
+    "budget_status", "recurring_charges", "search_transactions", "balance_on",
+}
+
+# Matches summed by search_transactions per ledger; only the first `limit` are listed.
+# When a ledger hits the cap the output says its totals are partial.
+SEARCH_TOTAL_CAP = 1000
+
+def format_expense_ticket(expense: Transaction) -> str:
+    return SUMMARY_TEMPLATE.format(
+        category=expense.category.value,
+        amount=expense.amount,
+        description=expense.description
+    )
+
+def format_income_receipt(income: Transaction, source: str) -> str:
+    return f"💰 Income Recorded: +${income.amount:.2f} from {source}"
+
+def with_expense_alerts(deps: FinanceDependencies, ledger: LedgerService, expense: Transaction, text: str) -> str:
+    """
+    Append outlier flags and the overspend / near-limit warning for a just-recorded expense, if any.
+    """
+    alerts = [a.message for a in ledger.last_anomalies]
+    if deps.budget_tracker is not None:
+        alerts.append(deps.budget_tracker.alert_for(expense))
+    return "\n".join([text] + [a for a in alerts if a])
+
+def try_fast_path(deps: FinanceDependencies, user_input: str) -> Optional[str]:
+    """
+    Record simple entries ("I spent $15 on lunch") without an LLM round trip.
+    Returns the confirmation text, or None if the agent should handle the message.
+    """
+    ledger = deps.ledger_service()
+    tx = FastPathService(ledger).try_record(user_input)
+    if tx is None:
+        return None
+    if tx.type == TransactionType.INCOME:
+        return format_income_receipt(tx, tx.description)
+    return with_expense_alerts(deps, ledger, tx, format_expense_ticket(tx))
+
+@finance_toolset.tool
 @log_and_handle_error
 def add_expense(ctx: RunContext[FinanceDependencies], amount: float, category: str, description: str) -> str:
     """
@@ -26,17 +101,13 @@ def add_expense(ctx: RunContext[FinanceDependencies], amount: float, category: s
         category: Category of expense (food, transport, entertainment, etc.)
         description: Brief details of the purchase.
     """
-    ledger = LedgerService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    ledger = ctx.deps.ledger_service()
     # Use CategoryService for robust mapping
     expense_cat = CategoryService.map_to_category(category)
     expense = ledger.record_expense(amount, expense_cat, description)
-    return SUMMARY_TEMPLATE.format(
-        category=expense.category.value,
-        amount=expense.amount,
-        description=expense.description
-    )
+    return with_expense_alerts(ctx.deps, ledger, expense, format_expense_ticket(expense))
 
-@finance_agent.tool
+@finance_toolset.tool
 @log_and_handle_error
 def add_income(ctx: RunContext[FinanceDependencies], amount: float, source: str, description: str = "") -> str:
     """
@@ -46,36 +117,38 @@ def add_income(ctx: RunContext[FinanceDependencies], amount: float, source: str,
         source: Source of income (Salary, Freelance, Gift, etc.)
         description: Optional details.
     """
-    ledger = LedgerService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    ledger = ctx.deps.ledger_service()
     income = ledger.record_income(amount, source, description)
-    return f"💰 Income Recorded: +${income.amount:.2f} from {source}"
+    return format_income_receipt(income, source)
 
-@finance_agent.tool
+@finance_toolset.tool
 @log_and_handle_error
-def view_history(ctx: RunContext[FinanceDependencies], category_name: str = "all") -> str:
+def view_history(ctx: RunContext[FinanceDependencies], category_name: str = "all", limit: int = 20, offset: int = 0) -> str:
     """
-    Retrieve and format the transaction history (Income and Expenses).
+    Retrieve and format the transaction history (Income and Expenses), newest first.
+    Totals always cover the full history; long histories are paged.
     Args:
         category_name: Optional category to filter by (or 'all').
+        limit: Maximum number of rows to show (default 20).
+        offset: Number of newest rows to skip, for paging through older entries.
     """
-    ledger = LedgerService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    ledger = ctx.deps.ledger_service()
     category = None
     if category_name and category_name.lower() != 'all':
         category = CategoryService.map_to_category(category_name)
     
     expenses = ledger.get_transaction_history(category)
-    return ledger.format_history_report(category, expenses)
+    return ledger.format_history_report(category, expenses, limit=limit, offset=offset)
 
-@finance_agent.tool
+@finance_toolset.tool
 @log_and_handle_error
 def get_financial_advice(ctx: RunContext[FinanceDependencies]) -> str:
     """
     Analyze spending patterns and provide actionable financial advice.
     """
     advisor = AdvisorService()
-    ledger = LedgerService(ctx.deps.expense_repo, ctx.deps.income_repo)
-    expenses = ledger.get_transaction_history()
-    analysis = advisor.analyze_spending(expenses)
+    totals = ctx.deps.expense_repo.totals_by_category()
+    analysis = advisor.analyze_category_totals({r.key: r.total for r in totals})
     
     res = f"FINANCIAL ANALYSIS\n{'='*20}\n"
     res += f"Total Spending: ${analysis.total_spent:.2f}\n"
@@ -85,7 +158,7 @@ def get_financial_advice(ctx: RunContext[FinanceDependencies]) -> str:
         res += f"- {rec}\n"
     return res
 
-@finance_agent.tool
+@finance_toolset.tool
 @log_and_handle_error
 def get_budget_plan(ctx: RunContext[FinanceDependencies], monthly_income: float) -> str:
     """
@@ -104,3 +177,181 @@ def get_budget_plan(ctx: RunContext[FinanceDependencies], monthly_income: float)
     for s in plan.advice:
         res += f"• {s}\n"
     return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def spending_summary(ctx: RunContext[FinanceDependencies], period: str = "this_month") -> str:
+    """
+    Total spending per category for a period. Prefer this over view_history for "how much" questions.
+    Args:
+        period: this_month, last_month, last_7_days, last_30_days, last_90_days, this_year, all, or YYYY-MM.
+    """
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    summaries = insights.spending_by_category(period)
+    income = insights.income_total(period)
+    total = sum(s.total_amount for s in summaries)
+    res = f"SPENDING {period}: ${total:.2f} | INCOME: ${income:.2f}\n"
+    for s in summaries:
+        res += f"{s.category.value}: ${s.total_amount:.2f} ({s.expense_count} tx, {s.percentage:.0f}%)\n"
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def top_merchants(ctx: RunContext[FinanceDependencies], period: str = "this_month", limit: int = 5) -> str:
+    """
+    Largest payees by total spend for a period.
+    Args:
+        period: this_month, last_month, last_30_days, this_year, all, or YYYY-MM.
+        limit: How many merchants to return (default 5).
+    """
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    rows = insights.top_merchants(period, limit)
+    if not rows:
+        return f"No spending found for {period}."
+    res = f"TOP MERCHANTS {period}\n"
+    for r in rows:
+        res += f"{r.key}: ${r.total:.2f} ({r.count} tx)\n"
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def month_over_month(ctx: RunContext[FinanceDependencies], category_name: str = "all") -> str:
+    """
+    Compare this month's spending with last month's.
+    Args:
+        category_name: Optional category to compare (or 'all').
+    """
+    category = None
+    if category_name and category_name.lower() != 'all':
+        category = CategoryService.map_to_category(category_name)
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    previous, current = insights.month_over_month(category)
+    delta = current.total - previous.total
+    pct = f"{delta / previous.total * 100:+.0f}%" if previous.total else "n/a"
+    label = category.value if category else "all"
+    return (
+        f"{label} {previous.key}: ${previous.total:.2f} | {current.key} (to date): ${current.total:.2f} | "
+        f"change: ${delta:+.2f} ({pct})"
+    )
+
+@finance_toolset.tool
+@log_and_handle_error
+def recent_transactions(ctx: RunContext[FinanceDependencies], n: int = 5) -> str:
+    """
+    The newest N transactions (income and expenses).
+    Args:
+        n: Number of transactions to return (default 5).
+    """
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    txs = insights.recent(n)
+    if not txs:
+        return "No transactions recorded yet."
+    res = ""
+    for t in txs:
+        prefix = "+" if t.type.value == "income" else "-"
+        cat_label = t.category.value if t.category else "N/A"
+        res += f"{t.date.strftime('%Y-%m-%d')} {prefix}${t.amount:.2f} {cat_label} {t.description}\n"
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def set_budget(ctx: RunContext[FinanceDependencies], category: str, amount: float, month: Optional[str] = None) -> str:
+    """
+    Set (or replace) the monthly budget for a spending category.
+    Args:
+        category: Category to budget (food, transport, entertainment, etc.)
+        amount: Budgeted dollars for the month.
+        month: Month as YYYY-MM (defaults to the current month).
+    """
+    if ctx.deps.budget_tracker is None:
+        return "Budgets are not configured for this ledger."
+    month = month or current_month()
+    budget = ctx.deps.budget_tracker.set_budget(CategoryService.map_to_category(category), month, amount)
+    status = ctx.deps.budget_tracker.status_for(budget.category, month)
+    return (f"🎯 Budget set: {budget.category.value} {month} ${budget.amount:.2f} "
+            f"(spent so far ${status.actual:.2f}, {status.remaining:+.2f} remaining)")
+
+@finance_toolset.tool
+@log_and_handle_error
+def budget_status(ctx: RunContext[FinanceDependencies], month: Optional[str] = None) -> str:
+    """
+    Budget vs. actual spending per category for a month, with drift.
+    Args:
+        month: Month as YYYY-MM (defaults to the current month).
+    """
+    if ctx.deps.budget_tracker is None:
+        return "Budgets are not configured for this ledger."
+    month = month or current_month()
+    statuses = ctx.deps.budget_tracker.month_status(month)
+    if not statuses:
+        return f"No budgets set for {month}."
+    res = f"BUDGETS {month}\n"
+    for s in statuses:
+        flag = " OVER" if s.overspent else ""
+        res += f"{s.category.value}: ${s.actual:.2f} / ${s.planned:.2f} ({s.drift * 100:+.0f}%){flag}\n"
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def recurring_charges(ctx: RunContext[FinanceDependencies]) -> str:
+    """
+    Detected subscriptions and other recurring expenses, with their next expected charge
+    and the total monthly commitment.
+    """
+    if ctx.deps.recurring_detector is None:
+        return "Recurring-charge detection is not configured for this ledger."
+    active = ctx.deps.recurring_detector.active()
+    if not active:
+        return "No recurring charges detected yet."
+    res = f"RECURRING CHARGES: ${sum(s.monthly_cost for s in active):.2f}/month committed\n"
+    for s in active:
+        res += (f"{s.merchant} ({s.category.value}): ${s.average_amount:.2f} {s.period}, "
+                f"next ~{s.next_charge.strftime('%Y-%m-%d')}, ${s.monthly_cost:.2f}/month\n")
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def search_transactions(ctx: RunContext[FinanceDependencies], query: str, limit: int = 10) -> str:
+    """
+    Find transactions by description (e.g. a merchant name), tolerating typos, with the matched total.
+    Prefer this over view_history for "how much at <merchant>" questions.
+    Args:
+        query: Words to look for in the description (e.g. 'starbucks').
+        limit: How many matching rows to list (default 10).
+    """
+    expenses = ctx.deps.expense_repo.search_description(query, SEARCH_TOTAL_CAP)
+    income = ctx.deps.income_repo.search_description(query, SEARCH_TOTAL_CAP)
+    matches = expenses + income
+    if not matches:
+        return f"No transactions matching '{query}'."
+    matches.sort(key=lambda t: t.date, reverse=True)
+    spent = sum(t.amount for t in expenses)
+    received = sum(t.amount for t in income)
+    found = f"{len(matches)} matches"
+    if len(expenses) >= SEARCH_TOTAL_CAP or len(income) >= SEARCH_TOTAL_CAP:
+        found = f"{len(matches)}+ matches (totals cover the first {SEARCH_TOTAL_CAP} only)"
+    res = f"SEARCH '{query}': {found} | spent ${spent:.2f} | received ${received:.2f}\n"
+    for t in matches[:limit]:
+        prefix = "+" if t.type == TransactionType.INCOME else "-"
+        res += f"{t.date.strftime('%Y-%m-%d')} {prefix}${t.amount:.2f} {t.description}\n"
+    if len(matches) > limit:
+        res += f"- {len(matches) - limit} more matches not listed.\n"
+    return res
+
+@finance_toolset.tool
+@log_and_handle_error
+def balance_on(ctx: RunContext[FinanceDependencies], date: str, since: Optional[str] = None) -> str:
+    """
+    Net balance (all income minus all expenses) at the end of a date, optionally with the change since another date.
+    Args:
+        date: Date as YYYY-MM-DD.
+        since: Optional earlier date as YYYY-MM-DD to report the net change from.
+    """
+    if ctx.deps.balance_index is None:
+        return "Balance history is not configured for this ledger."
+    day = datetime.strptime(date, "%Y-%m-%d")
+    res = f"BALANCE at end of {date}: ${ctx.deps.balance_index.balance_at(day):,.2f}"
+    if since:
+        change = ctx.deps.balance_index.balance_between(datetime.strptime(since, "%Y-%m-%d"), day)
+        res += f" | change since {since}: ${change:+,.2f}"
+    return res
@@ -1,39 +1,149 @@
+from typing import Optional
+from datetime import datetime
+import numpy as np
 from pydantic_ai import Agent, RunContext
-from agents.finance import finance_agent
+from agents.finance import finance_toolset, READ_ONLY_TOOLS
 from core.dependencies import FinanceDependencies
 from prompts.persona import STRATEGY_PERSONA
 from core.settings import settings
 from application.dtos.strategy_response import StrategyResponse
+from core.observability import log_and_handle_error
+from core.metrics import AgentMetrics
+from finance.models.finance_goal import FinancialGoal
+from finance.services.insights import InsightService
+from finance.simulation import simulate_goal
+from finance.scenarios import ScenarioBaseline, run_scenarios, INCOME_AXIS
+from finance.services.categories import CategoryService
+from finance.ledger import Ledger
+from finance.risk import rolling_risk
 
 # Initialize the High-Level Wealth Strategy Agent
 strategy_agent = Agent(
     model=settings.get_model(),
+    name='strategy_agent',
     deps_type=FinanceDependencies,
     system_prompt=STRATEGY_PERSONA,
     output_type=StrategyResponse,
-    retries=3
+    retries=3,
+    # Ledger tools are called directly (no nested finance_agent conversation);
+    # independent calls from one response are executed concurrently.
+    toolsets=[finance_toolset],
+    model_settings={'parallel_tool_calls': True},
+    capabilities=[AgentMetrics()]
 )
 
+STRATEGY_READ_ONLY_TOOLS = READ_ONLY_TOOLS | {"evaluate_goal_feasibility", "run_budget_scenarios", "assess_spending_risk", "final_result"}
+
+@strategy_agent.tool
+@log_and_handle_error
+def evaluate_goal_feasibility(
+    ctx: RunContext[FinanceDependencies],
+    goal_name: str,
+    amount: float,
+    deadline: Optional[str] = None,
+    priority: int = 1
+) -> str:
+    """
+    Estimate the probability of reaching a savings goal by its deadline.
+    Runs a Monte Carlo simulation that resamples the user's historical monthly net cashflow.
+    Args:
+        goal_name: Short name of the goal (e.g. 'House deposit').
+        amount: Target balance in dollars.
+        deadline: Target date as YYYY-MM-DD (defaults to 12 months from now).
+        priority: 1-5, 1 being highest.
+    """
+    goal = FinancialGoal(
+        name=goal_name,
+        target_amount=amount,
+        deadline=datetime.strptime(deadline, "%Y-%m-%d") if deadline else None,
+        priority=priority
+    )
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    history = [r.total for r in insights.monthly_net_cashflow()]
+    if not history:
+        return f"Goal '{goal_name}': no ledger history yet, so feasibility cannot be estimated."
+
+    result = simulate_goal(goal, history, starting_balance=insights.net_balance())
+    final = result.final_percentiles
+    return (
+        f"GOAL {goal_name}: ${amount:,.2f} in {result.months} months | "
+        f"probability {result.probability * 100:.1f}% ({result.paths:,} paths, {len(history)} months of history)\n"
+        f"Projected balance p5 ${final[5]:,.0f} | p25 ${final[25]:,.0f} | p50 ${final[50]:,.0f} | "
+        f"p75 ${final[75]:,.0f} | p95 ${final[95]:,.0f}"
+    )
+
 @strategy_agent.tool
-async def query_finance_assistant(ctx: RunContext[FinanceDependencies], query: str) -> str:
+@log_and_handle_error
+def run_budget_scenarios(
+    ctx: RunContext[FinanceDependencies],
+    cut_category: str = "food",
+    max_cut_pct: float = 40,
+    max_income_change_pct: float = 15,
+    extra_monthly_cost: float = 0,
+    steps: int = 5
+) -> str:
     """
-    Delegates a query to the Finance Assistant for data retrieval or expense recording.
-    Use this for:
-    - Recording new expenses
-    - Viewing history
-    - Getting basic spending analysis
-    - Generating budget plans
+    What-if sweep: savings rate for every combination of cutting one category and changing income,
+    optionally adding a new fixed monthly cost (e.g. rent). Based on the last 90 days.
+    Args:
+        cut_category: Category to cut (food, transport, entertainment, ...).
+        max_cut_pct: Largest cut to test, in percent (sweeps 0..max).
+        max_income_change_pct: Largest income increase to test, in percent (sweeps 0..max).
+        extra_monthly_cost: New fixed monthly cost in dollars added to every scenario.
+        steps: Number of values per axis.
     """
-    # We pass the same database dependency to the sub-agent
-    # And we must pass the model to ensure we don't fall back to default OpenAI
-    result = await finance_agent.run(query, deps=ctx.deps, model=ctx.model)
-    return result.output
+    category = CategoryService.map_to_category(cut_category).value
+    insights = InsightService(ctx.deps.expense_repo, ctx.deps.income_repo)
+    months = 3
+    baseline = ScenarioBaseline(
+        monthly_income=insights.income_total("last_90_days") / months,
+        monthly_spend={s.category.value: s.total_amount / months for s in insights.spending_by_category("last_90_days")},
+        balance=insights.net_balance()
+    )
+    cut_axis = f"cut_{category}"
+    grid = run_scenarios(
+        baseline,
+        category_cuts={category: np.linspace(0, max_cut_pct / 100, steps)},
+        income_changes=np.linspace(0, max_income_change_pct / 100, steps),
+        extra_fixed_costs=[extra_monthly_cost]
+    )
+    table = grid.sensitivity_table(cut_axis, INCOME_AXIS)
+
+    res = (f"BASELINE monthly income ${baseline.monthly_income:,.0f}, spend ${sum(baseline.monthly_spend.values()):,.0f} "
+           f"({category} ${baseline.monthly_spend.get(category, 0):,.0f}), extra cost ${extra_monthly_cost:,.0f}\n")
+    res += "SAVINGS RATE: rows = " + category + " cut, cols = income change\n"
+    res += "cut\\inc " + " ".join(f"{v * 100:>6.0f}%" for v in grid.axes[INCOME_AXIS]) + "\n"
+    for i, cut in enumerate(grid.axes[cut_axis]):
+        res += f"{cut * 100:>7.0f}% " + " ".join(f"{v * 100:>6.1f}%" for v in table[i]) + "\n"
+    best = grid.best(1)[0]
+    res += f"Runway at best combination: {best['runway']:.1f} months, net ${best['net_cashflow']:,.0f}/month"
+    return res
 
 @strategy_agent.tool
-def evaluate_goal_feasibility(ctx: RunContext[FinanceDependencies], goal_name: str, amount: float) -> str:
+@log_and_handle_error
+def assess_spending_risk(ctx: RunContext[FinanceDependencies], window_days: int = 30) -> str:
     """
-    Analyze if a specific financial goal is feasible based on current data.
+    Rolling risk metrics over the trailing window: spending volatility, category concentration (HHI),
+    drawdown of the cumulative balance, and burn rate with its trend per category.
+    Args:
+        window_days: Trailing window length in days (e.g. 30 or 90).
     """
-    # This is a placeholder for more complex logic
-    # In a real scenario, it might fetch historical savings rate
-    return f"Goal '{goal_name}' for ${amount} is under review. Please ask the Finance Assistant for my savings history first."
+    service = ctx.deps.ledger_service()
+    ledger = Ledger(transactions=service.get_transaction_history())
+    if not ledger.transactions:
+        return "No ledger history yet, so risk cannot be assessed."
+
+    # Only the trailing year (or a few windows, if longer) matters; slice it out as a view
+    history = ledger.last_days(max(365, window_days * 4))
+    if not len(history):
+        return f"No transactions in the last {max(365, window_days * 4)} days, so risk cannot be assessed."
+    risk = rolling_risk(history.columns, windows=(window_days,))[window_days]
+    latest = risk.latest()
+    res = (f"RISK ({window_days}-day window ending {risk.dates[-1]}): "
+           f"daily spend volatility ${latest['volatility']:,.2f} | HHI {latest['hhi']:.2f} | "
+           f"drawdown ${latest['drawdown']:,.0f} (worst in window ${latest['max_drawdown']:,.0f}) | "
+           f"burn ${latest['burn_rate']:,.0f}/month\n")
+    for category, m in risk.latest_by_category().items():
+        res += (f"- {category.upper()}: burn ${m['burn_rate']:,.0f}/month, "
+                f"trend {m['burn_trend']:+,.0f}/month, volatility ${m['volatility']:,.2f}/day\n")
+    return res.rstrip()
@@ -1,10 +1,24 @@
+import json
 from pydantic_ai import Agent, RunContext
+from pydantic_ai.capabilities import ProcessHistory, UseThreadExecutor
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
 from core.container import Container, create_finance_agent
 from agents.strategy import strategy_agent
-from core.interfaces import ExpenseRepository
 from core.dependencies import FinanceDependencies
 from core.settings import settings
-from core.observability import track_agent_run, log_agent_result
+from core.observability import track_agent_run, log_agent_result, log_agent_metrics, logger, telemetry
+from core.streaming import AgentStream, StreamChunk
+from agents.finance import try_fast_path, finance_toolset, ledger_snapshot, READ_ONLY_TOOLS
+from agents.strategy import STRATEGY_READ_ONLY_TOOLS
+from core.cache import AnswerShortcuts, response_cache, run_cached
+from core.tracing import trace_turn
+from core.history import HistoryManager
+from core.concurrency import AgentRunLimitMiddleware, agent_limiter, blocking_pool, to_thread
+from core.singleflight import read_flight
+from core.metrics import AgentMetrics, metrics
+from finance.services.fast_path import fast_path_stats
 
 # Initialize the database
 # Initialize the dependencies
@@ -16,21 +30,27 @@ except Exception as e:
     deps = None
 
 # Router Agent
-# This agent's sole purpose is to route the user's request to the correct sub-agent.
-# We give it a system prompt to help it decide or ask the user.
+# The router answers ledger requests itself through the shared finance toolset and only
+# delegates long-term strategy questions. We give it a system prompt to help it decide or ask the user.
 ROUTER_SYSTEM_PROMPT = """
 You are the **Personal Finance Hub**, a professional and concierge-like assistant.
-Your goal is to seamlessly connect the user to the right specialist.
+Your goal is to resolve the user's request in as few steps as possible.
 
-You have access to two elite specialists:
-1. **Finance Assistant** 📊: Handles transaction recording, history, and budget tracking.
-2. **Strategy Agent** 🧠: Provides high-level wealth strategy, goal feasibility, and long-term planning.
+When a LEDGER SNAPSHOT (current balances, month-to-date spending, newest transactions) is included, answer directly from it if it covers the question.
+
+You have direct access to the **Transaction Ledger** 📊 tools:
+- add_expense / add_income for recording transactions.
+- spending_summary, top_merchants, month_over_month, recent_transactions, view_history for facts.
+- get_financial_advice and get_budget_plan for standard analysis.
+
+For high-level wealth strategy, goal feasibility, and long-term planning, consult the **Strategy Agent** 🧠 via ask_strategy_global.
 
 **CRITICAL PROTOCOL:**
-- You do not have direct database access. **ALWAYS** delegate actionable requests (recording, viewing history) to the specialists via tools.
-- If the user says "I spent $10", delegate to **Finance Assistant**.
-- If the user says "Record income", delegate to **Finance Assistant**.
-- If the user asks for advice, delegate to **Strategy Agent**.
+- **ALWAYS** use the tools for actionable requests (recording, viewing history); never invent numbers.
+- If the user says "I spent $10", call add_expense.
+- If the user says "Record income", call add_income.
+- If the user asks for long-term advice, delegate to the **Strategy Agent**.
+- When you need several independent facts, request them in the same step so they run in parallel.
 
 **TONE & STYLE:**
 - Be crisp, professional, and welcoming.
@@ -46,33 +66,107 @@ router_agent = Agent(
     deps_type=FinanceDependencies
 )
 
-# Re-define router agent to not require deps in signature for this web layer
+# The web chat re-sends the whole conversation on every message; trim it before each model request
+web_history = HistoryManager()
+
+# Web router: ledger tools are attached directly, so a ledger question costs one conversation
 router_agent_web = Agent(
     model=settings.get_model(),
+    name='router_agent_web',
     system_prompt=ROUTER_SYSTEM_PROMPT,
+    deps_type=FinanceDependencies,
+    toolsets=[finance_toolset],
+    model_settings={'parallel_tool_calls': True},
+    # Simple entries and repeated opening questions are answered before any model call;
+    # sync ledger tools run on the sized pool, never on the event loop
+    capabilities=[
+        AnswerShortcuts(try_fast_path, READ_ONLY_TOOLS | {"ask_strategy_global"}),
+        ProcessHistory(web_history.compact), UseThreadExecutor(blocking_pool), AgentMetrics(),
+    ]
 )
+router_agent_web.system_prompt(dynamic=True)(ledger_snapshot)
 
 @router_agent_web.tool
-async def ask_finance_global(ctx: RunContext[None], query: str) -> str:
-    """
-    Pass the user's query to the Finance Assistant. 
-    Use this for: expense tracking, income recording, viewing cursor/transaction history, and reports.
-    """
-    async with track_agent_run("Finance Agent", str(settings.get_model()), {"query": query}):
-        finance_agent = create_finance_agent()
-        result = await finance_agent.run(query, deps=deps)
-        log_agent_result(result.output)
-        return result.output
-
-@router_agent_web.tool
-async def ask_strategy_global(ctx: RunContext[None], query: str) -> str:
+async def ask_strategy_global(ctx: RunContext[FinanceDependencies], query: str) -> str:
     """
     Pass the user's query to the Strategy Agent.
     Use this for: financial advice, investment strategy, and goal planning.
     """
     async with track_agent_run("Strategy Agent", str(settings.get_model()), {"query": query}):
-        res = await strategy_agent.run(query, deps=deps)
-        log_agent_result(str(res.data))
-        return str(res.data)
+        with trace_turn("Strategy Agent") as trace:
+            res = await run_cached(strategy_agent, query, deps=ctx.deps, read_only_tools=STRATEGY_READ_ONLY_TOOLS)
+        logger.info(trace.summary())
+        log_agent_metrics({**trace.as_metrics(), "cache_hit_rate": response_cache.stats.hit_rate})
+        log_agent_result(str(res.output))
+        return str(res.output)
+
+async def stream_finance(request: Request):
+    """
+    POST /api/stream {"query": "..."}
+    Streams the Finance Assistant's partial output and tool progress as Server-Sent Events.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        return JSONResponse({"error": "Body must be a JSON object."}, status_code=400)
+    query = str(payload.get("query") or "").strip()
+    if not query:
+        return JSONResponse({"error": "Missing 'query'."}, status_code=400)
+
+    async def event_source():
+        fast_reply = await to_thread(try_fast_path, deps, query)
+        if fast_reply:
+            logger.info(fast_path_stats.summary())
+            yield f"data: {json.dumps(StreamChunk('done', fast_reply).to_dict())}\n\n"
+            return
+
+        async with track_agent_run("Finance Agent Stream", str(settings.get_model()), {"query": query}):
+            with trace_turn("Finance Agent Stream") as trace:
+                stream = AgentStream(create_finance_agent(), query, deps=deps,
+                                     capabilities=[UseThreadExecutor(blocking_pool)])
+                try:
+                    async for chunk in stream:
+                        yield f"data: {json.dumps(chunk.to_dict())}\n\n"
+                except Exception as e:
+                    yield f"data: {json.dumps({'kind': 'error', 'content': str(e)})}\n\n"
+                    return
+            logger.info(trace.summary())
+            turn_metrics = {**stream.stats.as_metrics(), **trace.as_metrics()}
+            log_agent_metrics(turn_metrics)
+            log_agent_result(stream.result.output)
+            yield f"data: {json.dumps({'kind': 'stats', 'content': turn_metrics})}\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+async def load_stats(request: Request):
+    """
+    GET /api/load: in-flight agent runs, queue depth, queue wait times, read coalescing
+    and telemetry backlog for this process.
+    """
+    flights = read_flight.stats
+    return JSONResponse({
+        **agent_limiter.snapshot(),
+        "reads": flights.calls,
+        "reads_coalesced": flights.shared,
+        "coalescing_rate": round(flights.coalescing_rate, 4),
+        "telemetry_queue_depth": telemetry.queue_depth,
+        "telemetry_dropped": telemetry.stats.dropped,
+    })
+
+async def prometheus_metrics(request: Request):
+    """
+    GET /metrics: latency histograms, counters and cache hit rates in Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
-app = router_agent_web.to_web()
+app = router_agent_web.to_web(deps=deps)
+# to_web() mounts /api and a catch-all /{id}; our routes go in front so neither shadows them
+app.router.routes[:0] = [
+    Route("/api/stream", stream_finance, methods=["POST"]),
+    Route("/api/load", load_stats, methods=["GET"]),
+    Route("/metrics", prometheus_metrics, methods=["GET"]),
+]
+# Every POST starts an agent run: cap them per process and answer 503 instead of queueing forever
+app.add_middleware(AgentRunLimitMiddleware, limiter=agent_limiter)
@@ -0,0 +1,212 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import KW_ONLY, dataclass, replace
+from typing import Any, Callable, Hashable, Iterable, Optional, Set
+
+from pydantic_ai import Agent, RunContext
+from pydantic_ai.capabilities import AbstractCapability
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, ToolCallPart, UserPromptPart
+
+from core.dependencies import FinanceDependencies
+from core.settings import settings
+from core.tracing import record_run
+from core.metrics import track_cache
+from core.concurrency import to_thread
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class CachedResult:
+    """
+    Stand-in for an AgentRunResult when the answer came from the cache.
+    """
+    output: Any
+    cache_hit: bool = True
+
+
+class AgentResponseCache:
+    """
+    LRU + TTL cache of agent outputs for read-only questions.
+    Keys combine the normalized prompt, the model and the ledger version token,
+    so any write to the ledger naturally makes older entries unreachable.
+    """
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        prompt = re.sub(r"[^\w$.%\s-]", " ", prompt.lower())
+        return re.sub(r"\s+", " ", prompt).strip()
+
+    def make_key(self, agent_name: str, prompt: str, model: Any, ledger_version: Hashable) -> tuple:
+        model_name = getattr(model, "model_name", None) or str(model)
+        return (agent_name, self.normalize(prompt), model_name, ledger_version)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def lookup(self, agent: Agent, user_prompt: str, model: Any, deps: FinanceDependencies) -> tuple[tuple, Optional[Any]]:
+        """
+        Returns (key, cached output or None) for this agent/prompt/model at the current ledger version.
+        """
+        key = self.make_key(agent.name or str(id(agent)), user_prompt, model or agent.model, deps.ledger_version())
+        return key, self.get(key)
+
+    def store(self, key: tuple, result: Any, read_only_tools: Set[str], deps: FinanceDependencies):
+        """
+        Cache a finished run if it only used read-only tools; invalidate everything otherwise.
+        """
+        if not called_tools(result.all_messages()) <= read_only_tools:
+            self.invalidate()
+        elif deps.ledger_version() == key[-1]:
+            # Skip storing if a concurrent write landed while we were answering
+            self.put(key, result.output)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def called_tools(messages: Iterable[Any]) -> Set[str]:
+    return {
+        part.tool_name
+        for message in messages if isinstance(message, ModelResponse)
+        for part in message.parts if isinstance(part, ToolCallPart)
+    }
+
+
+async def run_cached(
+    agent: Agent,
+    user_prompt: str,
+    *,
+    deps: FinanceDependencies,
+    read_only_tools: Set[str],
+    cache: Optional[AgentResponseCache] = None,
+    model: Any = None,
+    **run_kwargs
+):
+    """
+    Run `agent`, answering from the cache when the same question was asked against the same
+    ledger version. Answers are only stored when every tool the agent called is read-only;
+    a run that called any other tool invalidates the cache.
+    Runs with message history are never cached because their answers depend on the conversation.
+    """
+    if cache is None:
+        cache = response_cache
+    if run_kwargs.get("message_history"):
+        result = await agent.run(user_prompt, deps=deps, model=model, **run_kwargs)
+        record_run(agent.name or "agent", result)
+        return result
+
+    key, cached = cache.lookup(agent, user_prompt, model, deps)
+    if cached is not None:
+        return CachedResult(cached)
+
+    result = await agent.run(user_prompt, deps=deps, model=model, **run_kwargs)
+    record_run(agent.name or "agent", result)
+    cache.store(key, result, read_only_tools, deps)
+    return result
+
+
+def _turn_prompt(messages: list) -> Optional[str]:
+    """
+    The user's text when `messages` ends with a new user turn (not a tool round trip), else None.
+    """
+    last = messages[-1] if messages else None
+    if not isinstance(last, ModelRequest):
+        return None
+    prompts = [p.content for p in last.parts if isinstance(p, UserPromptPart) and isinstance(p.content, str)]
+    return prompts[-1] if prompts else None
+
+
+@dataclass
+class AnswerShortcuts(AbstractCapability[FinanceDependencies]):
+    """
+    Answers a turn without calling the model when possible, for agents whose runs are started by
+    a UI (e.g. to_web()) rather than through run_cached:
+    - `fast_path(deps, prompt)` handles simple entries ("I spent $15 on lunch") for any turn;
+    - an opening question (no earlier conversation) is served from, and stored in, the response cache.
+    """
+    fast_path: Callable[[FinanceDependencies, str], Optional[str]]
+    read_only_tools: Set[str]
+    _: KW_ONLY
+    cache: Optional[AgentResponseCache] = None
+    id: Optional[str] = "answer_shortcuts"
+    _key: Optional[tuple] = None
+
+    @classmethod
+    def get_serialization_name(cls) -> Optional[str]:
+        return None
+
+    async def for_run(self, ctx: RunContext[FinanceDependencies]) -> "AnswerShortcuts":
+        # The cache key of the opening question is per run
+        return replace(self, _key=None)
+
+    async def wrap_model_request(self, ctx: RunContext[FinanceDependencies], *, request_context, handler) -> ModelResponse:
+        prompt = _turn_prompt(request_context.messages)
+        if prompt is None or ctx.deps is None:
+            return await handler(request_context)
+
+        reply = await to_thread(self.fast_path, ctx.deps, prompt)
+        if reply:
+            return ModelResponse(parts=[TextPart(reply)])
+
+        if len(request_context.messages) == 1:
+            cache = self.cache or response_cache
+            self._key, cached = cache.lookup(ctx.agent, prompt, ctx.model, ctx.deps)
+            if cached is not None:
+                self._key = None
+                return ModelResponse(parts=[TextPart(str(cached))])
+        return await handler(request_context)
+
+    async def after_run(self, ctx: RunContext[FinanceDependencies], *, result):
+        if self._key is not None:
+            (self.cache or response_cache).store(self._key, result, self.read_only_tools, ctx.deps)
+        return result
+
+
+response_cache = AgentResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+track_cache("agent_response", lambda: response_cache.stats.hits, lambda: response_cache.stats.misses)
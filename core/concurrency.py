@@ -0,0 +1,158 @@
+import asyncio
+import functools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from core.settings import settings
+
+T = TypeVar("T")
+
+
+class Overloaded(Exception):
+    """
+    Raised when an agent run cannot be admitted: the wait queue is full or the wait timed out.
+    """
+    def __init__(self, reason: str, retry_after: float = 1.0):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class LimiterStats:
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.admitted if self.admitted else 0.0
+
+
+class RunLimiter:
+    """
+    Caps in-flight agent runs per process. Excess runs wait in a bounded FIFO queue;
+    a run that cannot get a slot within `queue_timeout`, or finds the queue full, is refused
+    with Overloaded instead of piling more LLM calls onto a saturated process.
+    """
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.stats = LimiterStats()
+        self.in_flight = 0
+        self.queued = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _sem(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def acquire(self):
+        sem = self._sem()
+        started = time.perf_counter()
+        if not sem.locked():
+            # A free slot: taken without suspending, so concurrent callers see it as used
+            await sem.acquire()
+        else:
+            if self.queued >= self.max_queue:
+                self.stats.rejected += 1
+                raise Overloaded("queue full", retry_after=max(self.stats.avg_wait, 1.0))
+            self.queued += 1
+            try:
+                await asyncio.wait_for(sem.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats.timed_out += 1
+                raise Overloaded("timed out waiting for a slot", retry_after=self.queue_timeout)
+            finally:
+                self.queued -= 1
+        wait = time.perf_counter() - started
+        self.in_flight += 1
+        self.stats.admitted += 1
+        self.stats.total_wait += wait
+        self.stats.last_wait = wait
+        self.stats.max_wait = max(self.stats.max_wait, wait)
+
+    def release(self):
+        self.in_flight -= 1
+        self._sem().release()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.stats.admitted,
+            "rejected": self.stats.rejected,
+            "timed_out": self.stats.timed_out,
+            "avg_wait_seconds": round(self.stats.avg_wait, 4),
+            "max_wait_seconds": round(self.stats.max_wait, 4),
+            "last_wait_seconds": round(self.stats.last_wait, 4),
+        }
+
+
+async def to_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking work (repository calls, file I/O) on the sized pool instead of the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(blocking_pool, call)
+
+
+class AgentRunLimitMiddleware:
+    """
+    ASGI middleware that admits POST requests (each one starts an agent run) through a RunLimiter.
+    Refused requests get 503 with Retry-After; GETs (UI assets, health, stats) are never queued.
+    """
+    def __init__(self, app, limiter: "RunLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.limiter.acquire()
+        except Overloaded as e:
+            body = json.dumps({"error": "Server busy, please retry shortly.", "reason": e.reason}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(int(round(e.retry_after))).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+# Shared by agent tool calls (via UseThreadExecutor) and to_thread
+blocking_pool = ThreadPoolExecutor(max_workers=settings.BLOCKING_POOL_SIZE, thread_name_prefix="blocking")
+
+agent_limiter = RunLimiter(settings.AGENT_MAX_CONCURRENT_RUNS, settings.AGENT_MAX_QUEUE, settings.AGENT_QUEUE_TIMEOUT)
@@ -1,12 +1,25 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from core.settings import settings
 from core.dependencies import FinanceDependencies, DataEngineDependencies
 import asyncpg
 import asyncio
+import atexit
 import os
-from data.database import SupabaseExpenseRepository, SupabaseIncomeRepository
+import threading
+from data.database import SupabaseExpenseRepository, SupabaseIncomeRepository, SupabaseBudgetRepository
+from data.journal import WriteJournal, WriteBehindRepository
+from core.singleflight import SingleFlightRepository, read_flight
+from finance.budget import BudgetTracker
+from finance.anomaly import AnomalyDetector
+from finance.recurring import RecurringDetector
+from finance.balance import BalanceIndex
+from core.observability import logger
 from pydantic_ai import Agent
 
+# Pre-built finance agents, one per model instance (see create_finance_agent)
+_finance_agents: Dict[Any, Tuple[Any, Agent]] = {}
+_agent_pool_lock = threading.Lock()
+
 class Container:
     _finance_deps: Optional[FinanceDependencies] = None
     _db_pool: Optional[asyncpg.Pool] = None
@@ -17,17 +30,71 @@ class Container:
         Factory to get the configured dependencies.
         """
         if not cls._finance_deps:
+            expense_repo = cls._coalesce(cls._write_behind(SupabaseExpenseRepository(), "expenses"))
+            income_repo = cls._coalesce(cls._write_behind(SupabaseIncomeRepository(), "income"))
+            budget_repo = SupabaseBudgetRepository()
             cls._finance_deps = FinanceDependencies(
-                expense_repo=SupabaseExpenseRepository(),
-                income_repo=SupabaseIncomeRepository()
+                expense_repo=expense_repo,
+                income_repo=income_repo,
+                budget_repo=budget_repo,
+                budget_tracker=BudgetTracker(budget_repo, expense_repo),
+                anomaly_detector=cls._load_anomaly_detector(expense_repo),
+                recurring_detector=RecurringDetector(source=expense_repo.list_all),
+                balance_index=BalanceIndex(source=lambda: expense_repo.list_all() + income_repo.list_all())
             )
         return cls._finance_deps
 
+    @staticmethod
+    def _write_behind(repo, name: str):
+        """
+        Put the repository behind a local journal when WRITE_BEHIND_ENABLED is set.
+        """
+        if not settings.WRITE_BEHIND_ENABLED:
+            return repo
+        journal = WriteJournal(os.path.join(settings.WRITE_JOURNAL_DIR, f"{name}.jsonl"))
+        wrapped = WriteBehindRepository(repo, journal)
+        if len(journal):
+            logger.info(f"Replaying {len(journal)} journaled {name} rows")
+        # Best-effort drain on exit; anything left stays journaled for the next start
+        atexit.register(wrapped.close)
+        return wrapped
+
+    @staticmethod
+    def _coalesce(repo):
+        """
+        Share one backend query between concurrent identical reads (tabs, parallel tool calls).
+        """
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return repo
+        return SingleFlightRepository(repo, read_flight)
+
+    @staticmethod
+    def _load_anomaly_detector(expense_repo) -> AnomalyDetector:
+        """
+        Resume detector state from disk; only a missing state file triggers a ledger scan.
+        """
+        path, interval = settings.ANOMALY_STATE_PATH, settings.ANOMALY_SAVE_INTERVAL
+        try:
+            detector = AnomalyDetector.load_or_rebuild(path, expense_repo.list_all, save_interval=interval)
+        except Exception as e:
+            logger.warning(f"Anomaly detector starting empty: {e}")
+            detector = AnomalyDetector(path, save_interval=interval)
+        # Observations since the last batched write
+        atexit.register(detector.flush)
+        return detector
+
     @classmethod
     def reset_dependencies(cls):
         """
         Clear the cached dependencies to force re-initialization.
         """
+        if cls._finance_deps:
+            # Release journal files so the next set of repositories can own them
+            for repo in (cls._finance_deps.expense_repo, cls._finance_deps.income_repo):
+                if isinstance(repo, SingleFlightRepository):
+                    repo = repo.inner
+                if isinstance(repo, WriteBehindRepository):
+                    repo.close()
         cls._finance_deps = None
 
     @classmethod
@@ -54,12 +121,17 @@ class Container:
 
 def create_finance_agent(model_override: str = None) -> Agent:
     """
-    Factory to create a configured Finance Agent.
+    Factory to get a Finance Agent bound to the configured model.
+    One agent is kept per model instance, so concurrent requests never share mutable state.
     """
-    from agents.finance import finance_agent
-    
-    # Configure the model from settings
+    from agents.finance import build_finance_agent
+
     model = settings.get_model(model_override)
-    finance_agent.model = model
-    
-    return finance_agent
+    key = model if isinstance(model, str) else id(model)
+    with _agent_pool_lock:
+        entry = _finance_agents.get(key)
+        if entry is None:
+            # Keep the model referenced so its id cannot be reused by another object
+            entry = (model, build_finance_agent(model))
+            _finance_agents[key] = entry
+    return entry[1]
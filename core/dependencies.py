@@ -1,6 +1,20 @@
-from dataclasses import dataclass
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Tuple
 from finance.repositories.transaction_repository import TransactionRepository
+from finance.repositories.budget_repository import BudgetRepository
+from finance.budget import BudgetTracker, current_month
+from finance.anomaly import AnomalyDetector
+from finance.recurring import RecurringDetector
+from finance.balance import BalanceIndex
+from finance.services.ledger import LedgerService
+from finance.services.insights import InsightService
+from core.observability import logger
+from core.settings import settings
+from core.metrics import cache_hits, cache_misses, track_cache
+
+track_cache("ledger_digest")
 
 @dataclass
 class FinanceDependencies:
@@ -10,6 +24,61 @@ class FinanceDependencies:
     """
     expense_repo: TransactionRepository
     income_repo: TransactionRepository
+    budget_repo: Optional[BudgetRepository] = None
+    # Month-to-date spend counters; updated by LedgerService on every recorded expense
+    budget_tracker: Optional[BudgetTracker] = None
+    # Per-category / per-merchant outlier statistics; updated on every recorded expense
+    anomaly_detector: Optional[AnomalyDetector] = None
+    # Subscription groups, loaded on first query and updated on every recorded expense
+    recurring_detector: Optional[RecurringDetector] = None
+    # Running balance by day, loaded on first query and updated on every recorded transaction
+    balance_index: Optional[BalanceIndex] = None
+    # (version token, text, monotonic expiry) of the last ledger digest
+    _digest: Optional[Tuple[tuple, str, float]] = field(default=None, init=False, repr=False, compare=False)
+
+    def ledger_service(self) -> LedgerService:
+        """
+        LedgerService wired to every write-time tracker that is configured.
+        """
+        return LedgerService(
+            self.expense_repo,
+            self.income_repo,
+            budget_tracker=self.budget_tracker,
+            anomaly_detector=self.anomaly_detector,
+            recurring_detector=self.recurring_detector,
+            balance_index=self.balance_index
+        )
+
+    def ledger_version(self) -> tuple:
+        """
+        Token that changes whenever any repository is written to.
+        """
+        budget_version = self.budget_repo.version if self.budget_repo is not None else 0
+        return (self.expense_repo.version, self.income_repo.version, budget_version)
+
+    def ledger_digest(self) -> str:
+        """
+        Cached snapshot of the ledger for agent system prompts.
+        Rebuilt when the ledger version (or the day) changes, or after LEDGER_DIGEST_TTL seconds
+        so writes made by another process show up; empty if the ledger is unreachable.
+        """
+        now = datetime.now()
+        key = (self.ledger_version(), now.strftime("%Y-%m-%d"))
+        cached = self._digest
+        if cached is not None and cached[0] == key and time.monotonic() < cached[2]:
+            cache_hits.inc(cache="ledger_digest")
+            return cached[1]
+        cache_misses.inc(cache="ledger_digest")
+        try:
+            budgets = self.budget_tracker.month_status(current_month()) if self.budget_tracker is not None else None
+            text = InsightService(self.expense_repo, self.income_repo).digest(budgets, now=now)
+        except Exception as e:
+            logger.warning(f"Ledger digest unavailable: {e}")
+            # Remember the failure briefly so an outage does not cost a query on every run
+            self._digest = (key, "", time.monotonic() + settings.LEDGER_DIGEST_ERROR_TTL)
+            return ""
+        self._digest = (key, text, time.monotonic() + settings.LEDGER_DIGEST_TTL)
+        return text
 
 @dataclass
 class DataEngineDependencies:
@@ -0,0 +1,222 @@
+import json
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from core.observability import logger
+from core.settings import settings
+
+# Rough characters-per-token ratio; good enough to budget context without a tokenizer
+CHARS_PER_TOKEN = 4
+# Share of the budget the running summary of older turns may use
+SUMMARY_SHARE = 0.25
+SUMMARY_HEADER = "Earlier in this conversation (summarized):"
+_PROMPT_CHARS = 160
+_ANSWER_CHARS = 240
+
+
+@dataclass
+class ContextStats:
+    """
+    Size of the history before and after the last compaction.
+    """
+    tokens_before: int = 0
+    tokens_after: int = 0
+    turns: int = 0
+    summarized_turns: int = 0
+    elided_outputs: int = 0
+
+    def as_metrics(self) -> Dict[str, float]:
+        return {
+            "context_tokens_before": float(self.tokens_before),
+            "context_tokens": float(self.tokens_after),
+            "context_turns": float(self.turns),
+            "context_summarized_turns": float(self.summarized_turns),
+        }
+
+    def summary(self) -> str:
+        return (f"context ~{self.tokens_after} tokens (was ~{self.tokens_before}), {self.turns} turns kept, "
+                f"{self.summarized_turns} summarized, {self.elided_outputs} tool outputs elided")
+
+
+def _part_text(part: Any) -> str:
+    if isinstance(part, ToolCallPart):
+        return part.args if isinstance(part.args, str) else json.dumps(part.args or {})
+    if isinstance(part, ToolReturnPart):
+        return part.model_response_str()
+    content = getattr(part, "content", "")
+    return content if isinstance(content, str) else str(content)
+
+
+def estimate_tokens(messages: Sequence[ModelMessage]) -> int:
+    chars = sum(len(_part_text(p)) for m in messages for p in m.parts)
+    return chars // CHARS_PER_TOKEN
+
+
+def _summary_tokens(lines: List[str]) -> int:
+    return len("\n".join([SUMMARY_HEADER, *lines])) // CHARS_PER_TOKEN if lines else 0
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _split_turns(messages: Sequence[ModelMessage]) -> List[List[ModelMessage]]:
+    """
+    Group messages into turns, each starting at a request that carries a user prompt.
+    """
+    turns: List[List[ModelMessage]] = []
+    for message in messages:
+        starts_turn = isinstance(message, ModelRequest) and any(isinstance(p, UserPromptPart) for p in message.parts)
+        if starts_turn or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def append_turn(
+    messages: List[ModelMessage],
+    prompt: str,
+    reply: str,
+    system_parts: Sequence[SystemPromptPart] = ()
+) -> List[ModelMessage]:
+    """
+    History plus a turn that was answered without a model run (fast path, response cache),
+    so follow-up questions can refer to it. An agent only adds its system prompt to runs that
+    start without history, so `system_parts` open the conversation when `messages` is empty.
+    """
+    opener = list(system_parts) if not messages else []
+    return [
+        *messages,
+        ModelRequest(parts=opener + [UserPromptPart(content=prompt)]),
+        ModelResponse(parts=[TextPart(content=reply)]),
+    ]
+
+
+class HistoryManager:
+    """
+    Keeps conversation history inside a token budget.
+    Recent turns are kept verbatim; older turns are folded into a short running summary, and
+    large tool outputs from turns that have already been answered are replaced by a stub.
+    Can be called directly on a message list or installed as an agent history processor.
+    """
+    def __init__(self, budget_tokens: Optional[int] = None, tool_output_chars: Optional[int] = None):
+        self.budget_tokens = budget_tokens or settings.HISTORY_TOKEN_BUDGET
+        self.tool_output_chars = tool_output_chars or settings.HISTORY_TOOL_OUTPUT_CHARS
+        self.last_stats = ContextStats()
+
+    def __call__(self, messages: List[ModelMessage]) -> List[ModelMessage]:
+        return self.compact(messages)
+
+    def _elide(self, turn: List[ModelMessage]) -> tuple[List[ModelMessage], int]:
+        elided = 0
+        out = []
+        for message in turn:
+            if isinstance(message, ModelRequest):
+                parts = []
+                for p in message.parts:
+                    text = _part_text(p) if isinstance(p, ToolReturnPart) else ""
+                    if len(text) > self.tool_output_chars:
+                        p = replace(p, content=f"[{p.tool_name} output ({len(text)} chars) omitted; already answered]")
+                        elided += 1
+                    parts.append(p)
+                message = replace(message, parts=parts)
+            out.append(message)
+        return out, elided
+
+    @staticmethod
+    def _summarize_turn(turn: List[ModelMessage]) -> str:
+        prompt, answer, tools = "", "", []
+        for message in turn:
+            for p in message.parts:
+                if isinstance(p, UserPromptPart) and not prompt:
+                    prompt = p.content if isinstance(p.content, str) else str(p.content)
+                elif isinstance(p, ToolCallPart):
+                    tools.append(p.tool_name)
+                elif isinstance(p, TextPart) and isinstance(message, ModelResponse):
+                    answer = p.content
+        line = f"- User: {_clip(prompt, _PROMPT_CHARS)}"
+        if tools:
+            line += f" | tools: {', '.join(dict.fromkeys(tools))}"
+        if answer:
+            line += f" | Assistant: {_clip(answer, _ANSWER_CHARS)}"
+        return line
+
+    def compact(self, messages: List[ModelMessage]) -> List[ModelMessage]:
+        """
+        Return the history trimmed to the budget. The newest turn is always kept whole.
+        """
+        if not messages:
+            self.last_stats = ContextStats()
+            return messages
+        turns = _split_turns(messages)
+
+        # The system prompt and any earlier summary live on the very first request
+        system_parts: List[SystemPromptPart] = []
+        summary_lines: List[str] = []
+        first = turns[0][0]
+        if isinstance(first, ModelRequest):
+            for p in first.parts:
+                if isinstance(p, SystemPromptPart):
+                    if p.content.startswith(SUMMARY_HEADER):
+                        summary_lines.extend(p.content.splitlines()[1:])
+                    else:
+                        system_parts.append(p)
+            rest = [p for p in first.parts if not isinstance(p, SystemPromptPart)]
+            turns[0][0] = replace(first, parts=rest)
+
+        elided = 0
+        for i in range(len(turns) - 1):
+            turns[i], n = self._elide(turns[i])
+            elided += n
+
+        fixed = estimate_tokens([ModelRequest(parts=system_parts)]) if system_parts else 0
+        sizes = [estimate_tokens(t) for t in turns]
+        summary_budget = int(self.budget_tokens * SUMMARY_SHARE)
+        keep = len(turns)
+        if fixed + sum(sizes) + _summary_tokens(summary_lines) > self.budget_tokens:
+            available = self.budget_tokens - fixed - summary_budget
+            keep, used = 0, 0
+            for size in reversed(sizes):
+                if keep and used + size > available:
+                    break
+                used += size
+                keep += 1
+        dropped, kept = turns[:len(turns) - keep], turns[len(turns) - keep:]
+
+        summary_lines.extend(self._summarize_turn(t) for t in dropped)
+        while _summary_tokens(summary_lines) > summary_budget:
+            summary_lines.pop(0)
+
+        head = list(system_parts)
+        if summary_lines:
+            head.append(SystemPromptPart(content="\n".join([SUMMARY_HEADER, *summary_lines])))
+        result = [m for t in kept for m in t]
+        if head:
+            opener = result[0]
+            if isinstance(opener, ModelRequest):
+                result[0] = replace(opener, parts=head + list(opener.parts))
+            else:
+                result.insert(0, ModelRequest(parts=head))
+
+        self.last_stats = ContextStats(
+            tokens_before=estimate_tokens(messages),
+            tokens_after=estimate_tokens(result),
+            turns=len(kept),
+            summarized_turns=len(dropped),
+            elided_outputs=elided
+        )
+        logger.info(self.last_stats.summary())
+        return result
+
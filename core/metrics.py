@@ -0,0 +1,364 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import KW_ONLY, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_ai import RunContext
+from pydantic_ai.capabilities import AbstractCapability
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+
+# Histogram buckets per power of two: bucket edges grow by 2^(1/16), so a reported
+# quantile is within ~2.2% of the true value at any magnitude (HdrHistogram-style)
+SUB_BUCKETS = 16
+QUANTILES = (0.5, 0.9, 0.99)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def set_function(self, fn: Callable[[], float], **labels: Any):
+        """
+        Read this series from `fn` at collection time, e.g. from an existing stats object.
+        """
+        with self._lock:
+            self._functions[self._key(labels)] = fn
+
+    def _function_samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            functions = dict(self._functions)
+        samples = {}
+        for key, fn in functions.items():
+            try:
+                samples[key] = float(fn())
+            except Exception:
+                # A broken callback must not take the whole scrape down
+                continue
+        return samples
+
+
+class _ScalarMetric(_Metric):
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def value(self, **labels: Any) -> float:
+        key = self._key(labels)
+        if key in self._functions:
+            return self._function_samples().get(key, 0.0)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+        values.update(self._function_samples())
+        return values
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in sorted(self.samples().items())]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_ScalarMetric):
+    """
+    Monotonic total, e.g. requests served or rows mapped. Names end in `_total`.
+    """
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_ScalarMetric):
+    """
+    Point-in-time value that can go up and down, e.g. queue depth or last throughput.
+    """
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class _Distribution:
+    """
+    Log-linear bucket counts for one label set. Memory grows with the value range
+    (16 buckets per doubling), not with the number of observations.
+    """
+    __slots__ = ("buckets", "zeros", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.floor(math.log2(value) * SUB_BUCKETS)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return math.nan
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zeros
+        if seen >= rank:
+            return min(max(0.0, self.min), self.max)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric middle of the bucket, kept inside what was actually observed
+                middle = 2 ** ((index + 0.5) / SUB_BUCKETS)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+
+class Histogram(_Metric):
+    """
+    Latency / size distribution with HDR-style buckets, exported as a Prometheus summary
+    (p50 / p90 / p99 plus `_sum` and `_count`).
+    """
+    type = "summary"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._series: Dict[LabelValues, _Distribution] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Distribution()
+            series.record(float(value))
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def stats(self, **labels: Any) -> Dict[str, float]:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            return self._stats(series) if series is not None else {"count": 0}
+
+    @staticmethod
+    def _stats(series: _Distribution) -> Dict[str, float]:
+        stats = {"count": series.count, "sum": series.sum, "min": series.min, "max": series.max}
+        for q in QUANTILES:
+            stats[f"p{int(q * 100)}"] = series.quantile(q)
+        return stats
+
+    def samples(self) -> Dict[LabelValues, Dict[str, float]]:
+        with self._lock:
+            return {key: self._stats(series) for key, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, stats in sorted(self.samples().items()):
+            for q in QUANTILES:
+                quantile = _labels(self.labelnames, key, f'quantile="{q}"')
+                lines.append(f"{self.name}{quantile} {_number(stats[f'p{int(q * 100)}'])}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(stats['sum'])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_number(stats['count'])}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of named metrics. `counter` / `gauge` / `histogram` return the existing
+    metric when the name is already registered, so modules can declare what they record at import time.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, labelnames: Tuple[str, ...]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type} with labels {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        return self._get(Histogram, name, help, labelnames)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            body = metric.render()
+            if not body:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(body)
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        One row per series, for tables in the UI.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        rows = []
+        for metric in metrics:
+            for key, value in sorted(metric.samples().items()):
+                row = {"metric": metric.name, "labels": ", ".join(f"{n}={v}" for n, v in zip(metric.labelnames, key))}
+                if isinstance(value, dict):
+                    row.update({k: value[k] for k in ("count", "p50", "p90", "p99", "max")})
+                else:
+                    row["value"] = value
+                rows.append(row)
+        return rows
+
+    def reset(self):
+        """
+        Zero every recorded value; registrations and callbacks are kept.
+        """
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+
+metrics = MetricsRegistry()
+
+llm_request_seconds = metrics.histogram("llm_request_seconds", "Latency of one model request.", ("agent", "model"))
+llm_tokens = metrics.counter("llm_tokens_total", "Tokens used by model requests.", ("agent", "model", "kind"))
+tool_call_seconds = metrics.histogram("tool_call_seconds", "Latency of one agent tool call.", ("tool",))
+tool_errors = metrics.counter("tool_errors_total", "Agent tool calls that raised.", ("tool",))
+cache_hits = metrics.counter("cache_hits_total", "Lookups served from a cache.", ("cache",))
+cache_misses = metrics.counter("cache_misses_total", "Lookups a cache could not serve.", ("cache",))
+cache_hit_ratio = metrics.gauge("cache_hit_ratio", "Share of lookups served from a cache.", ("cache",))
+
+
+def track_cache(name: str, hits: Optional[Callable[[], float]] = None, misses: Optional[Callable[[], float]] = None):
+    """
+    Publish a cache's hit / miss totals and hit ratio. Pass callables that read the cache's own
+    stats, or omit them and call `cache_hits.inc(cache=name)` / `cache_misses.inc(cache=name)` directly.
+    """
+    if hits is not None:
+        cache_hits.set_function(hits, cache=name)
+    if misses is not None:
+        cache_misses.set_function(misses, cache=name)
+
+    def ratio() -> float:
+        hit, miss = cache_hits.value(cache=name), cache_misses.value(cache=name)
+        return hit / (hit + miss) if hit + miss else 0.0
+
+    cache_hit_ratio.set_function(ratio, cache=name)
+
+
+@dataclass
+class AgentMetrics(AbstractCapability[Any]):
+    """
+    Records model request latency and token usage, and per-tool latency, for every run of the agent.
+    """
+    _: KW_ONLY
+
+    id: Optional[str] = "agent_metrics"
+
+    @classmethod
+    def get_serialization_name(cls) -> Optional[str]:
+        return None
+
+    async def wrap_model_request(self, ctx: RunContext[Any], *, request_context, handler) -> ModelResponse:
+        agent = getattr(ctx.agent, "name", None) or "agent"
+        model = getattr(ctx.model, "model_name", None) or str(ctx.model)
+        started = time.perf_counter()
+        response = await handler(request_context)
+        llm_request_seconds.observe(time.perf_counter() - started, agent=agent, model=model)
+        usage = response.usage
+        llm_tokens.inc(usage.input_tokens or 0, agent=agent, model=model, kind="input")
+        llm_tokens.inc(usage.output_tokens or 0, agent=agent, model=model, kind="output")
+        return response
+
+    async def wrap_tool_execute(self, ctx: RunContext[Any], *, call: ToolCallPart, tool_def, args, handler) -> Any:
+        started = time.perf_counter()
+        try:
+            return await handler(args)
+        except Exception:
+            tool_errors.inc(tool=call.tool_name)
+            raise
+        finally:
+            tool_call_seconds.observe(time.perf_counter() - started, tool=call.tool_name)
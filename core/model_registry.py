@@ -0,0 +1,98 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import httpx
+
+
+@dataclass
+class RegistryStats:
+    builds: int = 0
+    hits: int = 0
+    misses: int = 0
+    build_seconds: float = 0.0
+
+    @property
+    def avg_build_seconds(self) -> float:
+        return self.build_seconds / self.builds if self.builds else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """
+        Setup time avoided by serving cached models, at the average cold-build cost.
+        """
+        return self.hits * self.avg_build_seconds
+
+    def summary(self) -> str:
+        return (f"models: {self.builds} built ({self.avg_build_seconds * 1000:.1f} ms avg), "
+                f"{self.hits} reused, ~{self.saved_seconds * 1000:.0f} ms setup saved")
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of model objects keyed by (provider, model, base_url, api key),
+    with one pooled httpx client per provider shared by every model of that provider.
+    """
+    def __init__(self, timeout: float = 60.0, max_connections: int = 20):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.stats = RegistryStats()
+        self._models: Dict[Hashable, Any] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    def http_client(self, provider: str) -> httpx.AsyncClient:
+        """
+        The shared keep-alive client for a provider (created on first use).
+        """
+        with self._lock:
+            client = self._clients.get(provider)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout, connect=10.0),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=60.0
+                    )
+                )
+                self._clients[provider] = client
+            return client
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Cached model for `key`, built with `factory` on first request.
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self.stats.hits += 1
+                return model
+            self.stats.misses += 1
+        started = time.perf_counter()
+        model = factory()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            # Another thread may have built the same model meanwhile; keep the first one
+            model = self._models.setdefault(key, model)
+            self.stats.builds += 1
+            self.stats.build_seconds += elapsed
+        return model
+
+    def clear(self):
+        """
+        Forget cached models (e.g. after credentials change). Shared clients stay open.
+        """
+        with self._lock:
+            self._models.clear()
+
+    async def aclose(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+            self._models.clear()
+        for client in clients:
+            await client.aclose()
+
+    def __len__(self) -> int:
+        return len(self._models)
@@ -1,9 +1,13 @@
 
-import mlflow
+import atexit
+import queue
+import threading
 import time
 import asyncio
-from typing import Any, Optional, Dict
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from core.settings import settings
 
 import logging
@@ -14,15 +18,189 @@ from functools import wraps
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class MLflowTracker:
-    _initialized = False
+# Longest param value MLflow stores; longer inputs are truncated instead of failing the export
+PARAM_VALUE_LIMIT = 6000
+# Output text kept per run, so one queued run stays small
+OUTPUT_TEXT_LIMIT = 20_000
+# Runs handed to the tracking store per drain of the queue
+EXPORT_BATCH_SIZE = 50
+
+
+@dataclass
+class RunRecord:
+    """
+    Everything one tracked agent run logs, collected in memory and exported after the run ends.
+    """
+    run_name: str
+    params: Dict[str, str] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+    output: Optional[str] = None
+    status: str = "FINISHED"
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+
+    def param(self, key: str, value: Any):
+        self.params[key] = str(value)[:PARAM_VALUE_LIMIT]
+
+
+@dataclass
+class ExporterStats:
+    enqueued: int = 0
+    exported: int = 0
+    dropped: int = 0
+    failed: int = 0
+    export_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"telemetry: {self.exported} runs exported, {self.dropped} dropped (queue full), "
+                f"{self.failed} failed, {self.export_seconds * 1000:.0f} ms spent exporting")
+
+
+def _mlflow_client() -> Tuple[Any, str]:
+    from mlflow.tracking import MlflowClient
+
+    client = MlflowClient(tracking_uri=settings.MLFLOW_TRACKING_URI)
+    experiment = client.get_experiment_by_name(settings.MLFLOW_EXPERIMENT_NAME)
+    if experiment is not None:
+        return client, experiment.experiment_id
+    return client, client.create_experiment(settings.MLFLOW_EXPERIMENT_NAME)
+
+
+class TelemetryExporter:
+    """
+    Ships RunRecords to MLflow from a background thread, one `log_batch` per run.
+    `submit` never blocks: the queue is bounded and a record that does not fit is dropped and
+    counted, so a slow or unreachable tracking store costs telemetry, never user latency.
+    """
+    def __init__(
+        self,
+        max_queue: int,
+        flush_interval: float,
+        client_factory: Callable[[], Tuple[Any, str]] = _mlflow_client
+    ):
+        self.flush_interval = flush_interval
+        self.stats = ExporterStats()
+        self._queue: "queue.Queue[RunRecord]" = queue.Queue(maxsize=max_queue)
+        self._client_factory = client_factory
+        self._client: Optional[Tuple[Any, str]] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, record: RunRecord) -> bool:
+        self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.stats.dropped += 1
+            return False
+        with self._lock:
+            self.stats.enqueued += 1
+        return True
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            # Runs that finish close together go out in one pass
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._stop.is_set():
+                return
+
+    def _drain(self):
+        while True:
+            batch: List[RunRecord] = []
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                self._export(batch)
+            finally:
+                with self._lock:
+                    self.stats.export_seconds += time.perf_counter() - started
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _export(self, batch: List[RunRecord]):
+        from mlflow.entities import Metric, Param
+
+        try:
+            if self._client is None:
+                self._client = self._client_factory()
+        except Exception as e:
+            logger.warning(f"Telemetry export skipped, tracking store unavailable: {e}")
+            with self._lock:
+                self.stats.failed += len(batch)
+            return
+        client, experiment_id = self._client
+        for record in batch:
+            try:
+                end_ms = int((record.end_time or time.time()) * 1000)
+                run = client.create_run(experiment_id, start_time=int(record.start_time * 1000), run_name=record.run_name)
+                run_id = run.info.run_id
+                client.log_batch(
+                    run_id,
+                    metrics=[Metric(k, float(v), end_ms, 0) for k, v in record.metrics.items()],
+                    params=[Param(k, v) for k, v in record.params.items()]
+                )
+                if record.output is not None:
+                    client.log_text(run_id, record.output, "output.txt")
+                client.set_terminated(run_id, status=record.status, end_time=end_ms)
+            except Exception as e:
+                logger.warning(f"Telemetry export failed for run '{record.run_name}': {e}")
+                with self._lock:
+                    self.stats.failed += 1
+                continue
+            with self._lock:
+                self.stats.exported += 1
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Export everything queued so far. Returns False if that did not finish within `timeout`.
+        """
+        if self._thread is None:
+            return self._queue.unfinished_tasks == 0
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+telemetry = TelemetryExporter(settings.TELEMETRY_QUEUE_SIZE, settings.TELEMETRY_FLUSH_INTERVAL)
+# Give queued runs a chance to reach the tracking store on a clean shutdown
+atexit.register(telemetry.close)
+
+_current_run: ContextVar[Optional[RunRecord]] = ContextVar("current_run", default=None)
 
-    @classmethod
-    def initialize(cls):
-        if not cls._initialized:
-            mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
-            mlflow.set_experiment(settings.MLFLOW_EXPERIMENT_NAME)
-            cls._initialized = True
 
 @asynccontextmanager
 async def track_agent_run(
@@ -32,36 +210,48 @@ async def track_agent_run(
 ):
     """
     Async context manager to track an agent run in MLflow.
+    Params, metrics and output are collected in memory and exported in the background when the run ends.
     """
-    MLflowTracker.initialize()
-    
-    with mlflow.start_run(run_name=run_name) as run:
-        # Log basic params
-        mlflow.log_param("model", model_name)
-        for k, v in inputs.items():
-            mlflow.log_param(f"input_{k}", v)
-        
-        start_time = time.time()
-        try:
-            yield run
-            # If successful, we can log success metadada if needed here
-        except Exception as e:
-            mlflow.log_param("error", str(e))
-            mlflow.log_metric("success", 0)
-            raise e
-        finally:
-            duration = time.time() - start_time
-            mlflow.log_metric("latency", duration)
+    record = RunRecord(run_name=run_name)
+    record.param("model", model_name)
+    for k, v in inputs.items():
+        record.param(f"input_{k}", v)
+
+    previous = _current_run.get()
+    _current_run.set(record)
+    start_time = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record.param("error", e)
+        record.metrics["success"] = 0
+        record.status = "FAILED"
+        raise
+    finally:
+        record.end_time = time.time()
+        record.metrics["latency"] = time.perf_counter() - start_time
+        _current_run.set(previous)
+        telemetry.submit(record)
 
 def log_agent_result(output: str, metadata: Optional[Dict[str, Any]] = None):
     """
     Helper to log result and additional metadata within an active run.
     """
-    if mlflow.active_run():
-        mlflow.log_text(output, "output.txt")
+    record = _current_run.get()
+    if record is not None:
+        record.output = output[:OUTPUT_TEXT_LIMIT]
         if metadata:
             for k, v in metadata.items():
-                mlflow.log_param(f"meta_{k}", v)
+                record.param(f"meta_{k}", v)
+
+def log_agent_metrics(metrics: Dict[str, float]):
+    """
+    Helper to log numeric metrics (e.g. streaming ttfb) within an active run.
+    """
+    record = _current_run.get()
+    if record is not None:
+        for k, v in metrics.items():
+            record.metrics[k] = float(v)
 
 def log_and_handle_error(func):
     """
@@ -1,8 +1,12 @@
 import os
 from typing import Optional
 from pydantic_ai.models.google import GoogleModel
+from pydantic_ai.providers.google import GoogleProvider
 from pydantic_ai.providers.ollama import OllamaProvider
+from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.models.openai import OpenAIChatModel
+from core.model_registry import ModelRegistry
+from core.metrics import track_cache
 
 
 class Settings:
@@ -49,40 +53,144 @@ class Settings:
     def MLFLOW_EXPERIMENT_NAME(self) -> str:
         return os.getenv('MLFLOW_EXPERIMENT_NAME', 'Personal Finance Assistant')
 
+    @property
+    def TELEMETRY_QUEUE_SIZE(self) -> int:
+        return int(os.getenv('TELEMETRY_QUEUE_SIZE', '1000'))
+
+    @property
+    def TELEMETRY_FLUSH_INTERVAL(self) -> float:
+        return float(os.getenv('TELEMETRY_FLUSH_INTERVAL', '2'))
+
+    # Agent response cache (read-only questions)
+    @property
+    def RESPONSE_CACHE_SIZE(self) -> int:
+        return int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+
+    @property
+    def RESPONSE_CACHE_TTL(self) -> float:
+        return float(os.getenv('RESPONSE_CACHE_TTL', '300'))
+
+    # Ledger snapshot in agent system prompts; the TTL bounds staleness from other processes' writes
+    @property
+    def LEDGER_DIGEST_TTL(self) -> float:
+        return float(os.getenv('LEDGER_DIGEST_TTL', '60'))
+
+    @property
+    def LEDGER_DIGEST_ERROR_TTL(self) -> float:
+        return float(os.getenv('LEDGER_DIGEST_ERROR_TTL', '5'))
+
+    # Persisted anomaly-detector statistics
+    @property
+    def ANOMALY_STATE_PATH(self) -> str:
+        return os.getenv('ANOMALY_STATE_PATH', '.state/anomaly_stats.json')
+
+    @property
+    def ANOMALY_SAVE_INTERVAL(self) -> float:
+        return float(os.getenv('ANOMALY_SAVE_INTERVAL', '5'))
+
+    # Conversation history kept between turns
+    @property
+    def HISTORY_TOKEN_BUDGET(self) -> int:
+        return int(os.getenv('HISTORY_TOKEN_BUDGET', '4000'))
+
+    @property
+    def HISTORY_TOOL_OUTPUT_CHARS(self) -> int:
+        return int(os.getenv('HISTORY_TOOL_OUTPUT_CHARS', '600'))
+
+    # Web service backpressure
+    @property
+    def AGENT_MAX_CONCURRENT_RUNS(self) -> int:
+        return int(os.getenv('AGENT_MAX_CONCURRENT_RUNS', '8'))
+
+    @property
+    def AGENT_MAX_QUEUE(self) -> int:
+        return int(os.getenv('AGENT_MAX_QUEUE', '32'))
+
+    @property
+    def AGENT_QUEUE_TIMEOUT(self) -> float:
+        return float(os.getenv('AGENT_QUEUE_TIMEOUT', '15'))
+
+    @property
+    def BLOCKING_POOL_SIZE(self) -> int:
+        return int(os.getenv('BLOCKING_POOL_SIZE', '16'))
+
+    # Coalesce concurrent identical repository reads
+    @property
+    def SINGLE_FLIGHT_ENABLED(self) -> bool:
+        return os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Write-behind journal for ledger writes (one process per journal directory)
+    @property
+    def WRITE_BEHIND_ENABLED(self) -> bool:
+        return os.getenv('WRITE_BEHIND_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+    @property
+    def WRITE_JOURNAL_DIR(self) -> str:
+        return os.getenv('WRITE_JOURNAL_DIR', '.state/journal')
+
+    # Shared model HTTP clients
+    @property
+    def MODEL_HTTP_TIMEOUT(self) -> float:
+        return float(os.getenv('MODEL_HTTP_TIMEOUT', '60'))
+
+    @property
+    def MODEL_HTTP_MAX_CONNECTIONS(self) -> int:
+        return int(os.getenv('MODEL_HTTP_MAX_CONNECTIONS', '20'))
+
     def get_model(self, override_provider: str = None):
         """
         Unified model provider selection.
+        Models are memoized per (provider, model, base_url, key) and share one HTTP client per provider.
         """
         provider = (override_provider or self.MODEL_PROVIDER).lower()
         
         if provider in ['gemini', 'google']:
             api_key = self.GEMINI_API_KEY or os.getenv('GOOGLE_API_KEY')
-            if not api_key:
-                # We return a string here to let Pydantic AI try to find it in the env
-                # but it's better to be explicit.
-                return GoogleModel(self.GEMINI_MODEL)
-            return GoogleModel(self.GEMINI_MODEL, api_key=api_key)
+            key = ('google', self.GEMINI_MODEL, None, api_key)
+            # Without a key GoogleProvider falls back to GOOGLE_API_KEY / Vertex settings from the env
+            return model_registry.get(key, lambda: GoogleModel(
+                self.GEMINI_MODEL,
+                provider=GoogleProvider(api_key=api_key, http_client=model_registry.http_client('google'))
+            ))
             
         elif provider == 'ollama':            
             base_url = self.OLLAMA_BASE_URL
             if 'ollama.com' in base_url.lower() and not base_url.endswith('/v1'):
                 base_url = base_url.rstrip('/') + '/v1'
                 
-            provider_inst = OllamaProvider(
-                base_url=base_url,
-                api_key=self.OLLAMA_API_KEY
-            )
-            return OpenAIChatModel(self.OLLAMA_MODEL, provider=provider_inst)
+            key = ('ollama', self.OLLAMA_MODEL, base_url, self.OLLAMA_API_KEY)
+            return model_registry.get(key, lambda: OpenAIChatModel(
+                self.OLLAMA_MODEL,
+                provider=OllamaProvider(
+                    base_url=base_url,
+                    api_key=self.OLLAMA_API_KEY,
+                    http_client=model_registry.http_client('ollama')
+                )
+            ))
             
         elif provider == 'openai':
             if self.OPENAI_API_KEY:
-                return OpenAIChatModel(self.OPENAI_MODEL, api_key=self.OPENAI_API_KEY)
+                key = ('openai', self.OPENAI_MODEL, None, self.OPENAI_API_KEY)
+                return model_registry.get(key, lambda: OpenAIChatModel(
+                    self.OPENAI_MODEL,
+                    provider=OpenAIProvider(api_key=self.OPENAI_API_KEY, http_client=model_registry.http_client('openai'))
+                ))
             return f'openai:{self.OPENAI_MODEL}'
             
         else:
             # Default fallback to Gemini
-            api_key = self.GEMINI_API_KEY or os.getenv('GOOGLE_API_KEY')
-            return GoogleModel(self.GEMINI_MODEL, api_key=api_key)
+            return self.get_model('gemini')
+
+    def warm_models(self, *providers: str):
+        """
+        Build the models for the given providers (default: MODEL_PROVIDER) ahead of the first request.
+        """
+        for provider in providers or (self.MODEL_PROVIDER,):
+            self.get_model(provider)
 
 # Global settings instance
 settings = Settings()
+
+# Process-wide model cache used by get_model
+model_registry = ModelRegistry(settings.MODEL_HTTP_TIMEOUT, settings.MODEL_HTTP_MAX_CONNECTIONS)
+track_cache("model", lambda: model_registry.stats.hits, lambda: model_registry.stats.misses)
@@ -0,0 +1,160 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.models.reports import AggregateRow
+from finance.repositories.transaction_repository import TransactionRepository
+from core.metrics import track_cache
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    executed: int = 0
+
+    @property
+    def shared(self) -> int:
+        return self.calls - self.executed
+
+    @property
+    def coalescing_rate(self) -> float:
+        return self.shared / self.calls if self.calls else 0.0
+
+    def summary(self) -> str:
+        return f"single-flight: {self.calls} reads, {self.executed} fetched, {self.coalescing_rate * 100:.0f}% coalesced"
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution whose result (or exception)
+    every caller receives. Nothing is cached: a call arriving after the flight lands starts a new one.
+    Callers are threads; coroutines reach it through core.concurrency.to_thread (the blocking pool),
+    which is how agent tools and the web endpoints already call the repositories.
+    """
+    def __init__(self):
+        self.stats = FlightStats()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[_Flight, bool]:
+        with self._lock:
+            self.stats.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.executed += 1
+            return flight, leader
+
+    def _execute(self, key: Hashable, flight: _Flight, fn: Callable[[], Any]):
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._flights[key]
+                flight.done.set()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        flight, leader = self._join(key)
+        if leader:
+            self._execute(key, flight, fn)
+        else:
+            flight.done.wait()
+        return flight.outcome()
+
+
+def _copy(result: Any) -> Any:
+    # Callers may sort or extend what they get back; never let them share one list
+    return list(result) if isinstance(result, list) else result
+
+
+class SingleFlightRepository(TransactionRepository):
+    """
+    Read-coalescing wrapper: identical concurrent reads (same method, arguments and repository
+    version) share one backend query. Writes pass straight through, and because the version is
+    part of the key, a read that starts after a write never joins a flight started before it.
+    """
+    def __init__(self, inner: TransactionRepository, flight: Optional[SingleFlight] = None):
+        self.inner = inner
+        self.flight = flight or SingleFlight()
+
+    @property
+    def version(self) -> int:
+        return self.inner.version
+
+    def _read(self, name: str, *args: Any) -> Any:
+        key = (id(self.inner), name, args, self.inner.version)
+        return _copy(self.flight.do(key, lambda: getattr(self.inner, name)(*args)))
+
+    # --- writes --------------------------------------------------------------
+
+    def add(self, transaction: Transaction) -> Transaction:
+        return self.inner.add(transaction)
+
+    def add_many(self, transactions: List[Transaction]) -> List[Transaction]:
+        return self.inner.add_many(transactions)
+
+    def clear(self) -> None:
+        self.inner.clear()
+
+    # --- coalesced reads -----------------------------------------------------
+
+    def list_all(self) -> List[Transaction]:
+        return self._read("list_all")
+
+    def list_by_type(self, transaction_type: TransactionType) -> List[Transaction]:
+        return self._read("list_by_type", transaction_type)
+
+    def list_by_category(self, category: TransactionCategory) -> List[Transaction]:
+        return self._read("list_by_category", category)
+
+    def list_by_date_range(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Transaction]:
+        return self._read("list_by_date_range", start_date, end_date)
+
+    def list_recent(self, limit: int) -> List[Transaction]:
+        return self._read("list_recent", limit)
+
+    def total_amount(self, transaction_type: Optional[TransactionType] = None) -> float:
+        return self._read("total_amount", transaction_type)
+
+    def totals_by_category(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._read("totals_by_category", start_date, end_date)
+
+    def totals_by_month(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[TransactionCategory] = None
+    ) -> List[AggregateRow]:
+        return self._read("totals_by_month", start_date, end_date, category)
+
+    def top_descriptions(self, limit: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._read("top_descriptions", limit, start_date, end_date)
+
+    def search_description(self, text: str, limit: int) -> List[Transaction]:
+        return self._read("search_description", text, limit)
+
+
+# Shared by every wrapped repository in the process, so stats cover all reads
+read_flight = SingleFlight()
+# A coalesced read is served without its own backend query, like a cache hit
+track_cache("repository_read_flight", lambda: read_flight.stats.shared, lambda: read_flight.stats.executed)
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
+
+from core.tracing import record_run
+
+
+@dataclass
+class StreamChunk:
+    """
+    A single incremental piece of an agent run.
+    kind is one of: 'text', 'tool_call', 'tool_result', 'done'.
+    """
+    kind: str
+    content: str = ""
+    tool_name: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "content": self.content, "tool_name": self.tool_name}
+
+
+@dataclass
+class StreamStats:
+    """
+    Latency figures for a streamed run (seconds).
+    """
+    started_at: float = field(default_factory=time.perf_counter)
+    first_byte_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tool_calls: int = 0
+
+    def mark_first_byte(self):
+        if self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+
+    @property
+    def time_to_first_byte(self) -> Optional[float]:
+        if self.first_byte_at is None:
+            return None
+        return self.first_byte_at - self.started_at
+
+    @property
+    def total_latency(self) -> Optional[float]:
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def as_metrics(self) -> Dict[str, float]:
+        metrics = {"tool_calls": float(self.tool_calls)}
+        if self.time_to_first_byte is not None:
+            metrics["ttfb"] = self.time_to_first_byte
+        if self.total_latency is not None:
+            metrics["total_latency"] = self.total_latency
+        return metrics
+
+
+class AgentStream:
+    """
+    Runs an agent in the background and exposes its progress as an async iterator of StreamChunks.
+
+    Usage:
+        stream = AgentStream(agent, "I spent $10 on lunch", deps=deps)
+        async for chunk in stream:
+            ...
+        stream.result  # the final AgentRunResult
+        stream.stats   # ttfb / total latency
+    """
+    _SENTINEL = object()
+
+    def __init__(self, agent: Agent, user_prompt: str, **run_kwargs):
+        self.agent = agent
+        self.user_prompt = user_prompt
+        self.run_kwargs = run_kwargs
+        self.stats = StreamStats()
+        self.result = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tool_names: Dict[str, str] = {}
+
+    async def _handle_events(self, ctx, events: AsyncIterator[Any]):
+        async for event in events:
+            chunk = self._to_chunk(event)
+            if chunk is not None:
+                self.stats.mark_first_byte()
+                await self._queue.put(chunk)
+
+    def _to_chunk(self, event: Any) -> Optional[StreamChunk]:
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            if event.part.content:
+                return StreamChunk("text", event.part.content)
+        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+            if event.delta.content_delta:
+                return StreamChunk("text", event.delta.content_delta)
+        elif isinstance(event, FunctionToolCallEvent):
+            self.stats.tool_calls += 1
+            self._tool_names[event.part.tool_call_id] = event.part.tool_name
+            return StreamChunk("tool_call", str(event.part.args or ""), event.part.tool_name)
+        elif isinstance(event, FunctionToolResultEvent):
+            tool_name = self._tool_names.get(event.tool_call_id)
+            return StreamChunk("tool_result", "", tool_name)
+        return None
+
+    async def _run(self):
+        try:
+            self.result = await self.agent.run(
+                self.user_prompt,
+                event_stream_handler=self._handle_events,
+                **self.run_kwargs
+            )
+            record_run(self.agent.name or "agent", self.result)
+        finally:
+            self.stats.finished_at = time.perf_counter()
+            await self._queue.put(self._SENTINEL)
+
+    async def __aiter__(self) -> AsyncIterator[StreamChunk]:
+        # Latency is measured from when the run starts, not from when the stream was built
+        self.stats.started_at = time.perf_counter()
+        task = asyncio.create_task(self._run())
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is self._SENTINEL:
+                    break
+                yield item
+            # Surface any exception raised by the run itself
+            await task
+            yield StreamChunk("done", str(self.result.output))
+        finally:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,73 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+
+_current_trace: ContextVar[Optional["TurnTrace"]] = ContextVar("current_turn_trace", default=None)
+
+
+@dataclass
+class TurnTrace:
+    """
+    Per-user-turn accounting of LLM calls, tool calls and wall time,
+    summed across every agent run (including nested ones) recorded during the turn.
+    """
+    name: str
+    llm_calls: int = 0
+    tool_calls: int = 0
+    agent_runs: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    def record(self, agent_name: str, result: Any):
+        """
+        Add the model requests and tool calls found in a finished run's new messages.
+        """
+        self.agent_runs.append(agent_name)
+        for message in result.new_messages():
+            if isinstance(message, ModelResponse):
+                self.llm_calls += 1
+                self.tool_calls += sum(1 for p in message.parts if isinstance(p, ToolCallPart))
+
+    @property
+    def wall_time(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def as_metrics(self) -> Dict[str, float]:
+        return {
+            "turn_llm_calls": float(self.llm_calls),
+            "turn_tool_calls": float(self.tool_calls),
+            "turn_agent_runs": float(len(self.agent_runs)),
+            "turn_wall_time": self.wall_time,
+        }
+
+    def summary(self) -> str:
+        return (f"[{self.name}] {self.llm_calls} LLM calls, {self.tool_calls} tool calls, "
+                f"{len(self.agent_runs)} agent runs ({' -> '.join(self.agent_runs)}), {self.wall_time:.2f}s")
+
+
+@contextmanager
+def trace_turn(name: str):
+    """
+    Open a TurnTrace for the current task; record_run() calls inside it are accumulated.
+    """
+    trace = TurnTrace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finished_at = time.perf_counter()
+        _current_trace.reset(token)
+
+
+def record_run(agent_name: str, result: Any):
+    """
+    Attribute a finished agent run to the active turn trace, if any.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(agent_name, result)
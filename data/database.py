@@ -1,21 +1,36 @@
 import os
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client, Client
 from finance.models.transaction import Transaction 
 from finance.models.enums import TransactionType, TransactionCategory
+from finance.models.reports import AggregateRow
 from finance.repositories.transaction_repository import TransactionRepository
+from finance.models.budget import Budget
+from finance.repositories.budget_repository import BudgetRepository
 from core.observability import log_and_handle_error
+from core.metrics import metrics
 from postgrest.exceptions import APIError
 
 load_dotenv()
 
+repository_request_seconds = metrics.histogram(
+    "repository_request_seconds", "Supabase round-trip time per request.", ("table", "op"))
+repository_errors = metrics.counter("repository_errors_total", "Supabase requests that raised.", ("table", "op"))
+repository_rows = metrics.histogram("repository_rows", "Rows returned per Supabase request.", ("table", "op"))
+rows_mapped = metrics.counter("repository_rows_mapped_total", "Rows converted to domain transactions.", ("table",))
+map_seconds = metrics.counter("repository_map_seconds_total", "Time spent converting rows to domain transactions.", ("table",))
+map_rows_per_second = metrics.gauge(
+    "repository_map_rows_per_second", "Row-mapping throughput of the last batch.", ("table",))
+
 class BaseSupabaseRepository:
     def __init__(self, table: str):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
         self.table = table
+        self.version = 0
         if not self.url or not self.key:
             self.supabase = None
         else:
@@ -25,6 +40,105 @@ class BaseSupabaseRepository:
         if not self.supabase:
             raise ValueError("Supabase is not configured. Please set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env")
 
+    def _execute(self, query, op: str):
+        """
+        Send a built query, recording its round-trip time and row count under `op`.
+        """
+        started = time.perf_counter()
+        try:
+            response = query.execute()
+        except Exception:
+            repository_errors.inc(table=self.table, op=op)
+            raise
+        repository_request_seconds.observe(time.perf_counter() - started, table=self.table, op=op)
+        data = response.data
+        repository_rows.observe(len(data) if isinstance(data, list) else 0, table=self.table, op=op)
+        return response
+
+    def _aggregate(self, function: str, params: Dict[str, Any]) -> List[AggregateRow]:
+        """
+        Run one of the ledger_* SQL aggregate functions (see data/setup.sql) server-side.
+        """
+        self._check_client()
+        params = {"p_table": self.table, **params}
+        response = self._execute(self.supabase.rpc(function, params), function)
+        return [
+            AggregateRow(key=str(row["key"] or ""), total=float(row["total"] or 0), count=int(row["tx_count"]))
+            for row in response.data or []
+        ]
+
+    @staticmethod
+    def _range_params(start_date: Optional[datetime], end_date: Optional[datetime]) -> Dict[str, Any]:
+        return {
+            "p_start": start_date.isoformat() if start_date else None,
+            "p_end": end_date.isoformat() if end_date else None,
+        }
+
+    @log_and_handle_error
+    def totals_by_category(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._aggregate("ledger_totals_by_category", self._range_params(start_date, end_date))
+
+    @log_and_handle_error
+    def totals_by_month(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[TransactionCategory] = None
+    ) -> List[AggregateRow]:
+        params = self._range_params(start_date, end_date)
+        params["p_category"] = category.value if category else None
+        return self._aggregate("ledger_totals_by_month", params)
+
+    @log_and_handle_error
+    def top_descriptions(self, limit: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        params = self._range_params(start_date, end_date)
+        params["p_limit"] = limit
+        return self._aggregate("ledger_top_descriptions", params)
+
+    @log_and_handle_error
+    def add(self, tx: Transaction) -> Transaction:
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).insert(self._to_row(tx)), "add")
+        self.version += 1
+        if response.data:
+            tx = tx.model_copy(update={"id": response.data[0]["id"]})
+        return tx
+
+    @log_and_handle_error
+    def add_many(self, transactions: List[Transaction]) -> List[Transaction]:
+        """
+        Insert several rows in one request.
+        """
+        if not transactions:
+            return []
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).insert([self._to_row(tx) for tx in transactions]), "add_many")
+        self.version += 1
+        if response.data and len(response.data) == len(transactions):
+            return [tx.model_copy(update={"id": row["id"]}) for tx, row in zip(transactions, response.data)]
+        return list(transactions)
+
+    @log_and_handle_error
+    def search_description(self, text: str, limit: int) -> List[Transaction]:
+        """
+        Word / trigram search served by the pg_trgm GIN index (see ledger_search_description in data/setup.sql).
+        """
+        self._check_client()
+        params = {"p_table": self.table, "p_query": text, "p_limit": limit}
+        response = self._execute(self.supabase.rpc("ledger_search_description", params), "search_description")
+        default_type = TransactionType.INCOME if self.table == "income" else TransactionType.EXPENSE
+        return self._map_rows(response.data or [], default_type)
+
+    def _map_rows(self, rows: List[dict], default_type: TransactionType) -> List[Transaction]:
+        started = time.perf_counter()
+        mapped = [self._map_to_domain(row, default_type) for row in rows]
+        elapsed = time.perf_counter() - started
+        rows_mapped.inc(len(mapped), table=self.table)
+        map_seconds.inc(elapsed, table=self.table)
+        if mapped and elapsed > 0:
+            map_rows_per_second.set(len(mapped) / elapsed, table=self.table)
+        return mapped
+
     def _map_to_domain(self, row: dict, default_type: TransactionType) -> Transaction:
         # Map source to description for income if present
         description = row.get("description", "")
@@ -61,25 +175,20 @@ class SupabaseExpenseRepository(BaseSupabaseRepository, TransactionRepository):
     def __init__(self):
         super().__init__(table="expenses")
 
-    @log_and_handle_error
-    def add(self, tx: Transaction) -> Transaction:
-        self._check_client()
-        data = {
+    @staticmethod
+    def _to_row(tx: Transaction) -> dict:
+        return {
             "amount": tx.amount,
             "category": tx.category.value if tx.category else TransactionCategory.OTHER.value,
             "description": tx.description,
             "date": tx.date.isoformat()
         }
-        response = self.supabase.table(self.table).insert(data).execute()
-        if response.data:
-            tx = tx.model_copy(update={"id": response.data[0]["id"]})
-        return tx
 
     @log_and_handle_error
     def list_all(self) -> List[Transaction]:
         self._check_client()
-        response = self.supabase.table(self.table).select("*").order("date", desc=True).execute()
-        return [self._map_to_domain(item, TransactionType.EXPENSE) for item in response.data]
+        response = self._execute(self.supabase.table(self.table).select("*").order("date", desc=True), "list_all")
+        return self._map_rows(response.data, TransactionType.EXPENSE)
 
     @log_and_handle_error
     def list_by_type(self, transaction_type: TransactionType) -> List[Transaction]:
@@ -90,8 +199,8 @@ class SupabaseExpenseRepository(BaseSupabaseRepository, TransactionRepository):
     @log_and_handle_error
     def list_by_category(self, category: TransactionCategory) -> List[Transaction]:
         self._check_client()
-        response = self.supabase.table(self.table).select("*").eq("category", category.value).order("date", desc=True).execute()
-        return [self._map_to_domain(item, TransactionType.EXPENSE) for item in response.data]
+        response = self._execute(self.supabase.table(self.table).select("*").eq("category", category.value).order("date", desc=True), "list_by_category")
+        return self._map_rows(response.data, TransactionType.EXPENSE)
 
     @log_and_handle_error
     def list_by_date_range(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Transaction]:
@@ -101,43 +210,45 @@ class SupabaseExpenseRepository(BaseSupabaseRepository, TransactionRepository):
             query = query.gte("date", start_date.isoformat())
         if end_date:
             query = query.lte("date", end_date.isoformat())
-        response = query.order("date", desc=True).execute()
-        return [self._map_to_domain(item, TransactionType.EXPENSE) for item in response.data]
+        response = self._execute(query.order("date", desc=True), "list_by_date_range")
+        return self._map_rows(response.data, TransactionType.EXPENSE)
+
+    @log_and_handle_error
+    def list_recent(self, limit: int) -> List[Transaction]:
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).select("*").order("date", desc=True).limit(limit), "list_recent")
+        return self._map_rows(response.data, TransactionType.EXPENSE)
 
     def total_amount(self, transaction_type: Optional[TransactionType] = None) -> float:
         if transaction_type and transaction_type != TransactionType.EXPENSE:
             return 0.0
         self._check_client()
-        response = self.supabase.table(self.table).select("amount").execute()
+        response = self._execute(self.supabase.table(self.table).select("amount"), "total_amount")
         return sum(item["amount"] for item in response.data)
 
     def clear(self) -> None:
         self._check_client()
-        self.supabase.table(self.table).delete().neq("id", 0).execute()
+        self._execute(self.supabase.table(self.table).delete().neq("id", 0), "clear")
+        self.version += 1
 
 class SupabaseIncomeRepository(BaseSupabaseRepository, TransactionRepository):
     def __init__(self):
         super().__init__(table="income")
 
-    @log_and_handle_error
-    def add(self, tx: Transaction) -> Transaction:
-        self._check_client()
-        data = {
+    @staticmethod
+    def _to_row(tx: Transaction) -> dict:
+        return {
             "amount": tx.amount,
             "source": tx.description, # Map description to source for backwards compatibility/schema
             "description": tx.description,
             "date": tx.date.isoformat()
         }
-        response = self.supabase.table(self.table).insert(data).execute()
-        if response.data:
-            tx = tx.model_copy(update={"id": response.data[0]["id"]})
-        return tx
 
     @log_and_handle_error
     def list_all(self) -> List[Transaction]:
         self._check_client()
-        response = self.supabase.table(self.table).select("*").order("date", desc=True).execute()
-        return [self._map_to_domain(item, TransactionType.INCOME) for item in response.data]
+        response = self._execute(self.supabase.table(self.table).select("*").order("date", desc=True), "list_all")
+        return self._map_rows(response.data, TransactionType.INCOME)
 
     @log_and_handle_error
     def list_by_type(self, transaction_type: TransactionType) -> List[Transaction]:
@@ -159,19 +270,66 @@ class SupabaseIncomeRepository(BaseSupabaseRepository, TransactionRepository):
             query = query.gte("date", start_date.isoformat())
         if end_date:
             query = query.lte("date", end_date.isoformat())
-        response = query.order("date", desc=True).execute()
-        return [self._map_to_domain(item, TransactionType.INCOME) for item in response.data]
+        response = self._execute(query.order("date", desc=True), "list_by_date_range")
+        return self._map_rows(response.data, TransactionType.INCOME)
+
+    @log_and_handle_error
+    def list_recent(self, limit: int) -> List[Transaction]:
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).select("*").order("date", desc=True).limit(limit), "list_recent")
+        return self._map_rows(response.data, TransactionType.INCOME)
 
     def total_amount(self, transaction_type: Optional[TransactionType] = None) -> float:
         if transaction_type and transaction_type != TransactionType.INCOME:
             return 0.0
         self._check_client()
-        response = self.supabase.table(self.table).select("amount").execute()
+        response = self._execute(self.supabase.table(self.table).select("amount"), "total_amount")
         return sum(item["amount"] for item in response.data)
 
     def clear(self) -> None:
         self._check_client()
-        self.supabase.table(self.table).delete().neq("id", 0).execute()
+        self._execute(self.supabase.table(self.table).delete().neq("id", 0), "clear")
+        self.version += 1
+
+class SupabaseBudgetRepository(BaseSupabaseRepository, BudgetRepository):
+    def __init__(self):
+        super().__init__(table="budgets")
+
+    @staticmethod
+    def _to_budget(row: dict) -> Budget:
+        return Budget(
+            id=row["id"],
+            category=TransactionCategory(row["category"]),
+            month=row["month"],
+            amount=row["amount"]
+        )
+
+    @log_and_handle_error
+    def upsert(self, budget: Budget) -> Budget:
+        self._check_client()
+        data = {"category": budget.category.value, "month": budget.month, "amount": budget.amount}
+        response = self._execute(self.supabase.table(self.table).upsert(data, on_conflict="category,month"), "upsert")
+        self.version += 1
+        if response.data:
+            budget = self._to_budget(response.data[0])
+        return budget
+
+    @log_and_handle_error
+    def list_for_month(self, month: str) -> List[Budget]:
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).select("*").eq("month", month), "list_for_month")
+        return [self._to_budget(row) for row in response.data]
+
+    @log_and_handle_error
+    def list_all(self) -> List[Budget]:
+        self._check_client()
+        response = self._execute(self.supabase.table(self.table).select("*").order("month"), "list_all")
+        return [self._to_budget(row) for row in response.data]
+
+    def clear(self) -> None:
+        self._check_client()
+        self._execute(self.supabase.table(self.table).delete().neq("id", 0), "clear")
+        self.version += 1
 
 # Backwards compatibility alias if needed, though we should prefer the specific ones
 class SupabaseTransactionRepository(SupabaseExpenseRepository):
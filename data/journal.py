@@ -0,0 +1,419 @@
+# data/journal.py
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.models.reports import AggregateRow
+from finance.repositories.transaction_repository import TransactionRepository
+from finance.search import tokenize
+from finance.periods import as_utc
+from core.observability import logger
+
+# Rows sent to the backing repository per bulk insert
+FLUSH_BATCH_SIZE = 200
+# Seconds the flusher waits for more writes before sending a partial batch
+FLUSH_INTERVAL = 0.25
+# Retry backoff after a failed flush: doubles from the base up to the cap
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+# Attempts a read makes to get a result no batch landed during; after that in-flight rows are left out
+READ_ATTEMPTS = 3
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WriteJournal:
+    """
+    Append-only JSONL file of writes that have not reached the backing store yet.
+    Each append is flushed and fsync'd before returning, so an acknowledged write survives a crash.
+    Acknowledged entries are dropped by rewriting the remainder (write-then-rename).
+    File I/O is serialized by its own lock, so pending() never waits for an fsync.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._entries: Dict[int, Transaction] = {}
+        self._next_seq = 1
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._replay()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    seq = int(entry["seq"])
+                    tx = Transaction.model_validate(entry["tx"])
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn final line from a crash mid-append was never acknowledged
+                    logger.warning(f"Skipping unreadable journal entry in {self.path}: {e}")
+                    continue
+                self._entries[seq] = tx
+                self._next_seq = max(self._next_seq, seq + 1)
+
+    def append(self, tx: Transaction) -> int:
+        with self._file_lock:
+            with self._lock:
+                seq = self._next_seq
+                self._next_seq += 1
+            self._file.write(json.dumps({"seq": seq, "tx": tx.model_dump(mode="json")}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            with self._lock:
+                self._entries[seq] = tx
+        return seq
+
+    def pending(self) -> List[Tuple[int, Transaction]]:
+        """
+        Unacknowledged (seq, transaction) pairs, oldest first.
+        """
+        with self._lock:
+            return sorted(self._entries.items())
+
+    def ack(self, seqs: List[int]):
+        """
+        Forget entries that are now stored in the backing repository.
+        """
+        with self._file_lock:
+            with self._lock:
+                for seq in seqs:
+                    self._entries.pop(seq, None)
+            self._rewrite()
+
+    def clear(self):
+        with self._file_lock:
+            with self._lock:
+                self._entries.clear()
+            self._rewrite()
+
+    def _rewrite(self):
+        # Caller holds the file lock, so no append can land between the snapshot and the rename
+        entries = self.pending()
+        self._file.close()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for seq, tx in entries:
+                f.write(json.dumps({"seq": seq, "tx": tx.model_dump(mode="json")}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self):
+        with self._file_lock:
+            self._file.close()
+
+
+def _ts(moment: datetime) -> float:
+    # Naive and tz-aware datetimes both map onto one comparable axis
+    return moment.timestamp()
+
+
+def _in_range(rows: List[Transaction], start_date: Optional[datetime], end_date: Optional[datetime]) -> List[Transaction]:
+    return [
+        t for t in rows
+        if (start_date is None or _ts(t.date) >= _ts(start_date)) and (end_date is None or _ts(t.date) <= _ts(end_date))
+    ]
+
+
+def _merge_groups(stored: List[AggregateRow], pending: List[Transaction], key_fn: Callable[[Transaction], str]) -> List[AggregateRow]:
+    totals: Dict[str, List[float]] = {r.key: [r.total, r.count] for r in stored}
+    for t in pending:
+        bucket = totals.setdefault(key_fn(t), [0.0, 0])
+        bucket[0] += t.amount
+        bucket[1] += 1
+    merged = [AggregateRow(key=k, total=v[0], count=int(v[1])) for k, v in totals.items()]
+    return sorted(merged, key=lambda r: r.total, reverse=True)
+
+
+class WriteBehindRepository(TransactionRepository):
+    """
+    Wraps a repository so `add` costs one fsync'd journal append instead of a network round trip.
+    A background thread drains the journal into the inner repository in bulk inserts, retrying
+    with exponential backoff while it is unreachable; rows journaled before a crash are replayed
+    on the next start. Reads merge still-pending rows, so callers always see their own writes.
+
+    Delivery is at-least-once: a crash between a successful insert and its acknowledgement
+    re-sends that batch. Only one process may own a journal file.
+
+    No lock is held across network calls. A read snapshots the pending rows, queries the inner
+    repository, and is retried if a batch was in flight meanwhile (its rows could be counted
+    twice); on the last attempt it leaves in-flight rows out rather than wait for the insert.
+    """
+    def __init__(
+        self,
+        inner: TransactionRepository,
+        journal: WriteJournal,
+        batch_size: int = FLUSH_BATCH_SIZE,
+        interval: float = FLUSH_INTERVAL,
+        start: bool = True
+    ):
+        self.inner = inner
+        self.journal = journal
+        self.batch_size = batch_size
+        self.interval = interval
+        self.last_error: Optional[str] = None
+        self._local_writes = 0
+        # Guards the write counter and the flight bookkeeping below; never held across I/O
+        self._lock = threading.Lock()
+        # Batches started, seqs being inserted, and seqs stored but not yet acknowledged
+        self._sent = 0
+        self._in_flight: Set[int] = set()
+        self._landed: Set[int] = set()
+        # Serializes the flusher with clear(); reads never take it
+        self._flushing = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self.start()
+
+    @property
+    def version(self) -> int:
+        return self.inner.version + self._local_writes
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.journal)
+
+    # --- background flushing -------------------------------------------------
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="write-behind-flusher", daemon=True)
+            self._thread.start()
+            if len(self.journal):
+                self._wake.set()
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            if failures:
+                # New writes do not cut the backoff short; only shutdown does
+                self._stop.wait(min(RETRY_BASE_DELAY * 2 ** (failures - 1), RETRY_MAX_DELAY))
+            else:
+                self._wake.wait()
+                # Give concurrent writers a moment to fill the batch
+                time.sleep(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            failures = 0 if self.flush_once() else failures + 1
+
+    def flush_once(self) -> bool:
+        """
+        Send every pending row to the inner repository, one bulk insert per batch.
+        Returns False if a batch failed (the rest stay journaled for the next attempt).
+        """
+        while True:
+            try:
+                with self._flushing:
+                    if not self._send_batch():
+                        break
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Write-behind flush failed ({len(self.journal)} pending): {e}")
+                return False
+            self.last_error = None
+        with self._idle:
+            self._idle.notify_all()
+        return True
+
+    def _send_batch(self) -> bool:
+        # Caller holds _flushing. Returns False when nothing was left to send.
+        with self._lock:
+            landed = sorted(self._landed)
+        if landed:
+            # Stored by an earlier attempt whose acknowledgement failed: acknowledge, don't re-send
+            self._ack(landed)
+        batch = self.journal.pending()[:self.batch_size]
+        if not batch:
+            return False
+        seqs = [seq for seq, _ in batch]
+        with self._lock:
+            self._sent += 1
+            self._in_flight.update(seqs)
+        try:
+            self.inner.add_many([tx for _, tx in batch])
+        except Exception:
+            with self._lock:
+                self._in_flight.clear()
+            raise
+        # One step, so a read never sees the rows as neither in flight nor landed
+        with self._lock:
+            self._in_flight.clear()
+            self._landed.update(seqs)
+        self._ack(seqs)
+        return True
+
+    def _ack(self, seqs: List[int]):
+        self.journal.ack(seqs)
+        with self._lock:
+            self._landed.difference_update(seqs)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the journal is empty or the timeout passes. Returns True if everything was sent.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._thread is None:
+            self.flush_once()
+            return not len(self.journal)
+        with self._idle:
+            while len(self.journal):
+                self._wake.set()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(min(remaining, 0.1) if remaining is not None else 0.1)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Try to drain the journal, then stop the flusher. Unsent rows stay on disk for the next start.
+        """
+        flushed = self.flush(timeout)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.journal.close()
+        return flushed
+
+    # --- writes --------------------------------------------------------------
+
+    def add(self, tx: Transaction) -> Transaction:
+        # Pending rows are merged with stored (timezone-aware) rows, so they must be aware too
+        tx = tx.model_copy(update={"date": as_utc(tx.date)})
+        self.journal.append(tx)
+        with self._lock:
+            self._local_writes += 1
+        self._wake.set()
+        return tx
+
+    def add_many(self, transactions: List[Transaction]) -> List[Transaction]:
+        return [self.add(tx) for tx in transactions]
+
+    def clear(self) -> None:
+        with self._flushing:
+            self.journal.clear()
+            self.inner.clear()
+            with self._lock:
+                self._landed.clear()
+                self._local_writes += 1
+
+    # --- reads (stored rows plus pending ones) -------------------------------
+
+    def _read(self, query: Callable[[], T], merge: Callable[[T, List[Transaction]], R]) -> R:
+        """
+        merge(stored, pending) for a consistent pair: pending holds exactly the rows `stored` lacks.
+        """
+        for attempt in range(READ_ATTEMPTS):
+            with self._lock:
+                sent, in_flight = self._sent, bool(self._in_flight)
+                pending = [(seq, tx) for seq, tx in self.journal.pending() if seq not in self._landed]
+            stored = query()
+            with self._lock:
+                settled = not in_flight and self._sent == sent
+                if not settled and attempt == READ_ATTEMPTS - 1:
+                    # Stop waiting on the insert: rows sent since the snapshot count as stored
+                    unsent = {seq for seq, _ in self.journal.pending()} - self._in_flight - self._landed
+                    pending = [(seq, tx) for seq, tx in pending if seq in unsent]
+                    settled = True
+            if settled:
+                return merge(stored, [tx for _, tx in pending])
+            time.sleep(self.interval / 10)
+
+    @staticmethod
+    def _newest_first(rows: List[Transaction]) -> List[Transaction]:
+        return sorted(rows, key=lambda t: _ts(t.date), reverse=True)
+
+    def list_all(self) -> List[Transaction]:
+        return self._read(self.inner.list_all, lambda stored, pending: self._newest_first(stored + pending))
+
+    def list_by_type(self, transaction_type: TransactionType) -> List[Transaction]:
+        return self._read(
+            lambda: self.inner.list_by_type(transaction_type),
+            lambda stored, pending: self._newest_first(stored + [t for t in pending if t.type == transaction_type])
+        )
+
+    def list_by_category(self, category: TransactionCategory) -> List[Transaction]:
+        return self._read(
+            lambda: self.inner.list_by_category(category),
+            lambda stored, pending: self._newest_first(stored + [t for t in pending if t.category == category])
+        )
+
+    def list_by_date_range(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Transaction]:
+        return self._read(
+            lambda: self.inner.list_by_date_range(start_date, end_date),
+            lambda stored, pending: self._newest_first(stored + _in_range(pending, start_date, end_date))
+        )
+
+    def list_recent(self, limit: int) -> List[Transaction]:
+        return self._read(
+            lambda: self.inner.list_recent(limit),
+            lambda stored, pending: self._newest_first(stored + pending)[:limit]
+        )
+
+    def total_amount(self, transaction_type: Optional[TransactionType] = None) -> float:
+        def merge(stored: float, pending: List[Transaction]) -> float:
+            return stored + sum(t.amount for t in pending if transaction_type is None or t.type == transaction_type)
+        return self._read(lambda: self.inner.total_amount(transaction_type), merge)
+
+    def totals_by_category(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._read(
+            lambda: self.inner.totals_by_category(start_date, end_date),
+            lambda stored, pending: _merge_groups(
+                stored,
+                _in_range(pending, start_date, end_date),
+                lambda t: t.category.value if t.category else TransactionCategory.OTHER.value
+            )
+        )
+
+    def totals_by_month(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[TransactionCategory] = None
+    ) -> List[AggregateRow]:
+        def merge(stored: List[AggregateRow], pending: List[Transaction]) -> List[AggregateRow]:
+            pending = _in_range(pending, start_date, end_date)
+            if category:
+                pending = [t for t in pending if t.category == category]
+            merged = _merge_groups(stored, pending, lambda t: t.date.strftime("%Y-%m"))
+            return sorted(merged, key=lambda r: r.key)
+        return self._read(lambda: self.inner.totals_by_month(start_date, end_date, category), merge)
+
+    def top_descriptions(self, limit: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        # Pending rows can lift a description past the stored top-N, so over-fetch by their key count
+        extra = len({t.description for _, t in self.journal.pending()})
+        return self._read(
+            lambda: self.inner.top_descriptions(limit + extra, start_date, end_date),
+            lambda stored, pending: _merge_groups(
+                stored, _in_range(pending, start_date, end_date), lambda t: t.description
+            )[:limit]
+        )
+
+    def search_description(self, text: str, limit: int) -> List[Transaction]:
+        words = set(tokenize(text))
+
+        def merge(stored: List[Transaction], pending: List[Transaction]) -> List[Transaction]:
+            matches = [t for t in reversed(pending) if words and words <= set(tokenize(t.description))]
+            return (matches + stored)[:limit]
+        return self._read(lambda: self.inner.search_description(text, limit), merge)
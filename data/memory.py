@@ -0,0 +1,133 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.models.reports import AggregateRow
+from finance.repositories.transaction_repository import TransactionRepository
+from finance.models.budget import Budget
+from finance.repositories.budget_repository import BudgetRepository
+from finance.search import DescriptionIndex
+from finance.periods import as_utc
+
+
+class InMemoryTransactionRepository(TransactionRepository):
+    """
+    Process-local repository used for tests, demos and offline runs.
+    Mirrors the ordering and aggregate semantics of the Supabase repositories.
+    """
+    def __init__(self, transaction_type: TransactionType):
+        self.transaction_type = transaction_type
+        self._rows: List[Transaction] = []
+        self._next_id = 1
+        self.version = 0
+        self._index = DescriptionIndex()
+
+    def add(self, tx: Transaction) -> Transaction:
+        tx = tx.model_copy(update={"id": self._next_id, "date": as_utc(tx.date)})
+        self._next_id += 1
+        self._index.add(len(self._rows), tx.description)
+        self._rows.append(tx)
+        self.version += 1
+        return tx
+
+    def add_many(self, transactions: List[Transaction]) -> List[Transaction]:
+        return [self.add(tx) for tx in transactions]
+
+    def list_all(self) -> List[Transaction]:
+        return sorted(self._rows, key=lambda t: t.date, reverse=True)
+
+    def list_by_type(self, transaction_type: TransactionType) -> List[Transaction]:
+        if transaction_type != self.transaction_type:
+            return []
+        return self.list_all()
+
+    def list_by_category(self, category: TransactionCategory) -> List[Transaction]:
+        return [t for t in self.list_all() if t.category == category]
+
+    def list_by_date_range(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Transaction]:
+        return self._in_range(self.list_all(), start_date, end_date)
+
+    def list_recent(self, limit: int) -> List[Transaction]:
+        return self.list_all()[:limit]
+
+    def total_amount(self, transaction_type: Optional[TransactionType] = None) -> float:
+        if transaction_type and transaction_type != self.transaction_type:
+            return 0.0
+        return sum(t.amount for t in self._rows)
+
+    def totals_by_category(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._group(
+            self._in_range(self._rows, start_date, end_date),
+            lambda t: t.category.value if t.category else TransactionCategory.OTHER.value
+        )
+
+    def totals_by_month(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[TransactionCategory] = None
+    ) -> List[AggregateRow]:
+        rows = self._in_range(self._rows, start_date, end_date)
+        if category:
+            rows = [t for t in rows if t.category == category]
+        return sorted(self._group(rows, lambda t: t.date.strftime("%Y-%m")), key=lambda r: r.key)
+
+    def top_descriptions(self, limit: int, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[AggregateRow]:
+        return self._group(self._in_range(self._rows, start_date, end_date), lambda t: t.description)[:limit]
+
+    def search_description(self, text: str, limit: int) -> List[Transaction]:
+        return [self._rows[i] for i in self._index.search(text, limit)]
+
+    def clear(self) -> None:
+        self._rows = []
+        self._index.clear()
+        self.version += 1
+
+    @staticmethod
+    def _in_range(rows: List[Transaction], start_date: Optional[datetime], end_date: Optional[datetime]) -> List[Transaction]:
+        start_date = as_utc(start_date) if start_date else None
+        end_date = as_utc(end_date) if end_date else None
+        return [
+            t for t in rows
+            if (start_date is None or t.date >= start_date) and (end_date is None or t.date <= end_date)
+        ]
+
+    @staticmethod
+    def _group(rows: List[Transaction], key_fn) -> List[AggregateRow]:
+        totals: Dict[str, List[float]] = {}
+        for t in rows:
+            bucket = totals.setdefault(key_fn(t), [0.0, 0])
+            bucket[0] += t.amount
+            bucket[1] += 1
+        grouped = [AggregateRow(key=k, total=v[0], count=v[1]) for k, v in totals.items()]
+        return sorted(grouped, key=lambda r: r.total, reverse=True)
+
+
+class InMemoryBudgetRepository(BudgetRepository):
+    """
+    Process-local budgets keyed by (category, month).
+    """
+    def __init__(self):
+        self._rows: Dict[tuple, Budget] = {}
+        self._next_id = 1
+        self.version = 0
+
+    def upsert(self, budget: Budget) -> Budget:
+        key = (budget.category, budget.month)
+        existing = self._rows.get(key)
+        budget = budget.model_copy(update={"id": existing.id if existing else self._next_id})
+        if not existing:
+            self._next_id += 1
+        self._rows[key] = budget
+        self.version += 1
+        return budget
+
+    def list_for_month(self, month: str) -> List[Budget]:
+        return [b for b in self._rows.values() if b.month == month]
+
+    def list_all(self) -> List[Budget]:
+        return sorted(self._rows.values(), key=lambda b: (b.month, b.category.value))
+
+    def clear(self) -> None:
+        self._rows = {}
+        self.version += 1
@@ -22,3 +22,123 @@ CREATE TABLE IF NOT EXISTS income (
 );
 
 -- Note: In Supabase, you can run this in the SQL Editor.
+
+-- ---------------------------------------------------------------------------
+-- Aggregate functions (called via supabase.rpc) so totals are computed in the
+-- database instead of shipping every row to the client / LLM.
+-- p_table must be 'expenses' or 'income'; NULL bounds mean "unbounded".
+-- ---------------------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS expenses_date_idx ON expenses (date DESC);
+CREATE INDEX IF NOT EXISTS expenses_category_date_idx ON expenses (category, date DESC);
+CREATE INDEX IF NOT EXISTS income_date_idx ON income (date DESC);
+
+CREATE OR REPLACE FUNCTION ledger_totals_by_category(
+    p_table TEXT,
+    p_start TIMESTAMPTZ DEFAULT NULL,
+    p_end TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (key TEXT, total NUMERIC, tx_count BIGINT)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    IF p_table NOT IN ('expenses', 'income') THEN
+        RAISE EXCEPTION 'Unsupported ledger table: %', p_table;
+    END IF;
+    RETURN QUERY EXECUTE format(
+        'SELECT category::TEXT, SUM(amount), COUNT(*) FROM %I
+         WHERE ($1 IS NULL OR date >= $1) AND ($2 IS NULL OR date <= $2)
+         GROUP BY category ORDER BY 2 DESC', p_table)
+    USING p_start, p_end;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ledger_totals_by_month(
+    p_table TEXT,
+    p_start TIMESTAMPTZ DEFAULT NULL,
+    p_end TIMESTAMPTZ DEFAULT NULL,
+    p_category TEXT DEFAULT NULL
+)
+RETURNS TABLE (key TEXT, total NUMERIC, tx_count BIGINT)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    IF p_table NOT IN ('expenses', 'income') THEN
+        RAISE EXCEPTION 'Unsupported ledger table: %', p_table;
+    END IF;
+    RETURN QUERY EXECUTE format(
+        'SELECT to_char(date_trunc(''month'', date), ''YYYY-MM''), SUM(amount), COUNT(*) FROM %I
+         WHERE ($1 IS NULL OR date >= $1) AND ($2 IS NULL OR date <= $2)
+           AND ($3 IS NULL OR category = $3)
+         GROUP BY 1 ORDER BY 1', p_table)
+    USING p_start, p_end, p_category;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION ledger_top_descriptions(
+    p_table TEXT,
+    p_start TIMESTAMPTZ DEFAULT NULL,
+    p_end TIMESTAMPTZ DEFAULT NULL,
+    p_limit INT DEFAULT 5
+)
+RETURNS TABLE (key TEXT, total NUMERIC, tx_count BIGINT)
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    label_column TEXT := CASE WHEN p_table = 'income' THEN 'source' ELSE 'description' END;
+BEGIN
+    IF p_table NOT IN ('expenses', 'income') THEN
+        RAISE EXCEPTION 'Unsupported ledger table: %', p_table;
+    END IF;
+    RETURN QUERY EXECUTE format(
+        'SELECT COALESCE(%I, '''')::TEXT, SUM(amount), COUNT(*) FROM %I
+         WHERE ($1 IS NULL OR date >= $1) AND ($2 IS NULL OR date <= $2)
+         GROUP BY 1 ORDER BY 2 DESC LIMIT $3', label_column, p_table)
+    USING p_start, p_end, p_limit;
+END;
+$$;
+
+-- ---------------------------------------------------------------------------
+-- Monthly budgets per expense category
+-- ---------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS budgets (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    category TEXT NOT NULL,
+    month CHAR(7) NOT NULL,     -- YYYY-MM
+    amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
+    UNIQUE (category, month)
+);
+
+-- ---------------------------------------------------------------------------
+-- Description search: trigram GIN indexes serve both ILIKE '%word%' and
+-- fuzzy (similarity) matches without scanning the table.
+-- Income rows are labelled by `source`, expenses by `description`.
+-- ---------------------------------------------------------------------------
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS expenses_description_trgm_idx ON expenses USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS income_source_trgm_idx ON income USING GIN (source gin_trgm_ops);
+
+CREATE OR REPLACE FUNCTION ledger_search_description(
+    p_table TEXT,
+    p_query TEXT,
+    p_limit INT DEFAULT 20
+)
+RETURNS TABLE (
+    id BIGINT, amount NUMERIC, category TEXT, description TEXT, source TEXT, date TIMESTAMPTZ, type TEXT
+)
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    label_column TEXT := CASE WHEN p_table = 'income' THEN 'source' ELSE 'description' END;
+    source_column TEXT := CASE WHEN p_table = 'income' THEN 'source' ELSE 'NULL::TEXT' END;
+BEGIN
+    IF p_table NOT IN ('expenses', 'income') THEN
+        RAISE EXCEPTION 'Unsupported ledger table: %', p_table;
+    END IF;
+    RETURN QUERY EXECUTE format(
+        'SELECT id, amount::NUMERIC, category::TEXT, description::TEXT, %s, date, type::TEXT FROM %I
+         WHERE %I ILIKE ''%%'' || $1 || ''%%'' OR %I %% $1
+         ORDER BY similarity(%I, $1) DESC, date DESC
+         LIMIT $2', source_column, p_table, label_column, label_column, label_column)
+    USING p_query, p_limit;
+END;
+$$;
@@ -0,0 +1,237 @@
+# finance/anomaly.py
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .models.enums import TransactionCategory, TransactionType
+from .models.reports import Anomaly
+from .models.transaction import Transaction
+from .merchants import canonical_merchant
+
+DEFAULT_Z_THRESHOLD = 3.0
+# Observations needed before a key is trusted to flag anything
+DEFAULT_MIN_SAMPLES = 5
+# Seconds between state writes; observations in between are batched into one write
+DEFAULT_SAVE_INTERVAL = 5.0
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but concurrent merges are not serialized
+    fcntl = None
+
+
+@dataclass
+class RunningStats:
+    """
+    Welford's online mean / variance: O(1) per update, numerically stable.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def zscore(self, x: float) -> float:
+        std = self.std
+        if std == 0:
+            return 0.0
+        return (x - self.mean) / std
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Statistics of both samples combined (Chan et al. parallel update).
+        """
+        count = self.count + other.count
+        if count == 0:
+            return RunningStats()
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        return RunningStats(count, mean, m2)
+
+
+def category_key(tx: Transaction) -> str:
+    return f"category:{(tx.category or TransactionCategory.OTHER).value}"
+
+
+def merchant_key(tx: Transaction) -> str:
+    return f"merchant:{canonical_merchant(tx.description)}"
+
+
+class AnomalyDetector:
+    """
+    Streaming outlier detector for expenses, keyed per category and per merchant.
+    Each expense is scored against the statistics seen so far, then folded in.
+    State is a small JSON document so restarts resume without rescanning the ledger.
+
+    Writes are batched: at most one every `save_interval` seconds, plus flush() on shutdown.
+    Several processes (app.py, Streamlit) may share one state file, so a write merges this
+    process's new observations into whatever is on disk instead of overwriting it.
+    """
+    def __init__(
+        self,
+        state_path: Optional[str] = None,
+        z_threshold: float = DEFAULT_Z_THRESHOLD,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        save_interval: float = DEFAULT_SAVE_INTERVAL
+    ):
+        self.state_path = state_path
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.save_interval = save_interval
+        self._stats: Dict[str, RunningStats] = {}
+        # Observations not yet written, and the on-disk state they go on top of
+        self._pending: Dict[str, RunningStats] = {}
+        self._base: Dict[str, RunningStats] = {}
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _keys(self, tx: Transaction) -> List[str]:
+        return [category_key(tx), merchant_key(tx)]
+
+    def score(self, tx: Transaction) -> List[Anomaly]:
+        """
+        Keys for which the expense is an outlier, without updating state.
+        """
+        anomalies = []
+        for key in self._keys(tx):
+            stats = self._stats.get(key)
+            if stats is None or stats.count < self.min_samples:
+                continue
+            z = stats.zscore(tx.amount)
+            if abs(z) >= self.z_threshold:
+                anomalies.append(Anomaly(key=key, amount=tx.amount, mean=stats.mean, std=stats.std, zscore=z))
+        return anomalies
+
+    def _update(self, tx: Transaction, pending: bool = True):
+        for key in self._keys(tx):
+            self._stats.setdefault(key, RunningStats()).update(tx.amount)
+            if pending:
+                self._pending.setdefault(key, RunningStats()).update(tx.amount)
+
+    def observe(self, tx: Transaction) -> List[Anomaly]:
+        """
+        Score an expense, then add it to the running statistics.
+        State is written at most once per save_interval.
+        """
+        if tx.type != TransactionType.EXPENSE:
+            return []
+        with self._lock:
+            anomalies = self.score(tx)
+            self._update(tx)
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                self._save()
+        return anomalies
+
+    def flush(self):
+        """
+        Write any observations still waiting for the next interval.
+        """
+        with self._lock:
+            if self._pending:
+                self._save()
+
+    def rebuild(self, transactions: Iterable[Transaction]):
+        """
+        Recompute all statistics from the ledger in a single streaming pass.
+        The ledger is authoritative, so the result replaces the state file instead of merging into it.
+        """
+        with self._lock:
+            self._stats, self._pending = {}, {}
+            for tx in transactions:
+                if tx.type == TransactionType.EXPENSE:
+                    self._update(tx, pending=False)
+            self._save(merge=False)
+
+    def stats_for(self, key: str) -> Optional[RunningStats]:
+        return self._stats.get(key)
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    # --- persistence ---
+
+    def _save(self, merge: bool = True):
+        # Caller holds the lock
+        self._saved_at = time.monotonic()
+        if not self.state_path:
+            self._pending = {}
+            return
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.state_path + ".lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if merge:
+                # Another process may have written since we loaded: add our observations to its state
+                on_disk = self._read()
+                stats = dict(self._base if on_disk is None else on_disk)
+                for key, new in self._pending.items():
+                    stats[key] = stats.get(key, RunningStats()).merge(new)
+                self._stats = stats
+            state = {
+                "z_threshold": self.z_threshold,
+                "min_samples": self.min_samples,
+                "stats": {k: [s.count, s.mean, s.m2] for k, s in self._stats.items()},
+            }
+            # Write-then-rename so a crash never leaves a half-written state file
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_path)
+        self._base = {k: RunningStats(s.count, s.mean, s.m2) for k, s in self._stats.items()}
+        self._pending = {}
+
+    def _read(self) -> Optional[Dict[str, RunningStats]]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            return {k: RunningStats(int(c), float(m), float(m2)) for k, (c, m, m2) in state["stats"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def load(self) -> bool:
+        """
+        Restore persisted statistics. Returns False if there is no usable state file.
+        """
+        stats = self._read()
+        if stats is None:
+            return False
+        with self._lock:
+            self._stats, self._pending = stats, {}
+            self._base = {k: RunningStats(s.count, s.mean, s.m2) for k, s in stats.items()}
+        return True
+
+    @classmethod
+    def load_or_rebuild(
+        cls,
+        state_path: Optional[str],
+        source: Callable[[], Iterable[Transaction]],
+        **kwargs
+    ) -> "AnomalyDetector":
+        """
+        Resume from the state file, or stream the ledger once if there is none.
+        """
+        detector = cls(state_path, **kwargs)
+        if not detector.load():
+            detector.rebuild(source())
+        return detector
@@ -0,0 +1,179 @@
+# finance/balance.py
+import threading
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .models.transaction import Transaction
+
+# Days of headroom reserved past the newest transaction before the tree has to grow
+_GROWTH_DAYS = 366
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over float deltas: point update and prefix sum in O(log n).
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = np.zeros(size + 1, dtype=np.float64)
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "FenwickTree":
+        """
+        O(n) construction from per-slot values.
+        """
+        tree = cls(len(values))
+        t = tree._tree
+        t[1:] = values
+        for i in range(1, tree.size + 1):
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                t[parent] += t[i]
+        return tree
+
+    def add(self, index: int, delta: float):
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count: int) -> float:
+        """
+        Sum of slots [0, count).
+        """
+        total = 0.0
+        i = min(count, self.size)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return float(total)
+
+
+def _day(moment: Union[date, datetime]) -> np.datetime64:
+    if isinstance(moment, datetime):
+        moment = moment.date()
+    return np.datetime64(moment, "D")
+
+
+class BalanceIndex:
+    """
+    Running balance by calendar day: a Fenwick tree of each day's net signed amount.
+    Back-dated writes are O(log n); balance at a date and change between dates are O(log n).
+    Day slots start at the earliest transaction and grow (with an O(n) rebuild) when
+    a write falls outside the allocated range.
+    """
+    def __init__(self, source: Optional[Callable[[], Iterable[Transaction]]] = None):
+        self._source = source
+        self._loaded = source is None
+        self._origin: Optional[np.datetime64] = None
+        self._daily = np.zeros(0, dtype=np.float64)
+        self._tree = FenwickTree(0)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "BalanceIndex":
+        index = cls()
+        index._bulk_load(transactions)
+        return index
+
+    def _bulk_load(self, transactions: Iterable[Transaction]):
+        # Caller holds the lock (or owns the instance)
+        rows = [(_day(t.date), t.signed_amount) for t in transactions]
+        if not rows:
+            return
+        days = np.array([d for d, _ in rows], dtype="datetime64[D]")
+        amounts = np.array([a for _, a in rows], dtype=np.float64)
+        self._origin = days.min()
+        offsets = (days - self._origin).astype(np.int64)
+        self._daily = np.bincount(offsets, weights=amounts, minlength=int(offsets.max()) + 1 + _GROWTH_DAYS)
+        self._tree = FenwickTree.from_values(self._daily)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._bulk_load(self._source())
+            self._loaded = True
+
+    def _offset(self, moment: Union[date, datetime]) -> int:
+        return int((_day(moment) - self._origin).astype(np.int64))
+
+    def add(self, tx: Transaction):
+        """
+        Apply a new (possibly back-dated) transaction. Before the first query this is a no-op,
+        since loading from the source will include the row.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            if self._origin is None:
+                self._bulk_load([tx])
+                return
+            offset = self._offset(tx.date)
+            if offset < 0:
+                # Earlier than anything seen: shift the origin back and rebuild
+                self._daily = np.concatenate([np.zeros(-offset), self._daily])
+                self._origin = _day(tx.date)
+                offset = 0
+            elif offset >= len(self._daily):
+                self._daily = np.concatenate([self._daily, np.zeros(offset - len(self._daily) + 1 + _GROWTH_DAYS)])
+            else:
+                self._daily[offset] += tx.signed_amount
+                self._tree.add(offset, tx.signed_amount)
+                return
+            self._daily[offset] += tx.signed_amount
+            self._tree = FenwickTree.from_values(self._daily)
+
+    def balance_at(self, moment: Union[date, datetime]) -> float:
+        """
+        Net balance at the end of the given day.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._origin is None:
+                return 0.0
+            return self._tree.prefix(self._offset(moment) + 1)
+
+    def balance_between(self, start: Union[date, datetime], end: Union[date, datetime]) -> float:
+        """
+        Net change from the start of `start` to the end of `end` (both days inclusive).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._origin is None:
+                return 0.0
+            lo = max(self._offset(start), 0)
+            return self._tree.prefix(self._offset(end) + 1) - self._tree.prefix(lo)
+
+    def curve(
+        self,
+        start: Optional[Union[date, datetime]] = None,
+        end: Optional[Union[date, datetime]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (days, end-of-day balance) for every day in [start, end], defaulting to the recorded range.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._origin is None:
+                return np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+            nonzero = np.flatnonzero(self._daily)
+            last = int(nonzero[-1]) if nonzero.size else 0
+            lo = max(self._offset(start), 0) if start is not None else 0
+            hi = min(self._offset(end), len(self._daily) - 1) if end is not None else last
+            if hi < lo:
+                return np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+            opening = self._tree.prefix(lo)
+            balances = opening + np.cumsum(self._daily[lo:hi + 1])
+            days = self._origin + np.arange(lo, hi + 1)
+        return days, balances
+
+    def invalidate(self):
+        """
+        Drop the index (e.g. after a bulk import or clear); it is reloaded from the source on next query.
+        """
+        with self._lock:
+            self._origin = None
+            self._daily = np.zeros(0, dtype=np.float64)
+            self._tree = FenwickTree(0)
+            self._loaded = self._source is None
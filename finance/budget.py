@@ -1,5 +1,159 @@
 # domain/budget.py
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models.budget import Budget
+from .models.enums import TransactionCategory, TransactionType
+from .models.reports import BudgetStatus
+from .models.transaction import Transaction
+from .periods import as_utc, resolve_period
+from .repositories.budget_repository import BudgetRepository
+from .repositories.transaction_repository import TransactionRepository
+
+# Share of a budget after which writes start returning a warning
+BUDGET_WARNING_THRESHOLD = 0.9
+
+
 def budget_drift(planned: float, actual: float) -> float:
     if planned <= 0:
         return 0.0
     return (actual - planned) / planned
+
+
+def drift_matrix(planned: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    Element-wise budget_drift over arrays of any (matching) shape.
+    """
+    planned = np.asarray(planned, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(planned > 0, (actual - planned) / planned, 0.0)
+
+
+def month_key(tx: Transaction) -> str:
+    return tx.date.strftime("%Y-%m")
+
+
+def current_month() -> str:
+    """
+    This month's budget key. Transaction dates are stored in UTC, so the month is too;
+    the local month differs around midnight on the first.
+    """
+    return as_utc(datetime.now()).strftime("%Y-%m")
+
+
+class BudgetTracker:
+    """
+    Month-to-date spend per (month, category), kept in memory next to the budgets for that month.
+    A month is loaded with one aggregate query the first time it is touched; after that every
+    recorded expense is a dictionary increment, so drift is available immediately on write.
+    """
+    def __init__(self, budget_repo: BudgetRepository, expense_repo: TransactionRepository):
+        self.budget_repo = budget_repo
+        self.expense_repo = expense_repo
+        self._actuals: Dict[str, Dict[TransactionCategory, float]] = {}
+        self._budgets: Dict[str, Dict[TransactionCategory, float]] = {}
+        self._lock = threading.Lock()
+
+    def _load_month(self, month: str):
+        # Caller holds the lock
+        start, end = resolve_period(month)
+        actuals: Dict[TransactionCategory, float] = {}
+        for row in self.expense_repo.totals_by_category(start, end):
+            try:
+                actuals[TransactionCategory(row.key)] = row.total
+            except ValueError:
+                actuals[TransactionCategory.OTHER] = actuals.get(TransactionCategory.OTHER, 0.0) + row.total
+        self._actuals[month] = actuals
+        self._budgets[month] = {b.category: b.amount for b in self.budget_repo.list_for_month(month)}
+
+    def _ensure_month(self, month: str):
+        if month not in self._actuals:
+            self._load_month(month)
+
+    def record(self, tx: Transaction):
+        """
+        Count a just-persisted expense towards its month.
+        If the month was not loaded yet, loading it already includes the new row.
+        """
+        if tx.type != TransactionType.EXPENSE:
+            return
+        month = month_key(tx)
+        category = tx.category or TransactionCategory.OTHER
+        with self._lock:
+            if month not in self._actuals:
+                self._load_month(month)
+                return
+            actuals = self._actuals[month]
+            actuals[category] = actuals.get(category, 0.0) + tx.amount
+
+    def set_budget(self, category: TransactionCategory, month: str, amount: float) -> Budget:
+        budget = self.budget_repo.upsert(Budget(category=category, month=month, amount=amount))
+        with self._lock:
+            self._ensure_month(month)
+            self._budgets[month][category] = budget.amount
+        return budget
+
+    def status_for(self, category: TransactionCategory, month: str) -> BudgetStatus:
+        with self._lock:
+            self._ensure_month(month)
+            planned = self._budgets[month].get(category, 0.0)
+            actual = self._actuals[month].get(category, 0.0)
+        return BudgetStatus(
+            category=category, month=month, planned=planned, actual=actual,
+            drift=budget_drift(planned, actual)
+        )
+
+    def alert_for(self, tx: Transaction) -> Optional[str]:
+        """
+        Overspend / near-limit warning for the expense's category and month, or None.
+        """
+        if tx.type != TransactionType.EXPENSE:
+            return None
+        status = self.status_for(tx.category or TransactionCategory.OTHER, month_key(tx))
+        if status.planned <= 0:
+            return None
+        if status.overspent:
+            return (f"⚠️ {status.category.value.upper()} budget exceeded: ${status.actual:,.2f} of "
+                    f"${status.planned:,.2f} ({status.drift * 100:+.0f}%)")
+        if status.actual >= status.planned * BUDGET_WARNING_THRESHOLD:
+            return (f"⚠️ {status.category.value.upper()} budget nearly used: ${status.actual:,.2f} of "
+                    f"${status.planned:,.2f} (${status.remaining:,.2f} left)")
+        return None
+
+    def month_status(self, month: str) -> List[BudgetStatus]:
+        """
+        Status of every budgeted category for a month.
+        """
+        with self._lock:
+            self._ensure_month(month)
+            categories = list(self._budgets[month])
+        return [self.status_for(c, month) for c in categories]
+
+    def drift_report(self, months: Sequence[str]) -> Tuple[List[TransactionCategory], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Planned, actual and drift matrices of shape (categories, months) for reports.
+        Rows are the categories that have a budget in any of the months.
+        """
+        with self._lock:
+            for month in months:
+                self._ensure_month(month)
+            categories = sorted({c for m in months for c in self._budgets[m]}, key=lambda c: c.value)
+            planned = np.array([[self._budgets[m].get(c, 0.0) for m in months] for c in categories]).reshape(len(categories), len(months))
+            actual = np.array([[self._actuals[m].get(c, 0.0) for m in months] for c in categories]).reshape(len(categories), len(months))
+        return categories, planned, actual, drift_matrix(planned, actual)
+
+    def invalidate(self, month: Optional[str] = None):
+        """
+        Drop cached months (e.g. after a bulk import or clear) so they are reloaded on next use.
+        """
+        with self._lock:
+            if month is None:
+                self._actuals.clear()
+                self._budgets.clear()
+            else:
+                self._actuals.pop(month, None)
+                self._budgets.pop(month, None)
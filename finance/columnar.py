@@ -0,0 +1,104 @@
+# finance/columnar.py
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models.transaction import Transaction
+from .models.enums import TransactionType, TransactionCategory
+from .merchants import merchants as merchant_registry
+
+# Stable category code order: column index in every per-category matrix
+CATEGORIES: List[TransactionCategory] = list(TransactionCategory)
+_CATEGORY_CODE = {c: i for i, c in enumerate(CATEGORIES)}
+_OTHER_CODE = _CATEGORY_CODE[TransactionCategory.OTHER]
+
+
+@dataclass(frozen=True)
+class ColumnarLedger:
+    """
+    Struct-of-arrays view of a ledger, sorted by date.
+    Built once per ledger so analytics can run as NumPy operations instead of per-object loops.
+    """
+    dates: np.ndarray        # datetime64[D]
+    amounts: np.ndarray      # float64, always positive
+    is_income: np.ndarray    # bool
+    categories: np.ndarray   # int8 index into CATEGORIES
+    merchants: np.ndarray    # int32 id in finance.merchants.merchants
+
+    @classmethod
+    def from_transactions(cls, transactions: Sequence[Transaction]) -> "ColumnarLedger":
+        n = len(transactions)
+        dates = np.empty(n, dtype="datetime64[D]")
+        amounts = np.empty(n, dtype=np.float64)
+        is_income = np.empty(n, dtype=bool)
+        categories = np.empty(n, dtype=np.int8)
+        merchant_ids = np.empty(n, dtype=np.int32)
+        for i, t in enumerate(transactions):
+            dates[i] = t.date.date()
+            amounts[i] = t.amount
+            is_income[i] = t.type == TransactionType.INCOME
+            categories[i] = _CATEGORY_CODE.get(t.category, _OTHER_CODE)
+            merchant_ids[i] = merchant_registry.id_for(t.description)
+
+        order = np.argsort(dates, kind="stable")
+        return cls(dates[order], amounts[order], is_income[order], categories[order], merchant_ids[order])
+
+    def __len__(self) -> int:
+        return int(self.amounts.size)
+
+    def window(self, lo: int, hi: int) -> "ColumnarLedger":
+        """
+        Rows lo:hi as NumPy views of the same buffers (no copy).
+        """
+        return ColumnarLedger(self.dates[lo:hi], self.amounts[lo:hi], self.is_income[lo:hi],
+                              self.categories[lo:hi], self.merchants[lo:hi])
+
+    @property
+    def signed_amounts(self) -> np.ndarray:
+        return np.where(self.is_income, self.amounts, -self.amounts)
+
+    @property
+    def day_index(self) -> np.ndarray:
+        """
+        Days since the first transaction, per row.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        return (self.dates - self.dates[0]).astype(np.int64)
+
+    def day_range(self) -> np.ndarray:
+        """
+        Every calendar day from the first to the last transaction.
+        """
+        if not len(self):
+            return np.zeros(0, dtype="datetime64[D]")
+        return np.arange(self.dates[0], self.dates[-1] + 1)
+
+    def daily_expenses_by_category(self) -> np.ndarray:
+        """
+        (n_days, n_categories) matrix of expense totals per calendar day.
+        """
+        n_days = self.day_range().size
+        matrix = np.zeros((n_days, len(CATEGORIES)), dtype=np.float64)
+        expense = ~self.is_income
+        np.add.at(matrix, (self.day_index[expense], self.categories[expense]), self.amounts[expense])
+        return matrix
+
+    def daily_net(self) -> np.ndarray:
+        """
+        Income minus expenses per calendar day.
+        """
+        return np.bincount(self.day_index, weights=self.signed_amounts, minlength=self.day_range().size)
+
+    def expenses_by_merchant(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (merchant ids, totals, counts) of expenses per merchant, largest total first.
+        """
+        expense = ~self.is_income
+        ids = self.merchants[expense]
+        totals = np.bincount(ids, weights=self.amounts[expense])
+        counts = np.bincount(ids)
+        present = np.flatnonzero(counts)
+        order = present[np.argsort(totals[present], kind="stable")[::-1]][:limit]
+        return order, totals[order], counts[order]
@@ -1,8 +1,70 @@
 # domain/ledger.py
-from typing import List
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import List, Optional, Tuple, Union
 from pydantic import BaseModel, ConfigDict
 from .models.transaction import Transaction
 from .models.enums import TransactionType
+from .columnar import ColumnarLedger
+from .recurring import RecurringDetector
+from .balance import BalanceIndex
+from .periods import as_utc
+
+
+# Windows offered by the dashboard and agent tools
+WINDOW_DAYS = (30, 90, 365)
+
+
+class LedgerSlice(Sequence):
+    """
+    Read-only view of a date range of a Ledger's timeline: rows [lo, hi) of the sorted
+    transactions and NumPy views of its columns. Nothing is copied.
+    """
+    def __init__(self, ledger: "Ledger", lo: int, hi: int):
+        self.ledger = ledger
+        self.lo = lo
+        self.hi = hi
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return LedgerSlice(self.ledger, self.lo + start, self.lo + max(stop, start))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LedgerSlice index out of range")
+        return self.ledger.timeline[self.lo + index]
+
+    @property
+    def columns(self) -> ColumnarLedger:
+        return self.ledger.columns.window(self.lo, self.hi)
+
+    @property
+    def inflow(self) -> float:
+        cols = self.columns
+        return float(cols.amounts[cols.is_income].sum())
+
+    @property
+    def outflow(self) -> float:
+        cols = self.columns
+        return float(cols.amounts[~cols.is_income].sum())
+
+    @property
+    def net_cashflow(self) -> float:
+        return self.inflow - self.outflow
+
+    def to_ledger(self) -> "Ledger":
+        """
+        Materialize the window as its own Ledger (copies the row references).
+        """
+        return Ledger(transactions=self.ledger.timeline[self.lo:self.hi])
 
 
 class Ledger(BaseModel):
@@ -10,6 +72,63 @@ class Ledger(BaseModel):
 
     transactions: List[Transaction]
 
+    @cached_property
+    def timeline(self) -> List[Transaction]:
+        """
+        Transactions in ascending date order; the time index every slice points into.
+        Database rows are timezone-aware and locally recorded ones may be naive, so dates are compared as UTC instants.
+        """
+        return sorted(self.transactions, key=lambda t: as_utc(t.date))
+
+    @cached_property
+    def _timestamps(self) -> List[datetime]:
+        return [as_utc(t.date) for t in self.timeline]
+
+    @cached_property
+    def columns(self) -> ColumnarLedger:
+        """
+        Date-sorted columnar copy of the transactions (same row order as `timeline`), built on first use.
+        """
+        return ColumnarLedger.from_transactions(self.timeline)
+
+    def bounds(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Timeline indices [lo, hi) of transactions with start <= date <= end, by binary search.
+        """
+        if not self._timestamps:
+            return 0, 0
+        lo = bisect_left(self._timestamps, as_utc(start)) if start else 0
+        hi = bisect_right(self._timestamps, as_utc(end)) if end else len(self._timestamps)
+        return lo, max(lo, hi)
+
+    def slice(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> LedgerSlice:
+        """
+        O(log n) view of the transactions dated within [start, end]; None means unbounded.
+        """
+        lo, hi = self.bounds(start, end)
+        return LedgerSlice(self, lo, hi)
+
+    def last_days(self, days: int, now: Optional[datetime] = None) -> LedgerSlice:
+        """
+        View of the trailing `days` days up to now.
+        """
+        now = now or datetime.now()
+        return self.slice(now - timedelta(days=days), now)
+
+    @cached_property
+    def balance_index(self) -> BalanceIndex:
+        """
+        Day-level prefix sums of signed amounts for point-in-time balances and the cumulative curve.
+        """
+        return BalanceIndex.from_transactions(self.transactions)
+
+    @cached_property
+    def recurring(self) -> RecurringDetector:
+        """
+        Subscriptions and other recurring expenses found in this ledger.
+        """
+        return RecurringDetector.from_transactions(self.transactions)
+
     @property
     def inflow(self) -> float:
         return sum(t.amount for t in self.transactions if t.type == TransactionType.INCOME)
@@ -40,13 +159,35 @@ class Ledger(BaseModel):
         
         return self.outflow / months
 
+    @property
+    def recurring_commitments(self) -> float:
+        """
+        Projected monthly cost of the recurring charges that are still active.
+        """
+        return self.recurring.monthly_commitments()
+
+    @property
+    def projected_burn_rate(self) -> float:
+        """
+        Forward-looking monthly burn: historic one-off spending plus today's recurring commitments.
+        A subscription started last month weighs in fully, and a cancelled one stops counting.
+        """
+        burn = self.average_burn_rate
+        subscriptions = self.recurring.subscriptions()
+        if not subscriptions:
+            return burn
+        expense_dates = [t.date for t in self.transactions if t.type == TransactionType.EXPENSE]
+        months = max(((max(expense_dates) - min(expense_dates)).days or 1) / 30, 1)
+        historic_recurring = sum(s.total_paid for s in subscriptions) / months
+        return max(burn - historic_recurring, 0.0) + self.recurring_commitments
+
     @property
     def financial_runway(self) -> float:
         """
-        Months of survival based on net cash balance and burn rate.
+        Months of survival based on net cash balance and the projected burn rate.
         Note: In a real app, this would use 'Net Worth', here we use net surplus as a proxy.
         """
-        burn = self.average_burn_rate
+        burn = self.projected_burn_rate
         if burn <= 0:
             return float('inf')
         return max(self.net_cashflow / burn, 0.0)
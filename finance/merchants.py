@@ -0,0 +1,84 @@
+# finance/merchants.py
+import re
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Applied in order to the lowercased description
+_RULES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"https?://|www\."), " "),
+    (re.compile(r"\.(com|net|org|co|io)\b"), " "),
+    (re.compile(r"\b(pos|purchase|debit|autopay)\b"), " "),
+    (re.compile(r"[*#]\s*\w*\d\w*"), " "),                     # store / terminal numbers: #42, *AB12
+    (re.compile(r"\b\d{1,4}[/-]\d{1,2}([/-]\d{2,4})?\b"), " "),  # dates
+    (re.compile(r"\d+"), " "),
+    (re.compile(r"[^a-z&' ]+"), " "),
+    (re.compile(r"\s+"), " "),
+]
+
+# Known spellings of the same payee, after the rules above
+ALIASES: Dict[str, str] = {
+    "amzn": "amazon",
+    "amzn mktp": "amazon",
+    "amzn mktp us": "amazon",
+    "amazon mktplace": "amazon",
+    "uber trip": "uber",
+    "uber eats": "uber eats",
+    "netflix": "netflix",
+    "spotify usa": "spotify",
+    "aws": "aws cloud bill",
+    "amazon web services": "aws cloud bill",
+}
+
+UNKNOWN_MERCHANT = "unknown"
+
+
+@lru_cache(maxsize=8192)
+def canonical_merchant(description: str) -> str:
+    """
+    Canonical lowercase merchant name for a free-text description.
+    "Grocery Store", "GROCERY STORE #42" and "grocery store" all map to the same interned string.
+    """
+    text = description.lower()
+    for pattern, replacement in _RULES:
+        text = pattern.sub(replacement, text)
+    text = text.strip(" '&") or UNKNOWN_MERCHANT
+    return sys.intern(ALIASES.get(text, text))
+
+
+def display_name(merchant: str) -> str:
+    return merchant.title()
+
+
+class MerchantRegistry:
+    """
+    Dense integer ids for canonical merchant names, so columnar data and group-bys
+    work on small ints instead of repeated strings.
+    """
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def id_for(self, description: str) -> int:
+        name = canonical_merchant(description)
+        merchant_id = self._ids.get(name)
+        if merchant_id is None:
+            with self._lock:
+                merchant_id = self._ids.get(name)
+                if merchant_id is None:
+                    merchant_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = merchant_id
+        return merchant_id
+
+    def name(self, merchant_id: int) -> str:
+        return self._names[merchant_id]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Process-wide table shared by the ledger, detectors and dashboard
+merchants = MerchantRegistry()
@@ -0,0 +1,12 @@
+# finance/models/budget.py
+from pydantic import BaseModel, ConfigDict, Field
+from finance.models.enums import TransactionCategory
+
+
+class Budget(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int | None = None
+    category: TransactionCategory
+    month: str  # YYYY-MM
+    amount: float = Field(gt=0)
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 from typing import List, Dict
 from finance.models.enums import TransactionCategory
 
@@ -7,6 +8,8 @@ class FinancialReport(BaseModel):
     categories: Dict[str, float]
     top_category: str
     recommendations: List[str]
+    # Canonical merchant name -> total, largest first (empty when only category totals were given)
+    merchants: Dict[str, float] = {}
 
 class BudgetReport(BaseModel):
     monthly_income: float
@@ -20,3 +23,72 @@ class SpendingSummary(BaseModel):
     total_amount: float
     expense_count: int
     percentage: float
+
+class AggregateRow(BaseModel):
+    """
+    One row of a pushed-down aggregate query (e.g. per category, per month, per merchant).
+    """
+    key: str
+    total: float
+    count: int
+
+class GoalFeasibility(BaseModel):
+    goal_name: str
+    target_amount: float
+    starting_balance: float
+    months: int
+    paths: int
+    probability: float
+    # Percentile -> projected balance at the end of each month (index 0 = first simulated month)
+    percentile_bands: Dict[int, List[float]]
+
+    @property
+    def final_percentiles(self) -> Dict[int, float]:
+        return {p: band[-1] for p, band in self.percentile_bands.items()}
+
+class BudgetStatus(BaseModel):
+    category: TransactionCategory
+    month: str
+    planned: float
+    actual: float
+    # (actual - planned) / planned; 0 when no budget is set
+    drift: float
+
+    @property
+    def remaining(self) -> float:
+        return self.planned - self.actual
+
+    @property
+    def overspent(self) -> bool:
+        return self.planned > 0 and self.actual > self.planned
+
+class Anomaly(BaseModel):
+    """
+    An expense that is far from the running mean for one of its keys (category or merchant).
+    """
+    key: str
+    amount: float
+    mean: float
+    std: float
+    zscore: float
+
+    @property
+    def message(self) -> str:
+        kind, _, name = self.key.partition(":")
+        return (f"🚨 Unusual for {kind} '{name}': ${self.amount:,.2f} vs typical "
+                f"${self.mean:,.2f} ± ${self.std:,.2f} (z={self.zscore:+.1f})")
+
+class Subscription(BaseModel):
+    """
+    A recurring expense series detected from the ledger.
+    """
+    merchant: str
+    category: TransactionCategory
+    period: str  # weekly, biweekly, monthly, quarterly, annual
+    interval_days: float
+    average_amount: float
+    occurrences: int
+    last_charge: datetime
+    next_charge: datetime
+    monthly_cost: float
+    total_paid: float
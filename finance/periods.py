@@ -0,0 +1,53 @@
+# finance/periods.py
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+PERIODS = ["this_month", "last_month", "last_7_days", "last_30_days", "last_90_days", "last_365_days", "this_year", "all"]
+
+
+def as_utc(moment: datetime) -> datetime:
+    """
+    The same instant as a timezone-aware UTC datetime; naive values are taken as local time.
+    Stored rows come back aware, so every transaction date is kept aware to stay comparable.
+    """
+    return moment.astimezone(timezone.utc)
+
+
+def month_start(dt: datetime) -> datetime:
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def previous_month_start(dt: datetime) -> datetime:
+    return month_start(month_start(dt) - timedelta(days=1))
+
+
+def resolve_period(period: str, now: Optional[datetime] = None) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Translate a period name ('this_month', 'last_month', 'last_30_days', 'this_year', 'all' or 'YYYY-MM')
+    into an inclusive (start, end) datetime range. None means unbounded.
+    """
+    now = now or datetime.now()
+    period = (period or "all").strip().lower().replace(" ", "_")
+
+    if period == "all":
+        return None, None
+    if period == "this_month":
+        return month_start(now), now
+    if period == "last_month":
+        end = month_start(now) - timedelta(microseconds=1)
+        return previous_month_start(now), end
+    if period == "this_year":
+        return month_start(now).replace(month=1), now
+    if period.startswith("last_") and period.endswith("_days"):
+        try:
+            days = int(period[len("last_"):-len("_days")])
+        except ValueError:
+            raise ValueError(f"Unknown period '{period}'. Use one of: {', '.join(PERIODS)} or YYYY-MM.")
+        return now - timedelta(days=days), now
+
+    try:
+        start = datetime.strptime(period, "%Y-%m")
+    except ValueError:
+        raise ValueError(f"Unknown period '{period}'. Use one of: {', '.join(PERIODS)} or YYYY-MM.")
+    next_month = month_start(start + timedelta(days=32))
+    return start, next_month - timedelta(microseconds=1)
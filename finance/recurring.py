@@ -0,0 +1,185 @@
+# finance/recurring.py
+import bisect
+import math
+import statistics
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models.enums import TransactionCategory, TransactionType
+from .models.reports import Subscription
+from .models.transaction import Transaction
+from .merchants import merchants
+from .periods import as_utc
+
+# name -> (interval in days, tolerance in days)
+PERIODICITIES = {
+    "weekly": (7.0, 1.5),
+    "biweekly": (14.0, 2.5),
+    "monthly": (30.44, 4.0),
+    "quarterly": (91.3, 8.0),
+    "annual": (365.25, 15.0),
+}
+# Charges within one band differ by at most ~25%; neighbouring bands are merged at detection time
+AMOUNT_BAND_RATIO = 1.25
+MIN_OCCURRENCES = 3
+MIN_ANNUAL_OCCURRENCES = 2
+# Share of gaps that must match the period
+MIN_REGULARITY = 0.7
+DAYS_PER_MONTH = 30.44
+
+
+def amount_band(amount: float) -> int:
+    return int(math.floor(math.log(amount) / math.log(AMOUNT_BAND_RATIO)))
+
+
+def classify_period(dates: List[datetime]) -> Optional[Tuple[str, float]]:
+    """
+    Match the gaps between sorted dates against the known periodicities.
+    Returns (name, median gap in days), or None if the charges are not regular.
+    """
+    if len(dates) < MIN_ANNUAL_OCCURRENCES:
+        return None
+    gaps = [(b - a).total_seconds() / 86400 for a, b in zip(dates, dates[1:])]
+    median_gap = statistics.median(gaps)
+    for name, (interval, tolerance) in PERIODICITIES.items():
+        if abs(median_gap - interval) > tolerance:
+            continue
+        needed = MIN_ANNUAL_OCCURRENCES if name == "annual" else MIN_OCCURRENCES
+        if len(dates) < needed:
+            return None
+        regular = sum(1 for g in gaps if abs(g - interval) <= tolerance)
+        if regular / len(gaps) >= MIN_REGULARITY:
+            return name, median_gap
+        return None
+    return None
+
+
+class RecurringDetector:
+    """
+    Finds subscriptions and other recurring expenses.
+    Expenses are hashed into (merchant id, amount band) groups whose dates stay sorted;
+    periodicity is re-tested only for merchants that received new rows since the last query.
+    """
+    def __init__(self, source: Optional[Callable[[], Iterable[Transaction]]] = None):
+        self._source = source
+        self._loaded = source is None
+        self._groups: Dict[Tuple[int, int], List[Tuple[datetime, float, TransactionCategory]]] = {}
+        self._bands: Dict[int, set] = {}
+        self._dirty: set = set()
+        self._results: Dict[int, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "RecurringDetector":
+        detector = cls()
+        for tx in transactions:
+            detector._add(tx)
+        return detector
+
+    def _ensure_loaded(self):
+        # Caller holds the lock
+        if not self._loaded:
+            for tx in self._source():
+                self._add(tx)
+            self._loaded = True
+
+    def _add(self, tx: Transaction):
+        if tx.type != TransactionType.EXPENSE:
+            return
+        merchant = merchants.id_for(tx.description)
+        band = amount_band(tx.amount)
+        rows = self._groups.setdefault((merchant, band), [])
+        # Loaded rows are timezone-aware and older callers may record naive ones; keep one kind
+        date = as_utc(tx.date)
+        row = (date, tx.amount, tx.category or TransactionCategory.OTHER)
+        # New rows almost always arrive in date order, so this is usually an append
+        if not rows or rows[-1][0] <= date:
+            rows.append(row)
+        else:
+            bisect.insort(rows, row, key=lambda r: r[0])
+        self._bands.setdefault(merchant, set()).add(band)
+        self._dirty.add(merchant)
+
+    def add(self, tx: Transaction):
+        """
+        Fold in a newly recorded expense. Before the first query this is a no-op,
+        since loading from the source will include the row.
+        """
+        with self._lock:
+            if self._loaded:
+                self._add(tx)
+
+    def invalidate(self):
+        """
+        Forget all groups (e.g. after a bulk import or clear); they are reloaded from the source on next query.
+        """
+        with self._lock:
+            self._groups.clear()
+            self._bands.clear()
+            self._dirty.clear()
+            self._results.clear()
+            self._loaded = self._source is None
+
+    def _detect_merchant(self, merchant: int) -> List[Subscription]:
+        found = []
+        bands = sorted(self._bands.get(merchant, ()))
+        # Merge runs of adjacent bands so charges that jitter across a band edge stay together
+        clusters: List[List[int]] = []
+        for band in bands:
+            if clusters and band == clusters[-1][-1] + 1:
+                clusters[-1].append(band)
+            else:
+                clusters.append([band])
+        for cluster in clusters:
+            if len(cluster) == 1:
+                rows = self._groups[(merchant, cluster[0])]
+            else:
+                rows = sorted((r for b in cluster for r in self._groups[(merchant, b)]), key=lambda r: r[0])
+            match = classify_period([r[0] for r in rows])
+            if match is None:
+                continue
+            period, gap = match
+            average = statistics.fmean(r[1] for r in rows)
+            last = rows[-1][0]
+            found.append(Subscription(
+                merchant=merchants.name(merchant),
+                category=rows[-1][2],
+                period=period,
+                interval_days=gap,
+                average_amount=average,
+                occurrences=len(rows),
+                last_charge=last,
+                next_charge=last + timedelta(days=gap),
+                monthly_cost=average * DAYS_PER_MONTH / gap,
+                total_paid=sum(r[1] for r in rows)
+            ))
+        return found
+
+    def subscriptions(self) -> List[Subscription]:
+        """
+        Every detected recurring series (including lapsed ones), largest monthly cost first.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            for merchant in self._dirty:
+                self._results[merchant] = self._detect_merchant(merchant)
+            self._dirty.clear()
+            found = [s for subs in self._results.values() for s in subs]
+        return sorted(found, key=lambda s: s.monthly_cost, reverse=True)
+
+    def active(self, now: Optional[datetime] = None) -> List[Subscription]:
+        """
+        Subscriptions whose next charge is not overdue by more than one period.
+        """
+        now = as_utc(now) if now else datetime.now(timezone.utc)
+        return [
+            s for s in self.subscriptions()
+            if now - s.next_charge <= timedelta(days=s.interval_days + PERIODICITIES[s.period][1])
+        ]
+
+    def monthly_commitments(self, now: Optional[datetime] = None) -> float:
+        """
+        Projected monthly spend on active recurring charges.
+        """
+        return sum(s.monthly_cost for s in self.active(now))
@@ -0,0 +1,22 @@
+# finance/repositories/budget_repository.py
+from typing import Protocol, List
+from finance.models.budget import Budget
+
+class BudgetRepository(Protocol):
+    # Incremented on every write so caches can detect changed budgets
+    version: int
+
+    def upsert(self, budget: Budget) -> Budget:
+        """
+        Create or replace the budget for (category, month).
+        """
+        ...
+
+    def list_for_month(self, month: str) -> List[Budget]:
+        ...
+
+    def list_all(self) -> List[Budget]:
+        ...
+
+    def clear(self) -> None:
+        ...
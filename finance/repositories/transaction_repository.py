@@ -3,12 +3,21 @@ from typing import Protocol, List, Optional
 from datetime import datetime
 from finance.models.transaction import Transaction
 from finance.models.enums import TransactionType, TransactionCategory
+from finance.models.reports import AggregateRow
 
 class TransactionRepository(Protocol):
+    # Incremented on every write so caches can detect a changed ledger
+    version: int
 
     def add(self, transaction: Transaction) -> Transaction:
         ...
 
+    def add_many(self, transactions: List[Transaction]) -> List[Transaction]:
+        """
+        Bulk insert; returns the stored transactions (with ids) in input order.
+        """
+        ...
+
     def list_all(self) -> List[Transaction]:
         ...
 
@@ -35,5 +44,37 @@ class TransactionRepository(Protocol):
     ) -> float:
         ...
 
+    def list_recent(self, limit: int) -> List[Transaction]:
+        ...
+
+    def totals_by_category(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[AggregateRow]:
+        ...
+
+    def totals_by_month(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[TransactionCategory] = None
+    ) -> List[AggregateRow]:
+        ...
+
+    def top_descriptions(
+        self,
+        limit: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[AggregateRow]:
+        ...
+
+    def search_description(self, text: str, limit: int) -> List[Transaction]:
+        """
+        Transactions whose description matches the text (all words, or fuzzily when nothing matches exactly).
+        """
+        ...
+
     def clear(self) -> None:
         ...
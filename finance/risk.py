@@ -1,6 +1,12 @@
 # domain/risk.py
 import statistics
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .columnar import CATEGORIES, ColumnarLedger
 
 
 def spending_volatility(amounts: List[float]) -> float:
@@ -16,3 +22,130 @@ def concentration_hhi(amounts: List[float]) -> float:
 
     shares = [a / total for a in amounts]
     return sum(s ** 2 for s in shares)
+
+
+# --- Rolling-window risk engine over a columnar ledger ---
+
+DEFAULT_WINDOWS = (30, 90)
+DAYS_PER_MONTH = 30
+
+
+@dataclass
+class RollingRisk:
+    """
+    Trailing-window risk series, one row per calendar day of the ledger.
+    Per-category arrays have one column per entry in CATEGORIES.
+    Days before the first transaction count as zero activity.
+    """
+    window: int
+    dates: np.ndarray             # window end day
+    volatility: np.ndarray        # (days, categories) std of daily spend
+    total_volatility: np.ndarray  # (days,) std of total daily spend
+    hhi: np.ndarray               # (days,) Herfindahl index of category spend shares
+    burn_rate: np.ndarray         # (days, categories) spend per 30 days
+    burn_trend: np.ndarray        # (days, categories) change in burn rate per 30 days
+    drawdown: np.ndarray          # (days,) cumulative balance minus its running peak (<= 0)
+    max_drawdown: np.ndarray      # (days,) worst drawdown inside the window
+
+    def __len__(self) -> int:
+        return int(self.dates.size)
+
+    def latest(self) -> Dict[str, float]:
+        if not len(self):
+            return {"volatility": 0.0, "hhi": 0.0, "drawdown": 0.0, "max_drawdown": 0.0, "burn_rate": 0.0}
+        return {
+            "volatility": float(self.total_volatility[-1]),
+            "hhi": float(self.hhi[-1]),
+            "drawdown": float(self.drawdown[-1]),
+            "max_drawdown": float(self.max_drawdown[-1]),
+            "burn_rate": float(self.burn_rate[-1].sum()),
+        }
+
+    def latest_by_category(self) -> Dict[str, Dict[str, float]]:
+        """
+        Burn rate, trend and volatility on the last day, for categories with spend in the window.
+        """
+        if not len(self):
+            return {}
+        active = np.flatnonzero(self.burn_rate[-1] > 0)
+        return {
+            CATEGORIES[i].value: {
+                "burn_rate": float(self.burn_rate[-1, i]),
+                "burn_trend": float(self.burn_trend[-1, i]),
+                "volatility": float(self.volatility[-1, i]),
+            }
+            for i in active[np.argsort(self.burn_rate[-1, active])[::-1]]
+        }
+
+
+def _trailing_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of each trailing window along axis 0, via one cumulative sum.
+    `values` must already be padded with window - 1 leading zero rows.
+    """
+    cs = np.cumsum(values, axis=0)
+    cs = np.concatenate([np.zeros((1,) + values.shape[1:]), cs])
+    return cs[window:] - cs[:-window]
+
+
+def _rolling(daily: np.ndarray, net: np.ndarray, dates: np.ndarray, window: int) -> RollingRisk:
+    pad = window - 1
+    spend = np.concatenate([np.zeros((pad, daily.shape[1])), daily])
+    total = spend.sum(axis=1)
+
+    s1 = _trailing_sums(spend, window)
+    s2 = _trailing_sums(spend ** 2, window)
+    t1 = _trailing_sums(total, window)
+    t2 = _trailing_sums(total ** 2, window)
+    volatility = np.sqrt(np.clip((s2 - s1 ** 2 / window) / (window - 1), 0, None))
+    total_volatility = np.sqrt(np.clip((t2 - t1 ** 2 / window) / (window - 1), 0, None))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = np.where(t1[:, None] > 0, s1 / t1[:, None], 0.0)
+    hhi = (shares ** 2).sum(axis=1)
+
+    burn = s1 * DAYS_PER_MONTH / window
+
+    # Rolling least-squares slope of the burn rate over the trailing window, all categories at once
+    t = np.arange(burn.shape[0], dtype=np.float64)
+    padded_burn = np.concatenate([np.zeros((pad, burn.shape[1])), burn])
+    padded_t = np.concatenate([np.arange(-pad, 0, dtype=np.float64), t])
+    sy = _trailing_sums(padded_burn, window)
+    sty = _trailing_sums(padded_t[:, None] * padded_burn, window)
+    st_ = _trailing_sums(padded_t, window)
+    stt = _trailing_sums(padded_t ** 2, window)
+    denom = window * stt - st_ ** 2
+    burn_trend = (window * sty - st_[:, None] * sy) / denom[:, None] * DAYS_PER_MONTH
+
+    balance = np.cumsum(net)
+    drawdown = balance - np.maximum(np.maximum.accumulate(balance), 0.0)
+    padded_dd = np.concatenate([np.zeros(pad), drawdown])
+    max_drawdown = sliding_window_view(padded_dd, window).min(axis=1)
+
+    return RollingRisk(
+        window=window,
+        dates=dates,
+        volatility=volatility,
+        total_volatility=total_volatility,
+        hhi=hhi,
+        burn_rate=burn,
+        burn_trend=burn_trend,
+        drawdown=drawdown,
+        max_drawdown=max_drawdown,
+    )
+
+
+def rolling_risk(columns: ColumnarLedger, windows: Sequence[int] = DEFAULT_WINDOWS) -> Dict[int, RollingRisk]:
+    """
+    Rolling volatility, HHI concentration, balance drawdown and per-category burn-rate trend
+    for each window length (in days). The daily matrices are built once and shared by every window.
+    """
+    daily = columns.daily_expenses_by_category()
+    net = columns.daily_net()
+    dates = columns.day_range()
+    results = {}
+    for window in windows:
+        if window < 2:
+            raise ValueError(f"Risk window must be at least 2 days, got {window}")
+        results[window] = _rolling(daily, net, dates, window)
+    return results
@@ -0,0 +1,123 @@
+# finance/scenarios.py
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from .ledger import Ledger
+from .models.enums import TransactionType
+
+INCOME_AXIS = "income_change"
+FIXED_COST_AXIS = "extra_fixed_cost"
+
+
+class ScenarioBaseline(BaseModel):
+    """
+    Average monthly position the scenarios are applied to.
+    """
+    monthly_income: float
+    monthly_spend: Dict[str, float]
+    balance: float
+
+    @classmethod
+    def from_ledger(cls, ledger: Ledger) -> "ScenarioBaseline":
+        if not ledger.transactions:
+            return cls(monthly_income=0.0, monthly_spend={}, balance=0.0)
+        dates = [t.date for t in ledger.transactions]
+        months = max((max(dates) - min(dates)).days / 30, 1)
+        spend: Dict[str, float] = {}
+        for t in ledger.transactions:
+            if t.type == TransactionType.EXPENSE:
+                key = t.category.value if t.category else "other"
+                spend[key] = spend.get(key, 0.0) + t.amount / months
+        return cls(monthly_income=ledger.inflow / months, monthly_spend=spend, balance=ledger.net_cashflow)
+
+
+@dataclass
+class ScenarioGrid:
+    """
+    Every combination of the given adjustment axes, evaluated in one broadcast computation.
+    Arrays in `metrics` have one dimension per axis, in `axes` order.
+    """
+    axes: Dict[str, np.ndarray]
+    metrics: Dict[str, np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return int(next(iter(self.metrics.values())).size)
+
+    def sensitivity_table(self, row_axis: str, col_axis: str, metric: str = "savings_rate") -> np.ndarray:
+        """
+        2-D view of a metric over two axes, averaging over any remaining axes.
+        """
+        names = list(self.axes)
+        values = self.metrics[metric]
+        others = tuple(i for i, n in enumerate(names) if n not in (row_axis, col_axis))
+        if others:
+            values = values.mean(axis=others)
+        remaining = [n for n in names if n in (row_axis, col_axis)]
+        return values if remaining == [row_axis, col_axis] else values.T
+
+    def best(self, n: int = 5, metric: str = "savings_rate") -> List[Dict[str, float]]:
+        """
+        Top n combinations by a metric, as plain dicts of axis values and metrics.
+        """
+        flat = self.metrics[metric].ravel()
+        order = np.argsort(flat)[::-1][:n]
+        return self._records(order)
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, float]]:
+        idx = np.arange(self.size if limit is None else min(limit, self.size))
+        return self._records(idx)
+
+    def _records(self, flat_idx: np.ndarray) -> List[Dict[str, float]]:
+        shape = next(iter(self.metrics.values())).shape
+        coords = np.unravel_index(flat_idx, shape)
+        records = []
+        for k in range(len(flat_idx)):
+            rec = {name: float(axis[coords[i][k]]) for i, (name, axis) in enumerate(self.axes.items())}
+            for metric, values in self.metrics.items():
+                rec[metric] = float(values[tuple(c[k] for c in coords)])
+            records.append(rec)
+        return records
+
+
+def run_scenarios(
+    baseline: ScenarioBaseline,
+    category_cuts: Optional[Dict[str, Sequence[float]]] = None,
+    income_changes: Sequence[float] = (0.0,),
+    extra_fixed_costs: Sequence[float] = (0.0,)
+) -> ScenarioGrid:
+    """
+    Evaluate runway, savings rate and net cashflow for every combination of
+    per-category spending cuts (fractions, e.g. 0.1 = 10% less), income changes (fractions)
+    and extra fixed monthly costs (dollars).
+    """
+    axes: Dict[str, np.ndarray] = {}
+    for category, cuts in (category_cuts or {}).items():
+        axes[f"cut_{category}"] = np.asarray(cuts, dtype=np.float64)
+    axes[INCOME_AXIS] = np.asarray(income_changes, dtype=np.float64)
+    axes[FIXED_COST_AXIS] = np.asarray(extra_fixed_costs, dtype=np.float64)
+
+    # Open grids: each axis broadcasts along its own dimension only
+    grids = dict(zip(axes, np.ix_(*axes.values())))
+
+    spend = sum(baseline.monthly_spend.values())
+    for category in (category_cuts or {}):
+        spend = spend - baseline.monthly_spend.get(category, 0.0) * grids[f"cut_{category}"]
+    spend = spend + grids[FIXED_COST_AXIS]
+    income = baseline.monthly_income * (1 + grids[INCOME_AXIS])
+    shape = tuple(a.size for a in axes.values())
+
+    net = np.broadcast_to(income - spend, shape)
+    spend = np.broadcast_to(spend, shape)
+    income = np.broadcast_to(income, shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        savings_rate = np.where(income > 0, net / income, 0.0)
+        runway = np.where(spend > 0, np.maximum(baseline.balance, 0.0) / spend, np.inf)
+
+    return ScenarioGrid(
+        axes=axes,
+        metrics={"net_cashflow": net, "savings_rate": savings_rate, "runway": runway}
+    )
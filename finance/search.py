@@ -0,0 +1,113 @@
+# finance/search.py
+import heapq
+import re
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Set
+
+# Minimum trigram Jaccard similarity for a fuzzy match ("starbuks" -> "Starbucks")
+FUZZY_THRESHOLD = 0.3
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Character trigrams of each token, padded so short words and word edges still match.
+    """
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class DescriptionIndex:
+    """
+    In-memory inverted (token) and trigram index over transaction descriptions.
+    Distinct descriptions are indexed once and point at every row that uses them,
+    so repeated merchants cost one list append per write.
+    """
+    def __init__(self):
+        self._desc_ids: Dict[str, int] = {}
+        self._rows: List[List[int]] = []          # desc id -> row ids, in insertion order
+        self._gram_counts: List[int] = []         # desc id -> number of trigrams
+        self._tokens: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, row_id: int, description: str):
+        key = description.lower()
+        with self._lock:
+            desc_id = self._desc_ids.get(key)
+            if desc_id is None:
+                desc_id = len(self._rows)
+                self._desc_ids[key] = desc_id
+                self._rows.append([])
+                grams = trigrams(key)
+                self._gram_counts.append(len(grams))
+                for token in tokenize(key):
+                    self._tokens.setdefault(token, set()).add(desc_id)
+                for gram in grams:
+                    self._grams.setdefault(gram, set()).add(desc_id)
+            self._rows[desc_id].append(row_id)
+
+    def clear(self):
+        with self._lock:
+            self._desc_ids.clear()
+            self._rows.clear()
+            self._gram_counts.clear()
+            self._tokens.clear()
+            self._grams.clear()
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._rows)
+
+    def _exact(self, tokens: List[str]) -> List[int]:
+        postings = [self._tokens.get(t) for t in tokens]
+        if not postings or any(p is None for p in postings):
+            return []
+        postings.sort(key=len)
+        matched = set(postings[0])
+        for p in postings[1:]:
+            matched &= p
+        return list(matched)
+
+    def _fuzzy(self, query: str) -> List[int]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        scored = []
+        for desc_id, common in shared.items():
+            similarity = common / (len(grams) + self._gram_counts[desc_id] - common)
+            if similarity >= FUZZY_THRESHOLD:
+                scored.append((similarity, desc_id))
+        scored.sort(reverse=True)
+        return [desc_id for _, desc_id in scored]
+
+    def search(self, text: str, limit: int) -> List[int]:
+        """
+        Row ids whose description contains every query word (most recently added first),
+        or failing that the rows of the closest fuzzy matches, best match first.
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            exact = self._exact(tokenize(text))
+            if exact:
+                return heapq.nlargest(limit, chain.from_iterable(self._rows[d] for d in exact))
+            results: List[int] = []
+            for desc_id in self._fuzzy(text):
+                rows = self._rows[desc_id]
+                results.extend(reversed(rows[-(limit - len(results)):]))
+                if len(results) >= limit:
+                    break
+        return results
@@ -1,6 +1,10 @@
-from typing import List
+from typing import Dict, List, Optional
 from finance.models.transaction import Transaction
 from finance.models.reports import FinancialReport, BudgetReport
+from finance.merchants import merchants, display_name
+
+# Merchants listed in a spending report
+TOP_MERCHANTS = 5
 
 class AdvisorService:
     @staticmethod
@@ -16,22 +20,46 @@ class AdvisorService:
                 recommendations=["Start recording expenses to see an analysis."]
             )
         
-        total = sum(e.amount for e in expenses)
         category_totals = {}
+        # Group payees on interned merchant ids, not on raw description text
+        merchant_totals: Dict[int, float] = {}
         for e in expenses:
             cat = e.category.value
             category_totals[cat] = category_totals.get(cat, 0) + e.amount
-            
+            merchant_id = merchants.id_for(e.description)
+            merchant_totals[merchant_id] = merchant_totals.get(merchant_id, 0) + e.amount
+        top = sorted(merchant_totals.items(), key=lambda kv: kv[1], reverse=True)[:TOP_MERCHANTS]
+        return AdvisorService.analyze_category_totals(
+            category_totals,
+            {merchants.name(merchant_id): total for merchant_id, total in top}
+        )
+
+    @staticmethod
+    def analyze_category_totals(
+        category_totals: Dict[str, float],
+        merchant_totals: Optional[Dict[str, float]] = None
+    ) -> FinancialReport:
+        """
+        Produce a financial report from pre-aggregated per-category (and optionally per-merchant) spending.
+        """
+        if not category_totals:
+            return AdvisorService.analyze_spending([])
+
+        total = sum(category_totals.values())
         top_cat = max(category_totals, key=category_totals.get)
-        
+        recommendations = [f"Your top spending category is {top_cat}."]
+        if merchant_totals:
+            top_merchant = max(merchant_totals, key=merchant_totals.get)
+            share = merchant_totals[top_merchant] / total * 100
+            recommendations.append(f"Your largest payee is {display_name(top_merchant)} ({share:.0f}% of spending).")
+        recommendations.append("Consider the 50/30/20 rule: 50% Needs, 30% Wants, 20% Savings.")
+
         return FinancialReport(
             total_spent=total,
             categories=category_totals,
             top_category=top_cat,
-            recommendations=[
-                f"Your top spending category is {top_cat}.",
-                "Consider the 50/30/20 rule: 50% Needs, 30% Wants, 20% Savings."
-            ]
+            recommendations=recommendations,
+            merchants=merchant_totals or {}
         )
 
     @staticmethod
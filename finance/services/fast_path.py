@@ -0,0 +1,148 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.services.categories import CategoryService
+from finance.services.ledger import LedgerService
+
+# Confidence needed before a message is recorded without consulting the LLM
+FAST_PATH_THRESHOLD = 0.8
+
+_AMOUNT = re.compile(r"(?:\$|usd\s?)\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?\b|\b(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?\s?(?:dollars|bucks|usd)\b", re.I)
+_EXPENSE_VERBS = re.compile(r"\b(spent|spend|paid|pay|bought|buy|purchased|cost|costs)\b", re.I)
+_INCOME_VERBS = re.compile(r"\b(received|receive|got paid|earned|earn|arrived|deposited|deposit)\b", re.I)
+_INCOME_SOURCES = re.compile(r"\b(salary|paycheck|payroll|bonus|freelance|dividends?|refund|interest|wages?)\b", re.I)
+# Anything that smells like a question, a request for analysis, or more than one transaction
+_AMBIGUOUS = re.compile(r"\?|\b(how|what|show|list|analy[sz]e|budget|should|can i|plan|and then|also|each|per|split|every)\b", re.I)
+# Negated or not-yet-happened spending ("I didn't spend", "I will pay") is not a transaction
+_HYPOTHETICAL = re.compile(r"n['’]t\b|\b(not|never|no longer|cannot|will|shall|would|could|might|going to|gonna|plan(?:ning)? to|want to|need to|about to|intend to)\b", re.I)
+# The fast path always records today's date; any other date is left to the agent
+_OTHER_DATE = re.compile(
+    r"\b(yesterday|tomorrow|ago|(?:last|next|past|previous|this) (?!morning|afternoon|evening)\w+|"
+    r"(?:mon|tues|wednes|thurs|fri|satur|sun)days?|january|february|march|april|may|june|july|august|"
+    r"september|october|november|december|\d{1,2}(?:st|nd|rd|th))\b|\b\d{1,4}[/-]\d{1,2}(?:[/-]\d{1,4})?\b",
+    re.I
+)
+_DESCRIPTION = re.compile(r"\b(?:on|for|at)\s+(?:a |an |the |some |my )?([a-z][\w' &-]{1,40}?)(?:\s+(?:today|tonight|this (?:morning|afternoon|evening)))?[.!]*$", re.I)
+
+
+@dataclass
+class ParsedEntry:
+    type: TransactionType
+    amount: float
+    category: TransactionCategory
+    description: str
+    confidence: float
+
+
+class FastPathParser:
+    """
+    Rule-based extractor for simple single-transaction messages such as
+    "I spent $15 on lunch" or "Salary $5000 received".
+    """
+    @staticmethod
+    def parse(text: str) -> Optional[ParsedEntry]:
+        text = text.strip()
+        amounts = list(_AMOUNT.finditer(text))
+        if len(amounts) != 1 or _AMBIGUOUS.search(text) or _HYPOTHETICAL.search(text) or _OTHER_DATE.search(text):
+            return None
+
+        match = amounts[0]
+        whole = match.group(1) or match.group(3)
+        cents = match.group(2) or match.group(4) or "0"
+        amount = float(f"{whole.replace(',', '')}.{cents}")
+        if amount <= 0:
+            return None
+
+        income_source = _INCOME_SOURCES.search(text)
+        is_income = bool(_INCOME_VERBS.search(text) or income_source)
+        is_expense = bool(_EXPENSE_VERBS.search(text))
+        if is_income == is_expense:
+            return None
+
+        if is_income:
+            source = income_source.group(1).title() if income_source else "Income"
+            return ParsedEntry(
+                type=TransactionType.INCOME,
+                amount=amount,
+                category=TransactionCategory.INCOME,
+                description=source,
+                confidence=0.9 if income_source else 0.7
+            )
+
+        desc_match = _DESCRIPTION.search(text)
+        description = desc_match.group(1).strip() if desc_match else ""
+        category = CategoryService.map_to_category(description or text)
+        confidence = 0.5
+        if description:
+            confidence += 0.2
+        if category != TransactionCategory.OTHER:
+            confidence += 0.2
+        return ParsedEntry(
+            type=TransactionType.EXPENSE,
+            amount=amount,
+            category=category,
+            description=description or text,
+            confidence=confidence
+        )
+
+
+@dataclass
+class FastPathStats:
+    attempts: int = 0
+    hits: int = 0
+    total_latency: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, hit: bool, latency: float) -> None:
+        with self._lock:
+            self.attempts += 1
+            self.hits += hit
+            self.total_latency += latency
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def average_latency_ms(self) -> float:
+        return self.total_latency / self.attempts * 1000 if self.attempts else 0.0
+
+    def summary(self) -> str:
+        return (f"fast-path hit rate {self.hit_rate * 100:.0f}% ({self.hits}/{self.attempts}), "
+                f"avg {self.average_latency_ms:.2f} ms")
+
+
+fast_path_stats = FastPathStats()
+
+
+class FastPathService:
+    """
+    Records high-confidence entries directly through LedgerService.
+    try_record returns the stored transaction, or None when the message should go to the agent.
+    Services are built per request, so by default they all report into the shared fast_path_stats.
+    """
+    def __init__(self, ledger: LedgerService, threshold: float = FAST_PATH_THRESHOLD,
+                 stats: Optional[FastPathStats] = None):
+        self.ledger = ledger
+        self.threshold = threshold
+        self.stats = stats if stats is not None else fast_path_stats
+
+    def try_record(self, text: str) -> Optional[Transaction]:
+        start = time.perf_counter()
+        tx = None
+        try:
+            entry = FastPathParser.parse(text)
+            if entry is None or entry.confidence < self.threshold:
+                return None
+
+            if entry.type == TransactionType.INCOME:
+                tx = self.ledger.record_income(entry.amount, entry.description)
+            else:
+                tx = self.ledger.record_expense(entry.amount, entry.category, entry.description)
+            return tx
+        finally:
+            self.stats.record(tx is not None, time.perf_counter() - start)
@@ -0,0 +1,158 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionCategory
+from finance.models.reports import AggregateRow, BudgetStatus, SpendingSummary
+from finance.repositories.transaction_repository import TransactionRepository
+from finance.periods import resolve_period, month_start, previous_month_start
+from finance.merchants import canonical_merchant
+
+# Raw description groups fetched per requested merchant, so spelling variants can be folded together
+MERCHANT_OVERFETCH = 4
+# Newest transactions listed in the ledger digest
+DIGEST_RECENT = 5
+
+
+class InsightService:
+    """
+    Answers focused questions ("how much on food last month?") from aggregate queries,
+    so callers never have to load and scan the full ledger.
+    """
+    def __init__(self, expense_repo: TransactionRepository, income_repo: TransactionRepository):
+        self.expense_repo = expense_repo
+        self.income_repo = income_repo
+
+    def spending_by_category(self, period: str = "this_month", now: Optional[datetime] = None) -> List[SpendingSummary]:
+        """
+        Expense totals per category for a period, largest first.
+        """
+        start, end = resolve_period(period, now)
+        rows = self.expense_repo.totals_by_category(start, end)
+        grand_total = sum(r.total for r in rows) or 1.0
+        summaries = []
+        for r in rows:
+            try:
+                category = TransactionCategory(r.key)
+            except ValueError:
+                category = TransactionCategory.OTHER
+            summaries.append(SpendingSummary(
+                category=category,
+                total_amount=r.total,
+                expense_count=r.count,
+                percentage=r.total / grand_total * 100
+            ))
+        return summaries
+
+    def income_total(self, period: str = "this_month", now: Optional[datetime] = None) -> float:
+        start, end = resolve_period(period, now)
+        return sum(r.total for r in self.income_repo.totals_by_category(start, end))
+
+    def top_merchants(self, period: str = "this_month", limit: int = 5, now: Optional[datetime] = None) -> List[AggregateRow]:
+        """
+        Largest expense payees for a period. The database groups by raw description;
+        variants of the same merchant ("GROCERY STORE #42", "Grocery Store") are folded here.
+        """
+        start, end = resolve_period(period, now)
+        folded: dict = {}
+        for r in self.expense_repo.top_descriptions(limit * MERCHANT_OVERFETCH, start, end):
+            name = canonical_merchant(r.key)
+            bucket = folded.setdefault(name, [0.0, 0])
+            bucket[0] += r.total
+            bucket[1] += r.count
+        rows = [AggregateRow(key=k, total=v[0], count=v[1]) for k, v in folded.items()]
+        rows.sort(key=lambda r: r.total, reverse=True)
+        return rows[:limit]
+
+    def month_over_month(
+        self,
+        category: Optional[TransactionCategory] = None,
+        now: Optional[datetime] = None
+    ) -> tuple[AggregateRow, AggregateRow]:
+        """
+        Expense totals for the current and previous calendar month.
+        Returns (previous, current); months without spending have a zero total.
+        """
+        now = now or datetime.now()
+        previous_key = previous_month_start(now).strftime("%Y-%m")
+        current_key = month_start(now).strftime("%Y-%m")
+        rows = {r.key: r for r in self.expense_repo.totals_by_month(previous_month_start(now), now, category)}
+        previous = rows.get(previous_key, AggregateRow(key=previous_key, total=0.0, count=0))
+        current = rows.get(current_key, AggregateRow(key=current_key, total=0.0, count=0))
+        return previous, current
+
+    def monthly_net_cashflow(self, include_current: bool = False, now: Optional[datetime] = None) -> List[AggregateRow]:
+        """
+        Income minus expenses per calendar month from the first recorded month onward,
+        with empty months filled as zero. The running month is excluded unless include_current.
+        """
+        now = now or datetime.now()
+        net = {}
+        for r in self.income_repo.totals_by_month():
+            net[r.key] = [r.total, r.count]
+        for r in self.expense_repo.totals_by_month():
+            bucket = net.setdefault(r.key, [0.0, 0])
+            bucket[0] -= r.total
+            bucket[1] += r.count
+        if not net:
+            return []
+
+        current_key = month_start(now).strftime("%Y-%m")
+        cursor = datetime.strptime(min(net), "%Y-%m")
+        last = max(max(net), current_key)
+        rows = []
+        while cursor.strftime("%Y-%m") <= last:
+            key = cursor.strftime("%Y-%m")
+            if key != current_key or include_current:
+                total, count = net.get(key, [0.0, 0])
+                rows.append(AggregateRow(key=key, total=total, count=count))
+            cursor = month_start(cursor + timedelta(days=32))
+        return rows
+
+    def net_balance(self) -> float:
+        """
+        All-time income minus expenses, from the per-category aggregates.
+        """
+        income = sum(r.total for r in self.income_repo.totals_by_category())
+        spent = sum(r.total for r in self.expense_repo.totals_by_category())
+        return income - spent
+
+    def recent(self, limit: int = 5) -> List[Transaction]:
+        """
+        The newest `limit` transactions across income and expenses.
+        """
+        merged = self.expense_repo.list_recent(limit) + self.income_repo.list_recent(limit)
+        merged.sort(key=lambda t: t.date, reverse=True)
+        return merged[:limit]
+
+    def digest(
+        self,
+        budgets: Optional[List[BudgetStatus]] = None,
+        recent_count: int = DIGEST_RECENT,
+        now: Optional[datetime] = None
+    ) -> str:
+        """
+        Compact plain-text snapshot of the ledger (balance, month-to-date by category,
+        budgets, newest transactions) for an agent's system prompt.
+        """
+        now = now or datetime.now()
+        summaries = self.spending_by_category("this_month", now)
+        spent = sum(s.total_amount for s in summaries)
+        lines = [
+            f"LEDGER SNAPSHOT ({now.strftime('%Y-%m-%d')})",
+            f"Net balance (all time): ${self.net_balance():,.2f}",
+            f"Month to date ({now.strftime('%Y-%m')}): spent ${spent:,.2f}, income ${self.income_total('this_month', now):,.2f}",
+        ]
+        lines += [f"- {s.category.value}: ${s.total_amount:,.2f} ({s.expense_count} tx)" for s in summaries]
+        if budgets:
+            lines.append("Budgets this month:")
+            lines += [
+                f"- {b.category.value}: ${b.actual:,.2f} of ${b.planned:,.2f}{' OVER' if b.overspent else ''}"
+                for b in budgets
+            ]
+        recent = self.recent(recent_count)
+        lines.append("Recent transactions:" if recent else "No transactions recorded yet.")
+        for t in recent:
+            sign = "+" if t.type.value == "income" else "-"
+            category = t.category.value if t.category else "N/A"
+            lines.append(f"- {t.date.strftime('%Y-%m-%d')} {sign}${t.amount:,.2f} {category} {t.description}")
+        return "\n".join(lines)
@@ -1,14 +1,38 @@
-from typing import List, Optional
-from datetime import datetime
+import io
+from typing import List, Optional, TextIO
+from datetime import datetime, timezone
 from finance.models.transaction import Transaction
 from finance.models.enums import TransactionType, TransactionCategory
 from finance.repositories.transaction_repository import TransactionRepository
-from finance.ledger import Ledger
+from finance.budget import BudgetTracker
+from finance.anomaly import AnomalyDetector
+from finance.recurring import RecurringDetector
+from finance.balance import BalanceIndex
+from finance.models.reports import Anomaly
+
+# Rough chars-per-token ratio used to keep reports inside an LLM context budget
+CHARS_PER_TOKEN = 4
+DEFAULT_REPORT_ROWS = 50
+DEFAULT_REPORT_TOKENS = 1500
 
 class LedgerService:
-    def __init__(self, expense_repo: TransactionRepository, income_repo: TransactionRepository):
+    def __init__(
+        self,
+        expense_repo: TransactionRepository,
+        income_repo: TransactionRepository,
+        budget_tracker: Optional[BudgetTracker] = None,
+        anomaly_detector: Optional[AnomalyDetector] = None,
+        recurring_detector: Optional[RecurringDetector] = None,
+        balance_index: Optional[BalanceIndex] = None
+    ):
         self.expense_repo = expense_repo
         self.income_repo = income_repo
+        self.budget_tracker = budget_tracker
+        self.anomaly_detector = anomaly_detector
+        self.recurring_detector = recurring_detector
+        self.balance_index = balance_index
+        # Outliers flagged by the most recent record_expense call
+        self.last_anomalies: List[Anomaly] = []
     
     def record_expense(self, amount: float, category: TransactionCategory, description: str) -> Transaction:
         """
@@ -19,9 +43,18 @@ class LedgerService:
             category=category, 
             description=description, 
             type=TransactionType.EXPENSE, 
-            date=datetime.now()
+            date=datetime.now(timezone.utc)
         )
-        return self.expense_repo.add(expense)
+        expense = self.expense_repo.add(expense)
+        if self.budget_tracker is not None:
+            self.budget_tracker.record(expense)
+        if self.anomaly_detector is not None:
+            self.last_anomalies = self.anomaly_detector.observe(expense)
+        if self.recurring_detector is not None:
+            self.recurring_detector.add(expense)
+        if self.balance_index is not None:
+            self.balance_index.add(expense)
+        return expense
 
     def record_income(self, amount: float, source: str, description: str = "") -> Transaction:
         """
@@ -35,9 +68,12 @@ class LedgerService:
             category=TransactionCategory.INCOME,
             description=full_desc,
             type=TransactionType.INCOME,
-            date=datetime.now()
+            date=datetime.now(timezone.utc)
         )
-        return self.income_repo.add(income)
+        income = self.income_repo.add(income)
+        if self.balance_index is not None:
+            self.balance_index.add(income)
+        return income
 
     def get_transaction_history(self, category: Optional[TransactionCategory] = None) -> List[Transaction]:
         """
@@ -63,28 +99,88 @@ class LedgerService:
         """Sum of INCOME only from a list of transactions."""
         return sum(t.amount for t in transactions if t.type == TransactionType.INCOME)
 
-    def format_history_report(self, category: Optional[TransactionCategory], transactions: List[Transaction]) -> str:
+    def format_history_report(
+        self,
+        category: Optional[TransactionCategory],
+        transactions: List[Transaction],
+        limit: int = DEFAULT_REPORT_ROWS,
+        offset: int = 0,
+        max_tokens: int = DEFAULT_REPORT_TOKENS
+    ) -> str:
+        """
+        Render a bounded ledger report. See write_history_report.
+        """
+        buffer = io.StringIO()
+        self.write_history_report(buffer, category, transactions, limit, offset, max_tokens)
+        return buffer.getvalue()
+
+    def write_history_report(
+        self,
+        buffer: TextIO,
+        category: Optional[TransactionCategory],
+        transactions: List[Transaction],
+        limit: int = DEFAULT_REPORT_ROWS,
+        offset: int = 0,
+        max_tokens: int = DEFAULT_REPORT_TOKENS
+    ) -> int:
+        """
+        Stream a ledger report into buffer, showing at most `limit` rows starting at `offset`
+        and stopping early once roughly `max_tokens` have been written.
+        Totals cover every transaction and are accumulated in the same pass.
+        Returns the number of rows written.
+        """
         if not transactions:
             cat_name = category.value if category else 'all categories'
-            return f"No records found for {cat_name}."
+            buffer.write(f"No records found for {cat_name}.")
+            return 0
 
         title = f"LEDGER REPORT: {category.value.upper() if category else 'ALL TRANSACTIONS'}"
-        report = f"{'='*40}\n{title}\n{'='*40}\n"
-        
-        for t in transactions:
+        header = f"{'='*40}\n{title}\n{'='*40}\n"
+        buffer.write(header)
+
+        # Reserve room for the footer so totals are never cut off
+        budget = max_tokens * CHARS_PER_TOKEN - len(header) - 400
+        offset = max(offset, 0)
+        end = offset + max(limit, 0)
+
+        written = 0
+        budget_hit = False
+        total_income = 0.0
+        total_spent = 0.0
+        for i, t in enumerate(transactions):
+            if t.type == TransactionType.INCOME:
+                total_income += t.amount
+            else:
+                total_spent += t.amount
+
+            if i < offset or i >= end or budget_hit:
+                continue
             date_str = t.date.strftime('%Y-%m-%d')
             prefix = "+" if t.type == TransactionType.INCOME else "-"
             cat_label = t.category.value if t.category else "N/A"
-            report += f"[{date_str}] {prefix} ${t.amount:>8.2f} | {cat_label:12} | {t.description}\n"
-            
-        ledger = Ledger(transactions=transactions)
-        total_spent = ledger.outflow
-        total_income = ledger.inflow
-        net_flow = ledger.net_cashflow
-        
-        report += f"{'-'*40}\n"
-        report += f"TOTAL INCOME:   ${total_income:>10.2f}\n"
-        report += f"TOTAL SPENDING: ${total_spent:>10.2f}\n"
-        report += f"NET FLOW:       ${net_flow:>10.2f}\n"
-        report += f"{'='*40}"
-        return report
+            line = f"[{date_str}] {prefix} ${t.amount:>8.2f} | {cat_label:12} | {t.description}\n"
+            if len(line) > budget:
+                budget_hit = True
+                continue
+            buffer.write(line)
+            budget -= len(line)
+            written += 1
+
+        total = len(transactions)
+        buffer.write(f"{'-'*40}\n")
+        if written < total:
+            first = min(offset, total)
+            buffer.write(f"SHOWING {written} OF {total} ROWS (offset {first}).\n")
+            if offset > 0:
+                buffer.write(f"- {first} newer rows skipped by offset.\n")
+            remaining = total - first - written
+            if remaining > 0:
+                reason = "token budget" if budget_hit else "row limit"
+                buffer.write(f"- {remaining} older rows truncated by {reason}; use offset={first + written} to continue.\n")
+            buffer.write(f"{'-'*40}\n")
+
+        buffer.write(f"TOTAL INCOME:   ${total_income:>10.2f}\n")
+        buffer.write(f"TOTAL SPENDING: ${total_spent:>10.2f}\n")
+        buffer.write(f"NET FLOW:       ${total_income - total_spent:>10.2f}\n")
+        buffer.write(f"{'='*40}")
+        return written
@@ -0,0 +1,93 @@
+# finance/simulation.py
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .models.finance_goal import FinancialGoal
+from .models.reports import GoalFeasibility
+
+DEFAULT_PATHS = 20_000
+DEFAULT_HORIZON_MONTHS = 12
+MAX_HORIZON_MONTHS = 600
+PERCENTILES = (5, 25, 50, 75, 95)
+# Below this many goals the process pool costs more than it saves
+PARALLEL_GOAL_THRESHOLD = 4
+
+
+def months_until(deadline: Optional[datetime], now: Optional[datetime] = None) -> int:
+    """
+    Whole calendar months between now and deadline (at least 1).
+    """
+    if deadline is None:
+        return DEFAULT_HORIZON_MONTHS
+    now = now or datetime.now(deadline.tzinfo)
+    months = (deadline.year - now.year) * 12 + (deadline.month - now.month)
+    return int(min(max(months, 1), MAX_HORIZON_MONTHS))
+
+
+def simulate_goal(
+    goal: FinancialGoal,
+    monthly_net: Sequence[float],
+    starting_balance: float = 0.0,
+    n_paths: int = DEFAULT_PATHS,
+    now: Optional[datetime] = None,
+    seed=None
+) -> GoalFeasibility:
+    """
+    Monte Carlo feasibility of a savings goal.
+    Each path bootstraps (resamples with replacement) the historical monthly net cashflow
+    for every month until the deadline; a path succeeds if its balance reaches the target
+    at any point. All paths are simulated as one (n_paths, months) array.
+    """
+    history = np.asarray(monthly_net, dtype=np.float64)
+    if history.size == 0:
+        history = np.zeros(1)
+    months = months_until(goal.deadline, now)
+
+    rng = np.random.default_rng(seed)
+    draws = rng.choice(history, size=(n_paths, months))
+    balances = np.cumsum(draws, axis=1)
+    balances += starting_balance
+
+    hit = balances.max(axis=1) >= goal.target_amount
+    bands = np.percentile(balances, PERCENTILES, axis=0)
+
+    return GoalFeasibility(
+        goal_name=goal.name,
+        target_amount=goal.target_amount,
+        starting_balance=starting_balance,
+        months=months,
+        paths=n_paths,
+        probability=float(hit.mean()),
+        percentile_bands={p: bands[i].round(2).tolist() for i, p in enumerate(PERCENTILES)}
+    )
+
+
+def _simulate_packed(args) -> GoalFeasibility:
+    return simulate_goal(*args)
+
+
+def simulate_goals(
+    goals: List[FinancialGoal],
+    monthly_net: Sequence[float],
+    starting_balance: float = 0.0,
+    n_paths: int = DEFAULT_PATHS,
+    now: Optional[datetime] = None,
+    seed=None,
+    max_workers: Optional[int] = None
+) -> List[GoalFeasibility]:
+    """
+    Evaluate a portfolio of goals independently, in goal-priority order.
+    Large portfolios are spread across a process pool; each goal gets its own RNG stream.
+    """
+    goals = sorted(goals, key=lambda g: g.priority)
+    seeds = np.random.SeedSequence(seed).spawn(len(goals))
+    history = list(monthly_net)
+    jobs = [(g, history, starting_balance, n_paths, now, s) for g, s in zip(goals, seeds)]
+
+    if len(goals) < PARALLEL_GOAL_THRESHOLD or max_workers == 1:
+        return [_simulate_packed(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_simulate_packed, jobs))
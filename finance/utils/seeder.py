@@ -19,6 +19,7 @@ class DataSeeder:
         deps.income_repo.clear()
         
         current_date = datetime.now()
+        seeded_expenses: List[Transaction] = []
         
         # 2. Seed Income (Last 3 months)
         income_sources = [
@@ -56,12 +57,15 @@ class DataSeeder:
             ("Doctor Visit", 120, TransactionCategory.HEALTHCARE, "once"),
         ]
         
+        # Bills land on the same day every month, like real subscriptions
+        billing_days = {desc: random.randint(1, 5) for desc, _, _, freq in expense_templates if freq == "monthly"}
+
         for i in range(90): # Last 90 days
             seed_date = current_date - timedelta(days=i)
             
             for desc, base_amount, cat, freq in expense_templates:
                 should_add = False
-                if freq == "monthly" and seed_date.day == random.randint(1, 5):
+                if freq == "monthly" and seed_date.day == billing_days[desc]:
                     should_add = True
                 elif freq == "weekly" and seed_date.weekday() == random.randint(0, 6):
                     should_add = True
@@ -77,6 +81,17 @@ class DataSeeder:
                         description=desc,
                         date=seed_date
                     )
-                    deps.expense_repo.add(tx)
+                    seeded_expenses.append(deps.expense_repo.add(tx))
+
+        # Month-to-date counters were bypassed by the direct repository writes
+        if deps.budget_tracker is not None:
+            deps.budget_tracker.invalidate()
+        if deps.recurring_detector is not None:
+            deps.recurring_detector.invalidate()
+        if deps.balance_index is not None:
+            deps.balance_index.invalidate()
+        # The ledger was cleared above, so the seeded rows are the whole expense history
+        if deps.anomaly_detector is not None:
+            deps.anomaly_detector.rebuild(seeded_expenses)
         
         return True
@@ -10,12 +10,19 @@ load_dotenv()
 # Project imports
 from core.container import Container, create_finance_agent
 from core.settings import settings
-from core.observability import track_agent_run, log_agent_result
+from core.observability import track_agent_run, log_agent_result, log_agent_metrics, logger
+from core.tracing import trace_turn, record_run
+from core.streaming import AgentStream
+from core.history import HistoryManager
+from agents.finance import try_fast_path
+from finance.services.fast_path import fast_path_stats
 
 async def main():
     parser = argparse.ArgumentParser(description='Personal Finance Assistant')
     parser.add_argument('--model', type=str, choices=['ollama', 'openai', 'gemini', 'google'],
                       help='Model provider to use (overrides MODEL_PROVIDER env var)')
+    parser.add_argument('--stream', action='store_true',
+                      help='Print partial model output and tool progress as it arrives')
     args = parser.parse_args()
 
     # Domain models and services
@@ -42,6 +49,7 @@ async def main():
     print("Type 'quit' or 'exit' to end the session.\n")
 
     history = []
+    history_manager = HistoryManager()
 
     while True:
         try:
@@ -52,22 +60,50 @@ async def main():
                 print("\n👋 Stay financially healthy. Goodbye!")
                 break
 
+            # Simple entries are parsed and recorded locally, skipping the LLM
+            fast_reply = try_fast_path(deps, user_input)
+            if fast_reply:
+                print(f"\n🤖 Assistant: {fast_reply}")
+                continue
+
             # Execute Request
             # We pass the pre-resolved model object to ensure correctness
-            async with track_agent_run("Finance Clerk CLI", str(provider), {"query": user_input}):
-                finance_agent = create_finance_agent()
-                result = await finance_agent.run(
-                    user_input,
+            async with track_agent_run("Finance Clerk CLI", str(provider), {"query": user_input, "stream": args.stream}):
+                finance_agent = create_finance_agent(provider)
+                # Keep the context inside the token budget: older turns summarized, stale tool output dropped
+                history = history_manager.compact(history)
+                log_agent_metrics(history_manager.last_stats.as_metrics())
+                run_kwargs = dict(
                     model=model,
                     deps=deps,
                     message_history=history,
                     model_settings={'temperature': 0.0}
                 )
+                with trace_turn("Finance Clerk CLI") as trace:
+                    if args.stream:
+                        stream = AgentStream(finance_agent, user_input, **run_kwargs)
+                        print("\n🤖 Assistant: ", end="", flush=True)
+                        async for chunk in stream:
+                            if chunk.kind == "text":
+                                print(chunk.content, end="", flush=True)
+                            elif chunk.kind == "tool_call":
+                                print(f"\n   ⚙️  {chunk.tool_name}...", end="", flush=True)
+                            elif chunk.kind == "tool_result":
+                                print(" done\n", end="", flush=True)
+                        print()
+                        result = stream.result
+                        log_agent_metrics(stream.stats.as_metrics())
+                    else:
+                        result = await finance_agent.run(user_input, **run_kwargs)
+                        record_run("finance_agent", result)
+                logger.info(trace.summary())
+                log_agent_metrics(trace.as_metrics())
                 log_agent_result(result.output)
 
             # Update conversation history
             history = result.all_messages()
-            print(f"\n🤖 Assistant: {result.output}")
+            if not args.stream:
+                print(f"\n🤖 Assistant: {result.output}")
 
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -76,5 +112,7 @@ async def main():
             print(f"\n❌ Error: {str(e)}")
             print("Please try again or type 'quit' to exit.")
 
+    print(f"⚡ {fast_path_stats.summary()}")
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -11,7 +11,10 @@ load_dotenv()
 from agents.data_engineer import data_engineer_agent
 from core.container import Container
 from core.dependencies import FinanceDependencies, DataEngineDependencies
-from agents.strategy import strategy_agent
+from agents.strategy import strategy_agent, STRATEGY_READ_ONLY_TOOLS
+from core.cache import run_cached
+from core.tracing import trace_turn
+from core.observability import logger
 from core.settings import settings
 
 async def main():
@@ -52,7 +55,10 @@ async def main():
                 print("💼 Director: Routing to Strategy Boardroom...")
                 # Strategy agent needs basic deps
                 deps = Container.get_finance_dependencies()
-                return await strategy_agent.run(user_input, deps=deps)
+                with trace_turn("Strategy Boardroom") as trace:
+                    result = await run_cached(strategy_agent, user_input, deps=deps, read_only_tools=STRATEGY_READ_ONLY_TOOLS)
+                logger.info(trace.summary())
+                return result
 
     director = Director()
 
@@ -1,5 +1,7 @@
 import streamlit as st
 import asyncio
+import threading
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -11,10 +13,20 @@ from PIL import Image
 
 # Project imports
 from core.container import Container, create_finance_agent
-from core.settings import settings
+from core.settings import settings, model_registry
 from finance.models.enums import TransactionCategory
-from finance.ledger import Ledger
+from finance.ledger import Ledger, WINDOW_DAYS
 from finance.services.advisor import AdvisorService
+from finance.risk import rolling_risk
+from finance.columnar import CATEGORIES
+from finance.merchants import merchants, display_name
+from finance.scenarios import ScenarioBaseline, run_scenarios, INCOME_AXIS
+from finance.services.fast_path import fast_path_stats
+from agents.finance import try_fast_path, READ_ONLY_TOOLS
+from core.cache import response_cache, run_cached
+from core.history import HistoryManager, append_turn
+from core.singleflight import read_flight
+from core.metrics import metrics
 
 # Load environment
 load_dotenv()
@@ -99,12 +111,33 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def agent_loop() -> asyncio.AbstractEventLoop:
+    """
+    One long-lived event loop for agent runs, so pooled model connections survive between prompts
+    (asyncio.run per prompt would close the loop they belong to).
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+    settings.warm_models()
+    return loop
+
+
+def run_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, agent_loop()).result()
+
+
 # --- Initialization ---
 if "messages" not in st.session_state:
     st.session_state.messages = [
         {"role": "assistant", "content": "Terminal Ready. Wealth OS initialized. **Private Wealth Strategist** online. How shall we allocate capital today?"}
     ]
 
+# Model-level conversation history, kept inside the token budget between turns
+if "history" not in st.session_state:
+    st.session_state.history = []
+    st.session_state.history_manager = HistoryManager()
+
 if "currency_symbol" not in st.session_state:
     st.session_state.currency_symbol = "$"
 
@@ -143,8 +176,16 @@ with st.sidebar:
     
     if st.button("🔴 RESET SESSION", width='stretch'):
         st.session_state.messages = []
+        st.session_state.history = []
         st.rerun()
 
+    with st.expander("📈 RUNTIME METRICS"):
+        rows = metrics.snapshot()
+        if rows:
+            st.dataframe(rows, hide_index=True, width='stretch')
+        else:
+            st.caption("No activity recorded yet.")
+
     with st.expander("👤 ARCHITECT PROFILE"):
         st.caption("**Lead Architect:** Gaurav Gurjar")
         st.caption("**Uplink:** ggurjar333@gmail.com")
@@ -189,19 +230,25 @@ if nav == "📊 QUANT TERMINAL":
         st.divider()
 
         # QUANT VISUALIZATIONS
-        tab_flow, tab_stats = st.tabs(["📉 CAPITAL FLOW", "📈 STATISTICAL AUDIT"])
+        tab_flow, tab_stats, tab_scen = st.tabs(["📉 CAPITAL FLOW", "📈 STATISTICAL AUDIT", "🧮 SCENARIO LAB"])
         
         with tab_flow:
             st.subheader("Historical Capital Area Chart")
+            window_label = st.radio("WINDOW", [f"{d}D" for d in WINDOW_DAYS] + ["ALL"], index=len(WINDOW_DAYS), horizontal=True)
+            window = ledger.slice() if window_label == "ALL" else ledger.last_days(int(window_label[:-1]))
+            w1, w2, w3 = st.columns(3)
+            w1.metric("WINDOW INFLOW", f"{currency}{window.inflow:,.2f}")
+            w2.metric("WINDOW OUTFLOW", f"{currency}{window.outflow:,.2f}")
+            w3.metric("WINDOW NET", f"{currency}{window.net_cashflow:,.2f}", f"{len(window)} tx")
+            # The window is already in date order, so no sort is needed
             df = pd.DataFrame([{
                 "Date": t.date,
                 "Amount": t.amount,
                 "Type": t.type.value.title()
-            } for t in ledger.transactions])
+            } for t in window])
             
             if not df.empty:
-                df_sorted = df.sort_values("Date")
-                fig_flow = px.area(df_sorted, x="Date", y="Amount", color="Type",
+                fig_flow = px.area(df, x="Date", y="Amount", color="Type",
                                   color_discrete_map={"Income": "#10b981", "Expense": "#ef4444"},
                                   template="plotly_dark")
                 fig_flow.update_layout(
@@ -213,6 +260,29 @@ if nav == "📊 QUANT TERMINAL":
             else:
                 st.info("No transaction telemetry available.")
 
+            if len(window):
+                st.subheader("Cumulative Balance")
+                curve_days, curve_balance = ledger.balance_index.curve(window[0].date, window[-1].date)
+                fig_bal = px.line(x=curve_days.astype("datetime64[ns]"), y=curve_balance,
+                                  labels={"x": "Date", "y": "Balance"}, template="plotly_dark")
+                fig_bal.update_traces(line_color="#10b981", line_shape="hv")
+                fig_bal.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_family="JetBrains Mono")
+                st.plotly_chart(fig_bal, width='stretch')
+
+            subscriptions = ledger.recurring.active()
+            if subscriptions:
+                st.subheader("Recurring Commitments")
+                st.caption(f"{currency}{ledger.recurring_commitments:,.2f}/month committed · "
+                           f"projected burn {currency}{ledger.projected_burn_rate:,.2f}/month")
+                st.dataframe(pd.DataFrame([{
+                    "Merchant": display_name(s.merchant),
+                    "Category": s.category.value,
+                    "Period": s.period,
+                    "Amount": round(s.average_amount, 2),
+                    "Next Charge": s.next_charge.strftime("%Y-%m-%d"),
+                    "Monthly": round(s.monthly_cost, 2)
+                } for s in subscriptions]), width='stretch', hide_index=True)
+
         with tab_stats:
             col_s1, col_s2 = st.columns(2)
             
@@ -229,6 +299,19 @@ if nav == "📊 QUANT TERMINAL":
                                         template="plotly_dark")
                     st.plotly_chart(fig_pie, width='stretch')
 
+                    st.subheader("Top Merchants")
+                    merchant_ids, merchant_totals, merchant_counts = ledger.columns.expenses_by_merchant(limit=10)
+                    df_merch = pd.DataFrame({
+                        "Merchant": [display_name(merchants.name(int(m))) for m in merchant_ids],
+                        "Amount": merchant_totals,
+                        "Charges": merchant_counts
+                    })
+                    fig_merch = px.bar(df_merch, x="Amount", y="Merchant", orientation="h", hover_data=["Charges"],
+                                       template="plotly_dark")
+                    fig_merch.update_layout(yaxis={"categoryorder": "total ascending"}, paper_bgcolor='rgba(0,0,0,0)',
+                                            plot_bgcolor='rgba(0,0,0,0)', font_family="JetBrains Mono")
+                    st.plotly_chart(fig_merch, width='stretch')
+
             with col_s2:
                 st.subheader("Advisor Audit")
                 advisor = AdvisorService()
@@ -241,6 +324,101 @@ if nav == "📊 QUANT TERMINAL":
                         </div>
                     """, unsafe_allow_html=True)
 
+                detector = st.session_state.deps.anomaly_detector if st.session_state.deps else None
+                if detector is not None and expenses:
+                    st.subheader("Outlier Watch")
+                    recent_expenses = sorted(expenses, key=lambda e: e.date, reverse=True)[:100]
+                    flagged = [(e, a) for e in recent_expenses for a in detector.score(e)]
+                    if flagged:
+                        st.dataframe(pd.DataFrame([{
+                            "Date": e.date.strftime("%Y-%m-%d"),
+                            "Description": e.description,
+                            "Amount": e.amount,
+                            "Typical": round(a.mean, 2),
+                            "Z": round(a.zscore, 1),
+                            "Key": a.key
+                        } for e, a in flagged]), width='stretch', hide_index=True)
+                    else:
+                        st.caption("No unusual transactions among the latest 100 expenses.")
+
+            tracker = st.session_state.deps.budget_tracker if st.session_state.deps else None
+            if tracker is not None:
+                st.subheader("Budget Drift")
+                months = sorted({t.date.strftime("%Y-%m") for t in ledger.transactions})[-6:]
+                budget_cats, planned, actual, drift = tracker.drift_report(months)
+                if budget_cats:
+                    fig_drift = px.imshow(
+                        drift * 100,
+                        x=months,
+                        y=[c.value for c in budget_cats],
+                        labels={"x": "Month", "y": "Category", "color": "Drift %"},
+                        color_continuous_scale="RdYlGn_r",
+                        color_continuous_midpoint=0,
+                        aspect="auto",
+                        template="plotly_dark"
+                    )
+                    fig_drift.update_layout(paper_bgcolor='rgba(0,0,0,0)', font_family="JetBrains Mono")
+                    st.plotly_chart(fig_drift, width='stretch')
+                else:
+                    st.info("No budgets set. Ask the console to \"set a food budget of $400\".")
+
+            st.subheader("Rolling Risk Engine")
+            risk_window = st.select_slider("RISK WINDOW (DAYS)", options=[7, 14, 30, 60, 90, 180], value=30)
+            risk = rolling_risk(ledger.columns, windows=(risk_window,))[risk_window]
+            if len(risk):
+                latest = risk.latest()
+                r1, r2, r3, r4 = st.columns(4)
+                r1.metric("SPEND VOLATILITY", f"{currency}{latest['volatility']:,.2f}/day")
+                r2.metric("CONCENTRATION (HHI)", f"{latest['hhi']:.2f}")
+                r3.metric("DRAWDOWN", f"{currency}{latest['drawdown']:,.0f}", f"Worst {currency}{latest['max_drawdown']:,.0f}")
+                r4.metric("BURN RATE", f"{currency}{latest['burn_rate']:,.0f}/mo")
+
+                df_burn = pd.DataFrame(risk.burn_rate, index=risk.dates, columns=[c.value for c in CATEGORIES])
+                df_burn = df_burn.loc[:, df_burn.sum() > 0]
+                fig_burn = px.line(df_burn, labels={"index": "Date", "value": "Burn / 30d", "variable": "Category"},
+                                   template="plotly_dark")
+                fig_burn.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_family="JetBrains Mono")
+                st.plotly_chart(fig_burn, width='stretch')
+
+                st.area_chart(pd.Series(risk.drawdown, index=risk.dates, name="Drawdown"), color="#ef4444")
+                st.dataframe(
+                    pd.DataFrame.from_dict(risk.latest_by_category(), orient="index"),
+                    width='stretch'
+                )
+
+        with tab_scen:
+            st.subheader("What-If Sensitivity")
+            baseline = ScenarioBaseline.from_ledger(ledger)
+            if baseline.monthly_spend:
+                sc1, sc2, sc3, sc4 = st.columns(4)
+                cut_cat = sc1.selectbox("CUT CATEGORY", sorted(baseline.monthly_spend), key="scen_cat")
+                max_cut = sc2.slider("MAX CUT %", 0, 100, 40, key="scen_cut")
+                max_raise = sc3.slider("MAX INCOME CHANGE %", 0, 50, 15, key="scen_raise")
+                extra_cost = sc4.number_input("EXTRA FIXED COST", min_value=0.0, value=0.0, step=100.0, key="scen_extra")
+
+                grid = run_scenarios(
+                    baseline,
+                    category_cuts={cut_cat: np.linspace(0, max_cut / 100, 41)},
+                    income_changes=np.linspace(0, max_raise / 100, 51),
+                    extra_fixed_costs=[extra_cost]
+                )
+                table = grid.sensitivity_table(f"cut_{cut_cat}", INCOME_AXIS) * 100
+                fig_heat = px.imshow(
+                    table,
+                    x=[f"{v * 100:.0f}%" for v in grid.axes[INCOME_AXIS]],
+                    y=[f"{v * 100:.0f}%" for v in grid.axes[f"cut_{cut_cat}"]],
+                    labels={"x": "Income Change", "y": f"{cut_cat.title()} Cut", "color": "Savings %"},
+                    color_continuous_scale="RdYlGn",
+                    aspect="auto",
+                    template="plotly_dark"
+                )
+                fig_heat.update_layout(paper_bgcolor='rgba(0,0,0,0)', font_family="JetBrains Mono")
+                st.plotly_chart(fig_heat, width='stretch')
+                st.caption(f"{grid.size:,} scenarios evaluated in one vectorized pass.")
+                st.dataframe(pd.DataFrame(grid.best(10)), width='stretch', hide_index=True)
+            else:
+                st.info("Record expenses to unlock scenario analysis.")
+
         # LEDGER TRANSACTION LOG
         st.subheader("Institutional Transaction Log")
         df_log = pd.DataFrame([{
@@ -273,14 +451,33 @@ elif nav == "🗨️ ADVISOR CONSOLE":
             placeholder = st.empty()
             placeholder.markdown("🔍 *AUDITING LEDGER...*")
             
+            deps = st.session_state.deps
+            history = st.session_state.history_manager.compact(st.session_state.history)
+            agent = create_finance_agent()
+
             async def exec_strat():
-                agent = create_finance_agent()
-                res = await agent.run(prompt, model=model, deps=st.session_state.deps)
-                return res.output
+                # Only the opening question can be served from the response cache; runs with history bypass it
+                return await run_cached(agent, prompt, model=model, deps=deps,
+                                        read_only_tools=READ_ONLY_TOOLS, message_history=history)
 
             try:
-                out = asyncio.run(exec_strat())
+                res = None
+                out = try_fast_path(deps, prompt) if deps else None
+                if out is None:
+                    res = run_async(exec_strat())
+                    out = res.output
+                if hasattr(res, "all_messages"):
+                    st.session_state.history = res.all_messages()
+                else:
+                    # Fast-path and cached answers never reached the model; keep the turn for follow-ups
+                    opener = []
+                    if deps and not st.session_state.history:
+                        opener = run_async(agent.system_prompt_parts(deps=deps, model=model))
+                    st.session_state.history = append_turn(st.session_state.history, prompt, str(out), opener)
                 placeholder.markdown(out)
+                st.caption(f"⚡ {fast_path_stats.summary()} | response cache hit rate {response_cache.stats.hit_rate * 100:.0f}% "
+                           f"| {st.session_state.history_manager.last_stats.summary()} | {model_registry.stats.summary()} "
+                           f"| {read_flight.stats.summary()}")
                 st.session_state.messages.append({"role": "assistant", "content": out})
             except Exception as e:
                 st.error(f"STRATEGY ERROR: {e}")
@@ -342,6 +539,14 @@ elif nav == "🧪 DATA LAB":
                         if st.session_state.deps:
                             st.session_state.deps.expense_repo.clear()
                             st.session_state.deps.income_repo.clear()
+                            if st.session_state.deps.budget_tracker is not None:
+                                st.session_state.deps.budget_tracker.invalidate()
+                            if st.session_state.deps.anomaly_detector is not None:
+                                st.session_state.deps.anomaly_detector.rebuild([])
+                            if st.session_state.deps.recurring_detector is not None:
+                                st.session_state.deps.recurring_detector.invalidate()
+                            if st.session_state.deps.balance_index is not None:
+                                st.session_state.deps.balance_index.invalidate()
                         else:
                             st.error("Uplink missing. Cannot execute wipe.")
                     st.success("VAULTS EMPTIED. SYSTEM RESET TO ZERO STATE.")
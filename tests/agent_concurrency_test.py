@@ -0,0 +1,57 @@
+import asyncio
+import time
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent
+from core import container
+from core.container import create_finance_agent
+from core.dependencies import FinanceDependencies
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionType
+
+LATENCY = 0.05
+PROVIDERS = [f"provider-{i}" for i in range(4)]
+
+
+def slow_model(tag: str) -> FunctionModel:
+    async def respond(messages, info):
+        await asyncio.sleep(LATENCY)
+        return ModelResponse(parts=[TextPart(tag)])
+    return FunctionModel(respond)
+
+
+def deps() -> FinanceDependencies:
+    return FinanceDependencies(
+        expense_repo=InMemoryTransactionRepository(TransactionType.EXPENSE),
+        income_repo=InMemoryTransactionRepository(TransactionType.INCOME)
+    )
+
+
+def test_concurrent_runs_are_isolated_and_scale(monkeypatch):
+    models = {p: slow_model(p) for p in PROVIDERS}
+    monkeypatch.setattr(container.settings, "get_model", lambda override=None: models[override])
+    d = deps()
+
+    async def one(i: int):
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        if i % 2:
+            result = await create_finance_agent(provider).run("balance?", deps=d)
+        else:
+            # The shared default agent with a per-run model must behave the same
+            result = await finance_agent.run("balance?", model=models[provider], deps=d)
+        return provider, result.output
+
+    async def run(n: int):
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(n)))
+        return results, time.perf_counter() - started
+
+    results, burst_time = asyncio.run(run(200))
+
+    assert all(provider == output for provider, output in results)
+    # Serialized runs would take 200 x LATENCY = 10 s
+    assert burst_time < 200 * LATENCY / 5
+    # One pre-built agent per model, never rebound
+    assert create_finance_agent(PROVIDERS[0]) is create_finance_agent(PROVIDERS[0])
+    assert create_finance_agent(PROVIDERS[0]) is not create_finance_agent(PROVIDERS[1])
+    assert finance_agent.model.model_name == "gpt-4o"
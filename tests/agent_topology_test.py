@@ -0,0 +1,76 @@
+import asyncio
+from pydantic_ai import Agent, RunContext
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent
+from agents.strategy import strategy_agent
+from application.dtos.strategy_response import StrategyResponse
+from core.dependencies import FinanceDependencies
+from core.tracing import trace_turn, record_run
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionType
+
+FINAL = {"analysis": "Spending is stable.", "steps": ["Keep saving"], "confidence_score": 0.9}
+
+
+def make_deps() -> FinanceDependencies:
+    return FinanceDependencies(
+        expense_repo=InMemoryTransactionRepository(TransactionType.EXPENSE),
+        income_repo=InMemoryTransactionRepository(TransactionType.INCOME)
+    )
+
+
+def strategy_model(first_calls: list) -> FunctionModel:
+    def respond(messages, info):
+        if isinstance(messages[-1].parts[-1], ToolReturnPart):
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, FINAL)])
+        return ModelResponse(parts=[ToolCallPart(name, args) for name, args in first_calls])
+    return FunctionModel(respond)
+
+
+def finance_model() -> FunctionModel:
+    def respond(messages, info):
+        if isinstance(messages[-1].parts[-1], ToolReturnPart):
+            return ModelResponse(parts=[TextPart("Here is the summary.")])
+        return ModelResponse(parts=[ToolCallPart("spending_summary", {"period": "this_month"})])
+    return FunctionModel(respond)
+
+
+def nested_strategy_agent() -> Agent:
+    """
+    The previous topology: strategy -> query_finance_assistant -> full finance_agent run.
+    """
+    agent = Agent(name="nested_strategy", deps_type=FinanceDependencies, output_type=StrategyResponse)
+
+    @agent.tool
+    async def query_finance_assistant(ctx: RunContext[FinanceDependencies], query: str) -> str:
+        result = await finance_agent.run(query, deps=ctx.deps, model=finance_model())
+        record_run("finance_agent", result)
+        return result.output
+
+    return agent
+
+
+def run_turn(agent: Agent, model: FunctionModel):
+    async def run():
+        with trace_turn("strategy turn") as trace:
+            result = await agent.run("How is my spending trending?", deps=make_deps(), model=model)
+            record_run(agent.name, result)
+        return result, trace
+    return asyncio.run(run())
+
+
+def test_direct_tools_halve_llm_calls():
+    _, before = run_turn(
+        nested_strategy_agent(),
+        strategy_model([("query_finance_assistant", {"query": "summarise my spending"})])
+    )
+    result, after = run_turn(
+        strategy_agent,
+        strategy_model([("spending_summary", {"period": "this_month"}), ("month_over_month", {})])
+    )
+
+    assert result.output.analysis == FINAL["analysis"]
+    assert (before.llm_calls, len(before.agent_runs)) == (4, 2)
+    # Both ledger tools were requested in one response and executed together
+    assert (after.llm_calls, after.tool_calls, len(after.agent_runs)) == (2, 3, 1)
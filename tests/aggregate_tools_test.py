@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent
+from core.dependencies import FinanceDependencies
+from data.memory import InMemoryTransactionRepository
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.services.insights import InsightService
+from finance.services.ledger import CHARS_PER_TOKEN
+
+NOW = datetime(2026, 3, 15, 12, 0)
+
+
+def seeded_deps(n: int = 600, now: datetime = NOW) -> FinanceDependencies:
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    income_repo = InMemoryTransactionRepository(TransactionType.INCOME)
+    categories = [TransactionCategory.FOOD, TransactionCategory.TRANSPORT, TransactionCategory.SHOPPING]
+    for i in range(n):
+        expense_repo.add(Transaction(
+            amount=10 + i % 7,
+            type=TransactionType.EXPENSE,
+            category=categories[i % 3],
+            description=f"Merchant {chr(65 + i % 11)}",
+            date=now - timedelta(hours=6 * i)
+        ))
+    income_repo.add(Transaction(
+        amount=5000, type=TransactionType.INCOME, category=TransactionCategory.INCOME,
+        description="Salary", date=now - timedelta(days=14)
+    ))
+    return FinanceDependencies(expense_repo=expense_repo, income_repo=income_repo)
+
+
+def stub_model(tool_name: str, args: dict) -> FunctionModel:
+    """
+    Calls one tool, then answers with a fixed sentence, like a well-behaved LLM would.
+    """
+    def respond(messages, info):
+        last = messages[-1].parts[-1]
+        if isinstance(last, ToolReturnPart):
+            return ModelResponse(parts=[TextPart("You spent that much on food.")])
+        return ModelResponse(parts=[ToolCallPart(tool_name, args)])
+    return FunctionModel(respond)
+
+
+def conversation(tool_name: str, args: dict) -> tuple[int, str]:
+    """
+    (approximate tokens the model had to read, tool output) for one question.
+    """
+    # Tools resolve periods like "last_month" from the real clock, so seed around it
+    result = asyncio.run(finance_agent.run(
+        "How much did I spend on food last month?",
+        model=stub_model(tool_name, args),
+        deps=seeded_deps(now=datetime.now())
+    ))
+    requests = [message for message in result.all_messages() if isinstance(message, ModelRequest)]
+    chars = sum(len(str(part.content)) for message in requests for part in message.parts)
+    output = next(part.content for message in requests for part in message.parts if isinstance(part, ToolReturnPart))
+    return chars // CHARS_PER_TOKEN, output
+
+
+def test_aggregate_tool_cuts_conversation_tokens():
+    full_history, _ = conversation("view_history", {"category_name": "food", "limit": 1000})
+    aggregate, summary = conversation("spending_summary", {"period": "last_month"})
+    assert aggregate * 3 < full_history
+    # The summary must actually cover last month, not an empty window
+    assert not summary.startswith("SPENDING last_month: $0.00")
+    assert "food: $" in summary
+
+
+def test_insights_match_raw_scan():
+    deps = seeded_deps()
+    insights = InsightService(deps.expense_repo, deps.income_repo)
+
+    summary = {s.category: s.total_amount for s in insights.spending_by_category("last_month", now=NOW)}
+    expected = sum(
+        t.amount for t in deps.expense_repo.list_all()
+        if t.category == TransactionCategory.FOOD and t.date.month == 2
+    )
+    assert summary[TransactionCategory.FOOD] == expected
+
+    previous, current = insights.month_over_month(TransactionCategory.FOOD, now=NOW)
+    assert (previous.key, current.key) == ("2026-02", "2026-03")
+    assert previous.total == expected
+
+    recent = insights.recent(3)
+    assert [t.description for t in recent] == ["Merchant A", "Merchant B", "Merchant C"]
+    assert len(insights.top_merchants("all", limit=4, now=NOW)) == 4
+
+
+def test_top_merchants_fold_spelling_variants():
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    for i, description in enumerate(["Grocery Store", "GROCERY STORE #42", "grocery store", "Gas Station"]):
+        expense_repo.add(Transaction(amount=10, type=TransactionType.EXPENSE, category=TransactionCategory.FOOD,
+                                     description=description, date=NOW - timedelta(days=i)))
+    insights = InsightService(expense_repo, InMemoryTransactionRepository(TransactionType.INCOME))
+    rows = insights.top_merchants("all", limit=2, now=NOW)
+    assert [(r.key, r.total, r.count) for r in rows] == [("grocery store", 30, 3), ("gas station", 10, 1)]
+
+
+if __name__ == "__main__":
+    test_aggregate_tool_cuts_conversation_tokens()
+    test_insights_match_raw_scan()
+    test_top_merchants_fold_spelling_variants()
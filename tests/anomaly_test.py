@@ -0,0 +1,83 @@
+import os
+import statistics
+from datetime import datetime, timedelta
+from data.memory import InMemoryTransactionRepository
+from finance.anomaly import AnomalyDetector
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.services.ledger import LedgerService
+
+START = datetime(2026, 1, 1)
+
+
+def coffee(i, amount):
+    return Transaction(amount=amount, type=TransactionType.EXPENSE, category=TransactionCategory.FOOD,
+                       description="Corner  Coffee", date=START + timedelta(days=i))
+
+
+def test_welford_matches_batch_statistics():
+    amounts = [4.5, 5.0, 3.8, 4.2, 6.1, 5.5, 4.9]
+    detector = AnomalyDetector()
+    detector.rebuild(coffee(i, a) for i, a in enumerate(amounts))
+    stats = detector.stats_for("merchant:corner coffee")
+    assert stats.count == len(amounts)
+    assert abs(stats.mean - statistics.mean(amounts)) < 1e-12
+    assert abs(stats.std - statistics.stdev(amounts)) < 1e-12
+
+
+def test_record_expense_flags_outlier_and_state_survives_restart(tmp_path):
+    path = str(tmp_path / "anomaly.json")
+    detector = AnomalyDetector(path)
+    repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    ledger = LedgerService(repo, InMemoryTransactionRepository(TransactionType.INCOME), anomaly_detector=detector)
+
+    for i in range(10):
+        detector.observe(repo.add(coffee(i, 4 + (i % 3) * 0.5)))
+    ledger.record_expense(5.0, TransactionCategory.FOOD, "Corner Coffee")
+    assert ledger.last_anomalies == []
+    ledger.record_expense(85.0, TransactionCategory.FOOD, "Corner Coffee")
+    assert {a.key for a in ledger.last_anomalies} == {"category:food", "merchant:corner coffee"}
+    assert "Unusual" in ledger.last_anomalies[0].message
+
+    # A new process resumes from disk without touching the ledger
+    detector.flush()
+
+    def no_scan():
+        raise AssertionError("ledger should not be rescanned")
+    restored = AnomalyDetector.load_or_rebuild(path, no_scan)
+    assert restored.stats_for("category:food") == detector.stats_for("category:food")
+
+
+def test_rebuild_equals_incremental_updates():
+    txs = [coffee(i, 3 + (i * 7) % 11) for i in range(200)]
+    incremental = AnomalyDetector()
+    flagged = [a for tx in txs for a in incremental.observe(tx)]
+    rebuilt = AnomalyDetector.load_or_rebuild(None, lambda: iter(txs))
+    assert flagged == [] or all(abs(a.zscore) >= 3 for a in flagged)
+    for key in ("category:food", "merchant:corner coffee"):
+        a, b = incremental.stats_for(key), rebuilt.stats_for(key)
+        assert a.count == b.count and abs(a.mean - b.mean) < 1e-9 and abs(a.m2 - b.m2) < 1e-6
+
+
+def test_writes_are_batched_and_merged_across_processes(tmp_path):
+    path = str(tmp_path / "anomaly.json")
+    seed = [coffee(i, 4 + i % 3) for i in range(10)]
+    AnomalyDetector(path).rebuild(seed)
+    # Two processes resume from the same file
+    web, console = (AnomalyDetector.load_or_rebuild(path, list, save_interval=60) for _ in range(2))
+
+    mtime = os.stat(path).st_mtime_ns
+    web.observe(coffee(10, 5.0))
+    console.observe(coffee(11, 6.0))
+    console.observe(coffee(12, 7.0))
+    assert os.stat(path).st_mtime_ns == mtime
+
+    web.flush()
+    console.flush()
+    merged = AnomalyDetector.load_or_rebuild(path, list).stats_for("merchant:corner coffee")
+    expected = [tx.amount for tx in seed] + [5.0, 6.0, 7.0]
+    assert merged.count == len(expected)
+    assert abs(merged.mean - statistics.mean(expected)) < 1e-9
+    assert abs(merged.std - statistics.stdev(expected)) < 1e-9
+    # The last writer also picks up the other process's observations
+    assert console.stats_for("merchant:corner coffee").count == len(expected)
@@ -0,0 +1,88 @@
+import random
+import numpy as np
+from datetime import datetime, timedelta
+from data.memory import InMemoryTransactionRepository
+from finance.balance import BalanceIndex, FenwickTree
+from finance.ledger import Ledger
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.services.ledger import LedgerService
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def tx(day, amount, kind=TransactionType.EXPENSE):
+    category = TransactionCategory.INCOME if kind == TransactionType.INCOME else TransactionCategory.FOOD
+    return Transaction(type=kind, amount=amount, category=category, description="x", date=START + timedelta(days=day))
+
+
+def scan_balance(transactions, moment):
+    return sum(t.signed_amount for t in transactions if t.date.date() <= moment.date())
+
+
+def test_fenwick_matches_prefix_sums():
+    values = [random.Random(1).uniform(-5, 5) for _ in range(257)]
+    tree = FenwickTree.from_values(np.array(values))
+    tree.add(100, 3.0)
+    values[100] += 3.0
+    assert all(abs(tree.prefix(i) - sum(values[:i])) < 1e-9 for i in range(0, 258, 16))
+
+
+def test_balance_queries_and_back_dated_inserts():
+    rng = random.Random(7)
+    txs = [tx(rng.randrange(365), rng.uniform(1, 300), rng.choice(list(TransactionType))) for _ in range(500)]
+    index = Ledger(transactions=txs).balance_index
+
+    for day in (0, 45, 200, 364, 900):
+        moment = START + timedelta(days=day)
+        assert abs(index.balance_at(moment) - scan_balance(txs, moment)) < 1e-6
+    assert index.balance_at(START - timedelta(days=3)) == 0.0
+
+    # Back-dated, far-future and before-origin writes
+    for extra in (tx(10, 999), tx(800, 50, TransactionType.INCOME), tx(-40, 25)):
+        index.add(extra)
+        txs.append(extra)
+    for day in (-40, 10, 11, 500, 800):
+        moment = START + timedelta(days=day)
+        assert abs(index.balance_at(moment) - scan_balance(txs, moment)) < 1e-6
+
+    a, b = START + timedelta(days=30), START + timedelta(days=60)
+    expected = sum(t.signed_amount for t in txs if a.date() <= t.date.date() <= b.date())
+    assert abs(index.balance_between(a, b) - expected) < 1e-6
+
+    days, balances = index.curve(a, b)
+    assert len(days) == 31 and abs(balances[-1] - scan_balance(txs, b)) < 1e-6
+
+
+def test_ledger_service_keeps_shared_index_current():
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    income_repo = InMemoryTransactionRepository(TransactionType.INCOME)
+    index = BalanceIndex(source=lambda: expense_repo.list_all() + income_repo.list_all())
+    ledger = LedgerService(expense_repo, income_repo, balance_index=index)
+    ledger.record_income(1000, "Salary")
+    assert index.balance_at(datetime.now()) == 1000
+    ledger.record_expense(40, TransactionCategory.FOOD, "Lunch")
+    assert index.balance_at(datetime.now()) == 960
+
+
+class CountingSlots:
+    def __init__(self, slots):
+        self.slots = slots
+        self.reads = 0
+
+    def __getitem__(self, i):
+        self.reads += 1
+        return self.slots[i]
+
+
+def test_point_queries_are_logarithmic():
+    txs = [tx(d % 3650, 5.0) for d in range(50_000)]
+    index = BalanceIndex.from_transactions(txs)
+    slots = index._tree._tree = CountingSlots(index._tree._tree)
+    size = index._tree.size
+    for d in range(0, 3650, 10):
+        slots.reads = 0
+        index.balance_at(START + timedelta(days=d))
+        assert slots.reads <= size.bit_length()
+    moment = START + timedelta(days=1234)
+    assert abs(index.balance_at(moment) - scan_balance(txs, moment)) < 1e-6
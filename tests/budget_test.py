@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from data.memory import InMemoryBudgetRepository, InMemoryTransactionRepository
+from finance import budget
+from finance.budget import BudgetTracker, budget_drift, current_month, drift_matrix, month_key
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.services.ledger import LedgerService
+
+FOOD = TransactionCategory.FOOD
+
+
+class CountingRepo(InMemoryTransactionRepository):
+    def __init__(self):
+        super().__init__(TransactionType.EXPENSE)
+        self.aggregate_queries = 0
+
+    def totals_by_category(self, start_date=None, end_date=None):
+        self.aggregate_queries += 1
+        return super().totals_by_category(start_date, end_date)
+
+
+def setup():
+    expense_repo = CountingRepo()
+    expense_repo.add(Transaction(amount=50, type=TransactionType.EXPENSE, category=FOOD,
+                                 description="Old", date=datetime(2026, 1, 20)))
+    tracker = BudgetTracker(InMemoryBudgetRepository(), expense_repo)
+    ledger = LedgerService(expense_repo, InMemoryTransactionRepository(TransactionType.INCOME), tracker)
+    return expense_repo, tracker, ledger
+
+
+def test_writes_update_month_to_date_without_requerying():
+    expense_repo, tracker, ledger = setup()
+    month = datetime.now().strftime("%Y-%m")
+    tracker.set_budget(FOOD, month, 100)
+    assert expense_repo.aggregate_queries == 1
+
+    for _ in range(9):
+        tx = ledger.record_expense(10, FOOD, "Lunch")
+    status = tracker.status_for(FOOD, month)
+    assert status.actual == 90 and round(status.drift, 2) == -0.1
+    assert "nearly used" in tracker.alert_for(tx)
+
+    tx = ledger.record_expense(25, FOOD, "Dinner")
+    assert tracker.status_for(FOOD, month).overspent
+    assert "exceeded" in tracker.alert_for(tx)
+    assert expense_repo.aggregate_queries == 1
+
+
+def test_first_write_in_unloaded_month_is_not_double_counted():
+    expense_repo, tracker, ledger = setup()
+    ledger.record_expense(30, FOOD, "Groceries")
+    month = datetime.now().strftime("%Y-%m")
+    assert tracker.status_for(FOOD, month).actual == 30
+    assert tracker.status_for(FOOD, "2026-01").actual == 50
+
+
+def test_drift_report_matches_scalar_drift():
+    expense_repo, tracker, ledger = setup()
+    tracker.set_budget(FOOD, "2026-01", 40)
+    tracker.set_budget(TransactionCategory.TRANSPORT, "2026-02", 80)
+    categories, planned, actual, drift = tracker.drift_report(["2026-01", "2026-02"])
+
+    assert categories == [FOOD, TransactionCategory.TRANSPORT]
+    assert drift.shape == (2, 2)
+    expected = [[budget_drift(p, a) for p, a in zip(prow, arow)] for prow, arow in zip(planned, actual)]
+    assert np.allclose(drift, expected)
+    assert np.allclose(drift_matrix([0, 100], [5, 150]), [0, 0.5])
+
+
+def test_current_month_follows_stored_utc_dates(monkeypatch):
+    # 00:30 on Feb 1st at UTC+2 is still January in UTC, where transactions are stored
+    local = datetime(2026, 2, 1, 0, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return local
+
+    monkeypatch.setattr(budget, "datetime", Clock)
+    tx = Transaction(amount=30, type=TransactionType.EXPENSE, category=FOOD,
+                     description="Late dinner", date=local.astimezone(timezone.utc))
+
+    assert current_month() == month_key(tx) == "2026-01"
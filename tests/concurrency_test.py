@@ -0,0 +1,100 @@
+import asyncio
+import time
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from core.concurrency import AgentRunLimitMiddleware, Overloaded, RunLimiter, to_thread
+
+
+def test_limiter_queues_then_refuses():
+    limiter = RunLimiter(max_concurrent=2, max_queue=2, queue_timeout=0.2)
+    peak = 0
+
+    async def run(hold: float):
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(hold)
+
+    async def burst():
+        return await asyncio.gather(*(run(0.05) for _ in range(6)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    refused = [r for r in results if isinstance(r, Overloaded)]
+    assert peak == 2
+    # 2 running + 2 queued are admitted; the rest find the queue full
+    assert len(refused) == 2 and all(r.reason == "queue full" for r in refused)
+    assert limiter.stats.admitted == 4 and limiter.stats.max_wait > 0
+    assert limiter.in_flight == 0 and limiter.queued == 0
+
+    # A queued run that cannot get a slot in time gives up
+    slow = RunLimiter(max_concurrent=1, max_queue=5, queue_timeout=0.05)
+
+    async def starved():
+        return await asyncio.gather(run_with(slow, 0.3), run_with(slow, 0), return_exceptions=True)
+
+    _, second = asyncio.run(starved())
+    assert isinstance(second, Overloaded) and slow.stats.timed_out == 1
+
+
+async def run_with(limiter, hold):
+    async with limiter.slot():
+        await asyncio.sleep(hold)
+
+
+def test_blocking_work_does_not_stall_the_loop():
+    ticks = []
+
+    async def heartbeat():
+        for _ in range(10):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(heartbeat(), to_thread(time.sleep, 0.1))
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert max(gaps) < 0.05
+
+
+def test_middleware_sheds_load_with_503():
+    async def slow_run(request):
+        await asyncio.sleep(0.1)
+        return JSONResponse({"ok": True})
+
+    limiter = RunLimiter(max_concurrent=2, max_queue=3, queue_timeout=5)
+    app = Starlette()
+    app.add_route("/run", slow_run, methods=["POST"])
+    app.add_route("/run", slow_run, methods=["GET"])
+    app.add_middleware(AgentRunLimitMiddleware, limiter=limiter)
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            posts = await asyncio.gather(*(client.post("/run") for _ in range(10)))
+            get = await client.get("/run")
+        return posts, get
+
+    posts, get = asyncio.run(burst())
+    codes = sorted(r.status_code for r in posts)
+    assert codes.count(200) == 5 and codes.count(503) == 5
+    shed = next(r for r in posts if r.status_code == 503)
+    assert shed.headers["retry-after"] and shed.json()["reason"] == "queue full"
+    assert get.status_code == 200
+    snapshot = limiter.snapshot()
+    assert snapshot["rejected"] == 5 and snapshot["queue_depth"] == 0
+
+
+def test_load_endpoint_is_served_ahead_of_the_web_ui():
+    from app import app
+
+    async def fetch():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            return await client.get("/api/load")
+
+    response = asyncio.run(fetch())
+    assert response.status_code == 200
+    body = response.json()
+    assert {"in_flight", "queue_depth", "reads", "telemetry_queue_depth"} <= body.keys()
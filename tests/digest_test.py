@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timedelta
+from pydantic_ai.messages import ModelResponse, SystemPromptPart, TextPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent
+from core.dependencies import FinanceDependencies
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+
+
+class CountingRepository(InMemoryTransactionRepository):
+    def __init__(self, transaction_type):
+        super().__init__(transaction_type)
+        self.reads = 0
+
+    def totals_by_category(self, *args, **kwargs):
+        self.reads += 1
+        return super().totals_by_category(*args, **kwargs)
+
+
+def deps() -> FinanceDependencies:
+    now = datetime.now()
+    expense_repo = CountingRepository(TransactionType.EXPENSE)
+    income_repo = InMemoryTransactionRepository(TransactionType.INCOME)
+    for i, (amount, category) in enumerate([(40.0, TransactionCategory.FOOD), (25.0, TransactionCategory.TRANSPORT)]):
+        expense_repo.add(Transaction(type=TransactionType.EXPENSE, amount=amount, category=category,
+                                     description=f"Shop {i}", date=now - timedelta(minutes=i + 1)))
+    income_repo.add(Transaction(type=TransactionType.INCOME, amount=1000.0, category=TransactionCategory.INCOME,
+                                description="Salary", date=now - timedelta(minutes=30)))
+    return FinanceDependencies(expense_repo=expense_repo, income_repo=income_repo)
+
+
+def test_digest_is_rebuilt_only_when_the_ledger_changes():
+    d = deps()
+    first = d.ledger_digest()
+    assert "Net balance (all time): $935.00" in first
+    assert "- food: $40.00 (1 tx)" in first
+    reads = d.expense_repo.reads
+
+    assert d.ledger_digest() is first
+    assert d.expense_repo.reads == reads
+
+    d.ledger_service().record_expense(5.0, TransactionCategory.FOOD, "Coffee")
+    updated = d.ledger_digest()
+    assert "Net balance (all time): $930.00" in updated
+    assert "Coffee" in updated
+    assert d.expense_repo.reads > reads
+
+
+def test_digest_expires_and_failures_are_cached_briefly(monkeypatch):
+    # Writes from another process do not move this process's version token; the TTL bounds staleness
+    monkeypatch.setenv("LEDGER_DIGEST_TTL", "0")
+    d = deps()
+    d.ledger_digest()
+    reads = d.expense_repo.reads
+    d.ledger_digest()
+    assert d.expense_repo.reads > reads
+
+    def unreachable(*args, **kwargs):
+        d.expense_repo.reads += 1
+        raise ConnectionError("backend down")
+
+    monkeypatch.setattr(d.expense_repo, "totals_by_category", unreachable)
+    reads = d.expense_repo.reads
+    assert d.ledger_digest() == "" and d.ledger_digest() == ""
+    assert d.expense_repo.reads == reads + 1
+
+
+def test_snapshot_questions_finish_in_one_model_call():
+    calls = []
+
+    def respond(messages, info):
+        calls.append(messages)
+        snapshot = next(p.content for p in messages[0].parts
+                        if isinstance(p, SystemPromptPart) and p.content.startswith("LEDGER SNAPSHOT"))
+        balance = next(line for line in snapshot.splitlines() if line.startswith("Net balance"))
+        return ModelResponse(parts=[TextPart(balance)])
+
+    result = asyncio.run(finance_agent.run("What's my balance?", model=FunctionModel(respond), deps=deps()))
+    assert len(calls) == 1
+    assert result.output == "Net balance (all time): $935.00"
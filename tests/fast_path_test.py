@@ -0,0 +1,80 @@
+from finance.models.enums import TransactionType, TransactionCategory
+import threading
+
+from finance.services.fast_path import FastPathParser, FastPathService, FastPathStats, FAST_PATH_THRESHOLD
+from finance.services.ledger import LedgerService
+from data.memory import InMemoryTransactionRepository
+
+
+def test_parses_simple_expense_and_income():
+    lunch = FastPathParser.parse("I spent $15 on lunch")
+    assert (lunch.type, lunch.amount, lunch.category, lunch.description) == \
+        (TransactionType.EXPENSE, 15.0, TransactionCategory.FOOD, "lunch")
+    assert lunch.confidence >= FAST_PATH_THRESHOLD
+
+    rent = FastPathParser.parse("Paid $1,200.50 for rent")
+    assert (rent.amount, rent.category) == (1200.50, TransactionCategory.UTILITIES)
+
+    salary = FastPathParser.parse("Salary $5000 received")
+    assert (salary.type, salary.amount, salary.description) == (TransactionType.INCOME, 5000.0, "Salary")
+    assert salary.confidence >= FAST_PATH_THRESHOLD
+
+
+def test_ambiguous_messages_fall_back_to_agent():
+    for text in [
+        "How much did I spend on food?",
+        "I spent $15 on lunch and $20 on a taxi",
+        "Analyze my spending",
+        "Create a budget for a $6000 monthly income",
+        "I got paid $300 and paid $50 for gas",
+    ]:
+        assert FastPathParser.parse(text) is None, text
+    # Parsed, but not confident enough to skip the LLM
+    assert FastPathParser.parse("I spent $15 on a burger today").confidence < FAST_PATH_THRESHOLD
+
+
+def test_negated_future_and_dated_messages_fall_back_to_agent():
+    for text in [
+        "I didn't spend $15 on lunch",
+        "Do not pay $30 for netflix",
+        "I never paid $40 for that taxi",
+        "I am going to pay $50 for gas",
+        "I will spend $200 on rent next week",
+        "I spent $15 on lunch yesterday",
+        "I spent $15 on lunch last week",
+        "Paid $12 for parking on Monday",
+        "Paid $80 for groceries on 3/14",
+    ]:
+        assert FastPathParser.parse(text) is None, text
+    assert FastPathParser.parse("I spent $15 on lunch this morning").description == "lunch"
+
+
+def test_service_records_hits_and_tracks_stats():
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    income_repo = InMemoryTransactionRepository(TransactionType.INCOME)
+    stats = FastPathStats()
+    service = FastPathService(LedgerService(expense_repo, income_repo), stats=stats)
+
+    assert service.try_record("I spent $15 on lunch").id == 1
+    assert service.try_record("My salary of $5000 arrived today").amount == 5000
+    assert service.try_record("show my food expenses") is None
+
+    assert len(expense_repo.list_all()) == 1 and len(income_repo.list_all()) == 1
+    assert (stats.attempts, stats.hits) == (3, 2)
+
+
+def test_concurrent_services_share_stats_without_losing_counts():
+    stats = FastPathStats()
+    ledger = LedgerService(InMemoryTransactionRepository(TransactionType.EXPENSE),
+                           InMemoryTransactionRepository(TransactionType.INCOME))
+
+    def record():
+        for _ in range(200):
+            FastPathService(ledger, stats=stats).try_record("show my food expenses")
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert (stats.attempts, stats.hits) == (1600, 0)
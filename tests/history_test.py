@@ -0,0 +1,93 @@
+import asyncio
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, SystemPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from core.history import HistoryManager, SUMMARY_HEADER, append_turn, estimate_tokens
+
+REPORT = "2025-01-01 -$12.00 food Lunch\n" * 100
+
+
+def turn(i, first=False):
+    opener = [SystemPromptPart(content="You are a finance clerk.")] if first else []
+    return [
+        ModelRequest(parts=opener + [UserPromptPart(content=f"question {i}: show my history")]),
+        ModelResponse(parts=[ToolCallPart(tool_name="view_history", args={"limit": 100}, tool_call_id=f"c{i}")]),
+        ModelRequest(parts=[ToolReturnPart(tool_name="view_history", content=REPORT, tool_call_id=f"c{i}")]),
+        ModelResponse(parts=[TextPart(content=f"answer {i}: you spent $1200 on food")]),
+    ]
+
+
+def test_long_session_is_compacted_to_budget():
+    manager = HistoryManager(budget_tokens=1500, tool_output_chars=200)
+    history = turn(0, first=True)
+    sizes = []
+    for i in range(1, 40):
+        history = manager.compact(history + turn(i))
+        sizes.append(manager.last_stats.tokens_after)
+
+    assert max(sizes) <= 1500
+    assert manager.last_stats.tokens_before > manager.last_stats.tokens_after
+    # System prompt stays first, followed by the running summary of older turns
+    opener = history[0].parts
+    assert opener[0].content == "You are a finance clerk."
+    assert opener[1].content.startswith(SUMMARY_HEADER)
+    first_kept = int(opener[2].content.split()[1].rstrip(":"))
+    assert "question 0:" not in opener[1].content
+    assert opener[1].content.endswith(f"answer {first_kept - 1}: you spent $1200 on food")
+    # The newest turn is verbatim; answered tool output from older turns is stubbed
+    assert history[-2].parts[0].content == REPORT
+    stubs = [p for m in history[:-2] for p in m.parts if isinstance(p, ToolReturnPart)]
+    assert stubs and all("omitted" in p.content for p in stubs)
+
+
+def test_short_history_is_untouched():
+    manager = HistoryManager(budget_tokens=10_000, tool_output_chars=10_000)
+    history = turn(0, first=True) + turn(1)
+    assert manager.compact(history) == history
+    assert manager.last_stats.summarized_turns == 0
+
+
+def test_compacted_history_drives_a_real_run():
+    seen = []
+
+    def model(messages, info: AgentInfo) -> ModelResponse:
+        seen.append(estimate_tokens(messages))
+        return ModelResponse(parts=[TextPart(content="ok")])
+
+    agent = Agent(FunctionModel(model), system_prompt="You are a finance clerk.")
+    manager = HistoryManager(budget_tokens=1500, tool_output_chars=200)
+
+    async def run():
+        history = []
+        for i in range(30):
+            history = manager.compact(history + turn(i, first=not history))
+            result = await agent.run(f"follow-up {i}", message_history=history)
+            history = result.all_messages()
+
+    asyncio.run(run())
+    # Bounded by the budget plus the new prompt, instead of growing by a report per turn
+    assert max(seen) <= 1500 + 10
+    assert manager.last_stats.summarized_turns > 0
+
+
+def test_turns_answered_without_a_run_stay_in_history():
+    seen = []
+
+    def model(messages, info: AgentInfo) -> ModelResponse:
+        seen.extend(messages)
+        return ModelResponse(parts=[TextPart(content="ok")])
+
+    agent = Agent(FunctionModel(model), system_prompt="You are a finance clerk.")
+
+    async def run():
+        opener = await agent.system_prompt_parts()
+        history = append_turn([], "I spent $15 on lunch", "Recorded $15.00 under food.", opener)
+        history = append_turn(history, "What's my balance?", "Net balance: $985.00")
+        await agent.run("Undo the lunch", message_history=history)
+
+    asyncio.run(run())
+    texts = [p.content for m in seen for p in m.parts if hasattr(p, "content")]
+    assert texts == ["You are a finance clerk.", "I spent $15 on lunch", "Recorded $15.00 under food.",
+                     "What's my balance?", "Net balance: $985.00", "Undo the lunch"]
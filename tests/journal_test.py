@@ -0,0 +1,210 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from data.journal import WriteBehindRepository, WriteJournal
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.ledger import Ledger
+from finance.services.ledger import LedgerService
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def expense(i, category=TransactionCategory.FOOD, description=None):
+    return Transaction(
+        type=TransactionType.EXPENSE, amount=1.0 + i, category=category,
+        description=description or f"Snack {i}", date=START + timedelta(days=i)
+    )
+
+
+class SlowRepository(InMemoryTransactionRepository):
+    """
+    In-memory store that behaves like a remote one: each call costs a round trip and can be taken offline.
+    """
+    def __init__(self, latency: float = 0.02):
+        super().__init__(TransactionType.EXPENSE)
+        self.latency = latency
+        self.offline = False
+        self.inserts = 0
+
+    def add(self, tx):
+        time.sleep(self.latency)
+        return super().add(tx)
+
+    def add_many(self, transactions):
+        if self.offline:
+            raise ConnectionError("network unreachable")
+        time.sleep(self.latency)
+        self.inserts += 1
+        return [InMemoryTransactionRepository.add(self, tx) for tx in transactions]
+
+
+def service(repo):
+    return LedgerService(repo, InMemoryTransactionRepository(TransactionType.INCOME))
+
+
+def test_writes_are_local_and_flushed_in_batches(tmp_path):
+    remote = SlowRepository()
+    repo = WriteBehindRepository(remote, WriteJournal(str(tmp_path / "expenses.jsonl")), interval=0.05)
+    ledger = service(repo)
+
+    started = time.perf_counter()
+    for i in range(20):
+        ledger.record_expense(10.0 + i, TransactionCategory.FOOD, f"Lunch {i}")
+    journaled = time.perf_counter() - started
+
+    started = time.perf_counter()
+    direct = service(SlowRepository())
+    for i in range(20):
+        direct.record_expense(10.0 + i, TransactionCategory.FOOD, f"Lunch {i}")
+    synchronous = time.perf_counter() - started
+
+    assert journaled < synchronous
+
+    assert repo.flush(timeout=5)
+    assert len(remote.list_all()) == 20
+    assert remote.inserts < 20
+    repo.close()
+
+
+def test_reads_include_pending_writes(tmp_path):
+    remote = SlowRepository(latency=0)
+    remote.add(expense(4, TransactionCategory.TRANSPORT, "Bus fare"))
+    repo = WriteBehindRepository(remote, WriteJournal(str(tmp_path / "expenses.jsonl")), start=False)
+    version = repo.version
+
+    service(repo).record_expense(42.0, TransactionCategory.FOOD, "Corner Bakery")
+    assert repo.version > version
+    assert repo.list_recent(1)[0].description == "Corner Bakery"
+    assert repo.total_amount() == 42.0 + 5.0
+    assert {r.key: r.count for r in repo.totals_by_category()}["food"] == 1
+    assert repo.search_description("bakery", 5)[0].amount == 42.0
+    assert [t.description for t in repo.list_by_category(TransactionCategory.FOOD)] == ["Corner Bakery"]
+
+    # Once flushed the row is served by the inner store alone, not twice
+    repo.flush_once()
+    assert repo.pending_count == 0
+    assert len(repo.list_all()) == 2
+    repo.close()
+
+
+def test_pending_rows_merge_with_timezone_aware_stored_rows(tmp_path):
+    # Stored rows come back from Supabase timezone-aware
+    remote = SlowRepository(latency=0)
+    remote.add(expense(0).model_copy(update={"date": datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)}))
+    repo = WriteBehindRepository(remote, WriteJournal(str(tmp_path / "expenses.jsonl")), start=False)
+    ledger = LedgerService(repo, InMemoryTransactionRepository(TransactionType.INCOME))
+
+    ledger.record_expense(12.0, TransactionCategory.FOOD, "Corner Bakery")
+    # Callers that build naive rows themselves (seeder, imports) are normalized too
+    repo.add(expense(3))
+    assert all(t.date.tzinfo is not None for _, t in repo.journal.pending())
+
+    history = ledger.get_transaction_history()
+    assert [t.description for t in history][0] == "Corner Bakery"
+    merged = Ledger(transactions=history)
+    assert [t.amount for t in merged.timeline] == [1.0, 4.0, 12.0]
+    assert len(merged.columns.amounts) == 3
+    repo.close()
+
+
+def test_writes_survive_an_outage_and_a_restart(tmp_path):
+    path = str(tmp_path / "expenses.jsonl")
+    remote = SlowRepository(latency=0)
+    remote.offline = True
+    repo = WriteBehindRepository(remote, WriteJournal(path), start=False)
+    for i in range(3):
+        repo.add(expense(i))
+    assert not repo.flush_once()
+    assert repo.last_error == "network unreachable"
+    repo.journal.close()
+
+    # Process restarts while still offline: the journal is replayed
+    restarted = WriteBehindRepository(remote, WriteJournal(path), start=False)
+    assert restarted.pending_count == 3
+    assert len(restarted.list_all()) == 3
+
+    remote.offline = False
+    restarted.start()
+    assert restarted.flush(timeout=5)
+    assert sorted(t.amount for t in remote.list_all()) == [1.0, 2.0, 3.0]
+    assert WriteJournal(path).pending() == []
+    restarted.close()
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    path = tmp_path / "expenses.jsonl"
+    journal = WriteJournal(str(path))
+    journal.append(expense(0))
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"tx": {}}\n{"seq": "x", "tx": {}}\n')
+        f.write('{"seq": 2, "tx": {"amou')
+    assert [t.amount for _, t in WriteJournal(str(path)).pending()] == [1.0]
+
+
+class HangingRepository(SlowRepository):
+    """
+    Bulk inserts block until released, like a Supabase call stuck on the network.
+    """
+    def __init__(self):
+        super().__init__(latency=0)
+        self.release = threading.Event()
+        self.sending = threading.Event()
+
+    def add_many(self, transactions):
+        self.sending.set()
+        self.release.wait()
+        return super().add_many(transactions)
+
+
+def test_reads_do_not_wait_for_a_hanging_flush(tmp_path):
+    remote = HangingRepository()
+    remote.add(expense(9, description="Stored"))
+    repo = WriteBehindRepository(remote, WriteJournal(str(tmp_path / "expenses.jsonl")), interval=0.01)
+    repo.add(expense(0))
+    assert remote.sending.wait(5)
+
+    started = time.perf_counter()
+    rows = repo.list_all()
+    assert time.perf_counter() - started < 1
+    # The stuck batch is left out rather than risk counting it twice
+    assert [t.description for t in rows] == ["Stored"]
+
+    remote.release.set()
+    assert repo.flush(timeout=5)
+    assert repo.total_amount() == 10.0 + 1.0
+    repo.close()
+
+
+def test_reads_never_count_a_landing_batch_twice(tmp_path):
+    remote = SlowRepository(latency=0.002)
+    repo = WriteBehindRepository(remote, WriteJournal(str(tmp_path / "expenses.jsonl")), batch_size=5, interval=0)
+    done = threading.Event()
+    seen = []
+
+    def reader():
+        while not done.is_set():
+            seen.append((len(repo.list_all()), repo.pending_count))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(60):
+        repo.add(expense(i))
+    assert repo.flush(timeout=10)
+    done.set()
+    thread.join()
+    assert all(count <= 60 for count, _ in seen)
+    assert len(repo.list_all()) == 60
+    repo.close()
+
+
+def test_concurrent_writers_each_move_the_version(tmp_path):
+    repo = WriteBehindRepository(SlowRepository(latency=0), WriteJournal(str(tmp_path / "expenses.jsonl")), start=False)
+    version = repo.version
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: repo.add(expense(i)), range(200)))
+    assert repo.version == version + 200
+
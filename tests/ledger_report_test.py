@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from finance.models.transaction import Transaction
+from finance.models.enums import TransactionType, TransactionCategory
+from finance.services.ledger import LedgerService, CHARS_PER_TOKEN
+
+
+def make_history(n: int):
+    start = datetime(2026, 1, 1)
+    txs = [
+        Transaction(
+            amount=10.0,
+            type=TransactionType.EXPENSE,
+            category=TransactionCategory.FOOD,
+            description=f"Lunch {i}",
+            date=start + timedelta(days=i)
+        )
+        for i in range(n)
+    ]
+    txs.append(Transaction(
+        amount=500.0,
+        type=TransactionType.INCOME,
+        category=TransactionCategory.INCOME,
+        description="Salary",
+        date=start
+    ))
+    return txs
+
+
+def test_report_pages_rows_but_totals_cover_everything():
+    service = LedgerService(None, None)
+    report = service.format_history_report(None, make_history(100), limit=5, offset=10)
+
+    assert report.count("| food") == 5
+    assert "Lunch 10" in report and "Lunch 15" not in report
+    assert "SHOWING 5 OF 101 ROWS (offset 10)" in report
+    assert "86 older rows truncated by row limit; use offset=15" in report
+    assert "TOTAL SPENDING: $   1000.00" in report
+    assert "TOTAL INCOME:   $    500.00" in report
+
+
+def test_report_respects_token_budget():
+    service = LedgerService(None, None)
+    max_tokens = 300
+    report = service.format_history_report(None, make_history(5000), limit=5000, max_tokens=max_tokens)
+
+    assert len(report) <= max_tokens * CHARS_PER_TOKEN
+    assert "truncated by token budget" in report
+    assert "NET FLOW:       $ -49500.00" in report
+
+
+def test_small_report_has_no_truncation_summary():
+    service = LedgerService(None, None)
+    report = service.format_history_report(TransactionCategory.FOOD, make_history(3)[:3])
+
+    assert "SHOWING" not in report
+    assert report.startswith("=" * 40 + "\nLEDGER REPORT: FOOD")
@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from finance.ledger import Ledger
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+
+NOW = datetime(2026, 3, 15, 12, 0)
+
+
+def build(n: int, tz=None) -> Ledger:
+    rng = random.Random(3)
+    return Ledger(transactions=[
+        Transaction(
+            type=TransactionType.INCOME if i % 10 == 0 else TransactionType.EXPENSE,
+            amount=rng.uniform(1, 500),
+            category=TransactionCategory.INCOME if i % 10 == 0 else TransactionCategory.FOOD,
+            description="x",
+            date=(NOW - timedelta(minutes=rng.randrange(5 * 365 * 24 * 60))).replace(tzinfo=tz)
+        )
+        for i in range(n)
+    ])
+
+
+def test_slice_matches_linear_filter_and_is_a_view():
+    ledger = build(2000)
+    start, end = NOW - timedelta(days=90), NOW - timedelta(days=30)
+    window = ledger.slice(start, end)
+    expected = sorted((t for t in ledger.transactions if start <= t.date <= end), key=lambda t: t.date)
+
+    assert list(window) == expected
+    assert abs(window.outflow - sum(t.amount for t in expected if t.type == TransactionType.EXPENSE)) < 1e-6
+    assert window.columns.amounts.base is ledger.columns.amounts
+    assert list(window[5:10]) == expected[5:10] and window[-1] == expected[-1]
+    assert len(ledger.slice(NOW + timedelta(days=1))) == 0
+    assert len(ledger.last_days(30, now=NOW)) == sum(1 for t in ledger.transactions if t.date >= NOW - timedelta(days=30))
+
+
+def test_naive_bounds_on_timezone_aware_rows():
+    ledger = build(100, tz=timezone.utc)
+    assert len(ledger.slice(NOW.replace(tzinfo=None) - timedelta(days=365))) > 0
+
+
+def test_naive_local_and_aware_rows_share_one_timeline(monkeypatch):
+    # Naive dates are local time; under UTC-5 treating them as UTC would shift them by five hours
+    monkeypatch.setenv("TZ", "EST+05")
+    time.tzset()
+    try:
+        def tx(amount, date):
+            return Transaction(type=TransactionType.EXPENSE, amount=amount, category=TransactionCategory.FOOD,
+                               description="x", date=date)
+
+        ledger = Ledger(transactions=[
+            tx(1.0, datetime(2026, 3, 15, 10, 0)),                       # 15:00 UTC
+            tx(2.0, datetime(2026, 3, 15, 14, 0, tzinfo=timezone.utc)),
+            tx(3.0, datetime(2026, 3, 15, 12, 0)),                       # 17:00 UTC
+        ])
+        assert [t.amount for t in ledger.timeline] == [2.0, 1.0, 3.0]
+        # 11:00 local is 16:00 UTC: only the 10:00 local and 14:00 UTC rows are at or before it
+        assert [t.amount for t in ledger.slice(end=datetime(2026, 3, 15, 11, 0))] == [2.0, 1.0]
+        assert [t.amount for t in ledger.slice(start=datetime(2026, 3, 15, 15, 30, tzinfo=timezone.utc))] == [3.0]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_bisect_slicing_beats_linear_filter():
+    ledger = build(100_000)
+    ledger.slice().columns  # build the time index once, as the dashboard does on first render
+    windows = [(NOW - timedelta(days=d), NOW) for d in (30, 90, 365)] * 20
+
+    start = time.perf_counter()
+    for lo, hi in windows:
+        linear = [t for t in ledger.transactions if lo <= t.date <= hi]
+        sum(t.amount for t in linear if t.type == TransactionType.EXPENSE)
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for lo, hi in windows:
+        ledger.slice(lo, hi).outflow
+    slice_time = time.perf_counter() - start
+
+    assert slice_time * 20 < linear_time
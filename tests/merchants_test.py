@@ -0,0 +1,31 @@
+from datetime import datetime
+from finance.ledger import Ledger
+from finance.merchants import MerchantRegistry, canonical_merchant, merchants
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.services.advisor import AdvisorService
+
+
+def test_variants_share_one_interned_name_and_id():
+    variants = ["Grocery Store", "GROCERY STORE #42", "grocery  store", "POS DEBIT Grocery Store 11/02"]
+    names = [canonical_merchant(v) for v in variants]
+    assert all(n is names[0] for n in names)
+    registry = MerchantRegistry()
+    assert {registry.id_for(v) for v in variants} == {0}
+    assert registry.id_for("NETFLIX.COM 12/03") == 1 and registry.name(1) == "netflix"
+    assert canonical_merchant("AMZN Mktp US*2K3L") == "amazon"
+
+
+def test_columnar_ledger_and_advisor_group_on_merchant_ids():
+    txs = [
+        Transaction(type=TransactionType.EXPENSE, amount=a, category=TransactionCategory.FOOD, description=d, date=datetime(2026, 1, i + 1))
+        for i, (d, a) in enumerate([("Grocery Store", 50), ("GROCERY STORE #42", 70), ("Corner Cafe", 20)])
+    ]
+    columns = Ledger(transactions=txs).columns
+    assert columns.merchants.dtype.itemsize == 4
+    ids, totals, counts = columns.expenses_by_merchant()
+    assert merchants.name(int(ids[0])) == "grocery store" and totals[0] == 120 and counts[0] == 2
+
+    report = AdvisorService.analyze_spending(txs)
+    assert report.merchants == {"grocery store": 120, "corner cafe": 20}
+    assert "Grocery Store" in report.recommendations[1]
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent
+from core.dependencies import FinanceDependencies
+from core.metrics import MetricsRegistry, metrics
+from data.database import SupabaseExpenseRepository
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionType
+
+
+def test_histogram_quantiles_are_accurate_with_bounded_memory():
+    registry = MetricsRegistry()
+    latency = registry.histogram("request_seconds", "Latency.", ("route",))
+    # 1 ms .. 10 s, 100k samples
+    for i in range(1, 100_001):
+        latency.observe(i / 10_000, route="/api")
+
+    stats = latency.stats(route="/api")
+    assert stats["count"] == 100_000
+    for q, expected in ((50, 5.0), (90, 9.0), (99, 9.9)):
+        assert abs(stats[f"p{q}"] - expected) / expected < 0.03
+    # Memory depends on the value range, not the sample count
+    assert len(latency._series[("/api",)].buckets) < 16 * 15
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("rows_total", "Rows read.", ("table",)).inc(3, table='ex"penses')
+    registry.gauge("queue_depth", "Queued runs.").set_function(lambda: 7)
+    registry.histogram("wait_seconds", "Wait.").observe(0.25)
+    registry.counter("unused_total", "Never incremented.")
+
+    text = registry.render()
+    assert '# TYPE rows_total counter\nrows_total{table="ex\\"penses"} 3.0' in text
+    assert "queue_depth 7.0" in text
+    assert '# TYPE wait_seconds summary\nwait_seconds{quantile="0.5"} 0.25' in text
+    assert "wait_seconds_count 1.0" in text
+    assert "unused_total" not in text
+    # Re-registering returns the same metric
+    assert registry.counter("rows_total", "Rows read.", ("table",)).value(table='ex"penses') == 3
+
+
+class FakeSupabase:
+    """
+    Query builder whose every call returns itself; execute() returns canned rows.
+    """
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return SimpleNamespace(data=self.rows)
+
+
+def test_agent_and_repository_activity_is_recorded():
+    def respond(messages, info):
+        if isinstance(messages[-1].parts[-1], ToolReturnPart):
+            return ModelResponse(parts=[TextPart("Nothing yet.")])
+        return ModelResponse(parts=[ToolCallPart("recent_transactions", {"n": 3})])
+
+    deps = FinanceDependencies(
+        expense_repo=InMemoryTransactionRepository(TransactionType.EXPENSE),
+        income_repo=InMemoryTransactionRepository(TransactionType.INCOME)
+    )
+    tool_calls = metrics.get("tool_call_seconds").stats(tool="recent_transactions")["count"]
+    asyncio.run(finance_agent.run("latest?", model=FunctionModel(respond), deps=deps))
+    assert metrics.get("tool_call_seconds").stats(tool="recent_transactions")["count"] == tool_calls + 1
+    llm = metrics.get("llm_request_seconds").stats(agent="finance_agent", model="function:respond:")
+    assert llm["count"] >= 2
+    assert metrics.get("llm_tokens_total").value(agent="finance_agent", model="function:respond:", kind="input") > 0
+
+    repo = SupabaseExpenseRepository()
+    rows = [{"id": i, "amount": 10.0, "category": "food", "description": "lunch", "date": "2026-01-02T12:00:00Z"}
+            for i in range(500)]
+    repo.supabase = FakeSupabase(rows)
+    assert len(repo.list_all()) == 500
+    assert metrics.get("repository_rows").stats(table="expenses", op="list_all")["max"] == 500
+    assert metrics.get("repository_rows_mapped_total").value(table="expenses") >= 500
+    assert metrics.get("repository_map_rows_per_second").value(table="expenses") > 0
+
+    text = metrics.render()
+    for name in ("repository_request_seconds", "tool_call_seconds", "llm_tokens_total", "cache_hit_ratio"):
+        assert f"# TYPE {name} " in text
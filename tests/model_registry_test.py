@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.model_registry import ModelRegistry
+from core.metrics import cache_hit_ratio, cache_hits, cache_misses
+from core.settings import settings, model_registry
+
+
+def test_models_are_memoized_per_configuration(monkeypatch):
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11434/v1")
+    monkeypatch.setenv("OLLAMA_MODEL", "llama3.2")
+    first = settings.get_model("ollama")
+    assert settings.get_model("ollama") is first
+
+    monkeypatch.setenv("OLLAMA_MODEL", "qwen2.5")
+    other = settings.get_model("ollama")
+    assert other is not first
+    # Different models of one provider share a single pooled HTTP client
+    assert other.client._client is first.client._client is model_registry.http_client("ollama")
+
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://gpu-box:11434/v1")
+    assert settings.get_model("ollama") is not other
+
+
+def test_setup_overhead_removed(monkeypatch):
+    monkeypatch.setenv("OLLAMA_MODEL", "registry-bench")
+    started = time.perf_counter()
+    settings.get_model("ollama")
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(100):
+        settings.get_model("ollama")
+    warm = (time.perf_counter() - started) / 100
+
+    assert warm < cold
+    assert model_registry.stats.saved_seconds > 0
+
+
+def test_concurrent_builds_converge_on_one_instance():
+    registry = ModelRegistry()
+    built = []
+
+    def factory():
+        time.sleep(0.01)
+        built.append(object())
+        return built[-1]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        models = list(pool.map(lambda _: registry.get(("p", "m"), factory), range(16)))
+    assert len({id(m) for m in models}) == 1
+    assert len(registry) == 1
+    assert registry.stats.hits + registry.stats.misses == 16
+    assert registry.stats.builds == registry.stats.misses == len(built)
+
+
+def test_model_cache_metrics_report_lookups(monkeypatch):
+    monkeypatch.setenv("OLLAMA_MODEL", "registry-metrics")
+    settings.get_model("ollama")
+    settings.get_model("ollama")
+    stats = model_registry.stats
+    assert cache_hits.value(cache="model") == stats.hits
+    assert cache_misses.value(cache="model") == stats.misses
+    assert cache_hit_ratio.value(cache="model") == stats.hits / (stats.hits + stats.misses)
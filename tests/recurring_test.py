@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from data.memory import InMemoryTransactionRepository
+from finance.ledger import Ledger
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.periods import as_utc
+from finance.recurring import RecurringDetector
+from finance.services.ledger import LedgerService
+
+START = datetime(2026, 1, 3)
+
+
+def expense(description, amount, date, category=TransactionCategory.ENTERTAINMENT):
+    return Transaction(type=TransactionType.EXPENSE, amount=amount, category=category, description=description, date=date)
+
+
+def monthly(description, amount, months, jitter=0.0):
+    return [expense(description, amount * (1 + jitter * (-1) ** i), START + timedelta(days=30 * i + i % 2)) for i in range(months)]
+
+
+def test_detects_monthly_weekly_and_ignores_one_offs():
+    txs = monthly("Streaming Services", 45, 6) + monthly("Housing Rent #88", 1800, 6, jitter=0.09)
+    txs += [expense("Gym", 15, START + timedelta(weeks=w), TransactionCategory.HEALTHCARE) for w in range(10)]
+    txs += [expense("New Headphones", 250, START + timedelta(days=40), TransactionCategory.SHOPPING)]
+    subs = {s.merchant: s for s in RecurringDetector.from_transactions(txs).subscriptions()}
+
+    assert set(subs) == {"streaming services", "housing rent", "gym"}
+    assert subs["gym"].period == "weekly" and subs["streaming services"].period == "monthly"
+    assert subs["housing rent"].occurrences == 6
+    assert abs(subs["streaming services"].monthly_cost - 45) < 2
+    assert subs["gym"].next_charge == as_utc(START + timedelta(weeks=10))
+
+
+def test_incremental_updates_only_retest_new_merchants():
+    repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    for tx in monthly("Streaming Services", 45, 2):
+        repo.add(tx)
+    detector = RecurringDetector(source=repo.list_all)
+    assert detector.subscriptions() == []
+
+    ledger = LedgerService(repo, InMemoryTransactionRepository(TransactionType.INCOME), recurring_detector=detector)
+    third = START + timedelta(days=60)
+    detector.add(repo.add(expense("Streaming Services", 45, third)))
+    assert [s.merchant for s in detector.subscriptions()] == ["streaming services"]
+    assert detector._dirty == set()
+    ledger.record_expense(9.99, TransactionCategory.SHOPPING, "Coffee")
+    assert len(detector._dirty) == 1
+
+
+def test_recording_next_to_timezone_aware_source_rows():
+    # Rows loaded from Supabase are timezone-aware
+    repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    recent = datetime.now(timezone.utc) - timedelta(days=90)
+    for i in range(3):
+        repo.add(expense("Streaming Services", 45, recent + timedelta(days=30 * i)))
+    detector = RecurringDetector(source=repo.list_all)
+    assert [s.merchant for s in detector.subscriptions()] == ["streaming services"]
+
+    ledger = LedgerService(repo, InMemoryTransactionRepository(TransactionType.INCOME), recurring_detector=detector)
+    ledger.record_expense(45, TransactionCategory.ENTERTAINMENT, "Streaming Services")
+    # A naive row from an older caller joins the same series
+    detector.add(expense("Streaming Services", 45, datetime.now() + timedelta(days=30)))
+    assert detector.subscriptions()[0].occurrences == 5
+    assert detector.monthly_commitments(datetime.now()) > 0
+
+
+def test_runway_uses_active_commitments():
+    now = datetime.now()
+    # A subscription that started three months ago should count fully, not averaged over a year of history
+    txs = [expense("Old Laptop", 1200, now - timedelta(days=360), TransactionCategory.SHOPPING)]
+    txs += [expense("Cloud Storage", 100, now - timedelta(days=30 * i)) for i in range(3)]
+    txs += [Transaction(type=TransactionType.INCOME, amount=6000, category=TransactionCategory.INCOME,
+                        description="Salary", date=now - timedelta(days=5))]
+    ledger = Ledger(transactions=txs)
+
+    assert abs(ledger.recurring_commitments - 100 * 30.44 / 30) < 1
+    assert ledger.projected_burn_rate > ledger.average_burn_rate
+    assert ledger.financial_runway == ledger.net_cashflow / ledger.projected_burn_rate
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+from agents.finance import finance_agent, finance_toolset, try_fast_path, READ_ONLY_TOOLS
+from core.cache import AgentResponseCache, AnswerShortcuts, CachedResult, run_cached
+from core.streaming import AgentStream
+from core.dependencies import FinanceDependencies
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionType
+
+
+def counting_model(calls: list) -> FunctionModel:
+    """
+    Routes 'spent' prompts to add_expense and everything else to spending_summary.
+    """
+    def respond(messages, info):
+        calls.append(1)
+        last = messages[-1].parts[-1]
+        if isinstance(last, ToolReturnPart):
+            return ModelResponse(parts=[TextPart(f"Answer: {last.content[:30]}")])
+        prompt = messages[-1].parts[-1].content
+        if "spent" in prompt:
+            return ModelResponse(parts=[ToolCallPart("add_expense", {"amount": 12, "category": "food", "description": "lunch"})])
+        return ModelResponse(parts=[ToolCallPart("spending_summary", {"period": "all"})])
+    return FunctionModel(respond)
+
+
+def make_deps() -> FinanceDependencies:
+    return FinanceDependencies(
+        expense_repo=InMemoryTransactionRepository(TransactionType.EXPENSE),
+        income_repo=InMemoryTransactionRepository(TransactionType.INCOME)
+    )
+
+
+def test_read_only_answers_are_cached_until_a_write():
+    calls, deps, cache = [], make_deps(), AgentResponseCache()
+    model = counting_model(calls)
+
+    async def ask(prompt):
+        return await run_cached(finance_agent, prompt, deps=deps, model=model, cache=cache, read_only_tools=READ_ONLY_TOOLS)
+
+    first = asyncio.run(ask("Analyze my spending"))
+    second = asyncio.run(ask("  analyze MY spending!  "))
+    assert isinstance(second, CachedResult) and second.output == first.output
+    assert len(calls) == 2 and cache.stats.hits == 1
+
+    asyncio.run(ask("I spent $12 on lunch"))
+    assert cache.stats.invalidations == 1 and len(cache) == 0
+
+    third = asyncio.run(ask("Analyze my spending"))
+    assert not isinstance(third, CachedResult)
+    assert "12.00" in third.output
+    assert cache.stats.hit_rate == 1 / 4
+
+
+def test_web_router_shortcuts_skip_the_model():
+    calls, deps, cache = [], make_deps(), AgentResponseCache()
+    router = Agent(
+        counting_model(calls), name="router", deps_type=FinanceDependencies, toolsets=[finance_toolset],
+        capabilities=[AnswerShortcuts(try_fast_path, READ_ONLY_TOOLS, cache=cache)]
+    )
+
+    async def stream(prompt):
+        # The web UI streams its runs
+        run = AgentStream(router, prompt, deps=deps)
+        async for _ in run:
+            pass
+        return run.result
+
+    def chat(prompt, history=None):
+        return router.run(prompt, deps=deps, message_history=history)
+
+    fast = asyncio.run(stream("I spent $15 on lunch"))
+    assert calls == [] and "15" in fast.output
+    assert len(deps.expense_repo.list_all()) == 1
+
+    first = asyncio.run(chat("Show my spending summary"))
+    assert len(calls) == 2
+    again = asyncio.run(chat("show my spending summary!"))
+    assert len(calls) == 2 and again.output == first.output
+
+    # Follow-ups depend on the conversation: never answered from the cache
+    asyncio.run(chat("Show my spending summary", history=first.all_messages()))
+    assert len(calls) == 4
+
+
+def test_lru_and_ttl_eviction():
+    cache = AgentResponseCache(max_entries=2, ttl_seconds=0.05)
+    for i in range(3):
+        cache.put(("k", i), i)
+    assert cache.get(("k", 0)) is None and cache.get(("k", 2)) == 2
+    assert cache.stats.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get(("k", 2)) is None
+    assert cache.stats.evictions == 2
@@ -0,0 +1,61 @@
+import statistics
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from finance.ledger import Ledger
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.risk import concentration_hhi, rolling_risk
+from finance.columnar import CATEGORIES
+
+START = datetime(2026, 1, 1)
+FOOD = CATEGORIES.index(TransactionCategory.FOOD)
+
+
+def tx(day, amount, category=TransactionCategory.FOOD, kind=TransactionType.EXPENSE):
+    return Transaction(type=kind, amount=amount, category=category, description="x", date=START + timedelta(days=day))
+
+
+def test_rolling_metrics_match_scalar_definitions():
+    txs = [tx(d, 10 + d % 7) for d in range(60)] + [tx(d, 40, TransactionCategory.TRANSPORT) for d in range(0, 60, 5)]
+    txs.append(tx(0, 500, TransactionCategory.INCOME, TransactionType.INCOME))
+    ledger = Ledger(transactions=txs)
+    risk = rolling_risk(ledger.columns, windows=(30,))[30]
+
+    assert len(risk) == 60
+    food_last_30 = [10 + d % 7 for d in range(30, 60)]
+    assert np.isclose(risk.volatility[-1, FOOD], statistics.stdev(food_last_30))
+    assert np.isclose(risk.burn_rate[-1, FOOD], sum(food_last_30))
+    transport_last_30 = 40 * 6
+    assert np.isclose(risk.hhi[-1], concentration_hhi([sum(food_last_30), transport_last_30]))
+    # Balance peaks at day 0 and only falls afterwards
+    balance = np.cumsum(ledger.columns.daily_net())
+    assert np.isclose(risk.drawdown[-1], balance[-1] - balance.max())
+    assert risk.max_drawdown[-1] == risk.drawdown[-1]
+
+
+def test_burn_trend_detects_rising_spend():
+    ledger = Ledger(transactions=[tx(d, 1 + d) for d in range(120)])
+    risk = rolling_risk(ledger.columns, windows=(30, 90))
+    # Daily spend grows by $1/day, so a 30-day burn rate grows ~$30 per 30 days
+    assert np.isclose(risk[30].burn_trend[-1, FOOD], 900, rtol=0.01)
+    assert risk[90].latest_by_category()["food"]["burn_trend"] > 0
+
+
+def test_large_ledger_running_sums_match_direct_windows():
+    rng = np.random.default_rng(1)
+    cats = [c for c in TransactionCategory if c != TransactionCategory.INCOME]
+    txs = [tx(int(d), float(a), cats[int(c)]) for d, a, c in zip(
+        rng.integers(0, 3 * 365, 50_000), rng.uniform(1, 200, 50_000), rng.integers(0, len(cats), 50_000))]
+    columns = Ledger(transactions=txs).columns
+
+    risk = rolling_risk(columns, windows=(7, 30, 90, 365))
+    assert all(len(r) == columns.day_range().size for r in risk.values())
+    # Running sums over three years must not drift from a direct computation of the same window
+    daily = columns.daily_expenses_by_category()
+    for window, r in risk.items():
+        for day in (window - 1, len(daily) // 2, len(daily) - 1):
+            direct = daily[day - window + 1:day + 1]
+            assert np.allclose(r.volatility[day], direct.std(axis=0, ddof=1))
+    assert np.allclose(risk[30].burn_rate[-1], daily[-30:].sum(axis=0))
@@ -0,0 +1,35 @@
+import numpy as np
+from finance.scenarios import ScenarioBaseline, run_scenarios, INCOME_AXIS, FIXED_COST_AXIS
+
+BASELINE = ScenarioBaseline(monthly_income=5000.0, monthly_spend={"food": 800.0, "housing": 2000.0, "shopping": 400.0}, balance=12000.0)
+
+
+def scalar_savings_rate(food_cut, shop_cut, income_change, extra):
+    spend = 3200.0 - 800.0 * food_cut - 400.0 * shop_cut + extra
+    income = 5000.0 * (1 + income_change)
+    return (income - spend) / income
+
+
+def test_grid_matches_scalar_formula():
+    grid = run_scenarios(
+        BASELINE,
+        category_cuts={"food": np.linspace(0, 0.5, 11), "shopping": np.linspace(0, 1, 21)},
+        income_changes=np.linspace(-0.1, 0.2, 31),
+        extra_fixed_costs=[0, 250, 500]
+    )
+    assert grid.size == 11 * 21 * 31 * 3
+    for rec in grid.to_records(limit=200)[::17]:
+        expected = scalar_savings_rate(rec["cut_food"], rec["cut_shopping"], rec[INCOME_AXIS], rec[FIXED_COST_AXIS])
+        assert abs(rec["savings_rate"] - expected) < 1e-12
+
+    best = grid.best(1)[0]
+    assert best["cut_food"] == 0.5 and best["cut_shopping"] == 1.0 and best[FIXED_COST_AXIS] == 0
+
+
+def test_sensitivity_table_orientation():
+    grid = run_scenarios(BASELINE, category_cuts={"food": [0, 0.25, 0.5]}, income_changes=[0, 0.1])
+    table = grid.sensitivity_table("cut_food", INCOME_AXIS)
+    assert table.shape == (3, 2)
+    assert np.array_equal(grid.sensitivity_table(INCOME_AXIS, "cut_food"), table.T)
+    assert table[2, 1] > table[0, 0]
+    assert np.all(grid.metrics["runway"] > 12000.0 / 3200.0 - 1e-9)
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from agents.finance import finance_agent
+from core.dependencies import FinanceDependencies
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+from finance.search import DescriptionIndex
+
+NOW = datetime(2026, 3, 15)
+
+
+def expense(description, amount, days_ago):
+    return Transaction(type=TransactionType.EXPENSE, amount=amount, category=TransactionCategory.FOOD,
+                       description=description, date=NOW - timedelta(days=days_ago))
+
+
+def test_exact_and_fuzzy_matches_newest_first():
+    repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    for i, d in enumerate(["Starbucks Coffee", "Whole Foods", "STARBUCKS #1201", "Shell Gas", "Starbucks Coffee"]):
+        repo.add(expense(d, 5 + i, 10 - i))
+
+    exact = repo.search_description("starbucks", 10)
+    assert [t.amount for t in exact] == [9, 7, 5]
+    assert [t.amount for t in repo.search_description("starbucks coffee", 1)] == [9]
+    assert {t.description for t in repo.search_description("starbuks", 10)} == {"Starbucks Coffee", "STARBUCKS #1201"}
+    assert repo.search_description("zzz", 10) == []
+    repo.clear()
+    assert repo.search_description("starbucks", 10) == []
+
+
+def test_million_row_index_outpaces_a_linear_scan():
+    index = DescriptionIndex()
+    merchants = [f"merchant{m} store branch{m % 97}" for m in range(5000)] + ["Starbucks Coffee"]
+    descriptions = [merchants[row % len(merchants)] for row in range(1_000_000)]
+    for row, description in enumerate(descriptions):
+        index.add(row, description)
+    assert len(index) == 1_000_000
+
+    start = time.perf_counter()
+    exact = index.search("starbucks", 50)
+    fuzzy = index.search("starbuks cofee", 50)
+    indexed = time.perf_counter() - start
+    assert len(exact) == 50 and exact[0] == max(r for r in range(1_000_000) if r % 5001 == 5000)
+    assert fuzzy[:50] == exact
+
+    # Relative to the scan it replaces rather than a wall-clock budget, so slow machines do not flake
+    start = time.perf_counter()
+    scanned = [row for row, d in enumerate(descriptions) if "starbucks" in d.lower()][::-1][:50]
+    scan = time.perf_counter() - start
+    assert scanned == exact
+    assert indexed * 5 < scan
+
+
+def test_search_tool_reports_total_without_dumping_history():
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    for i in range(300):
+        expense_repo.add(expense("Starbucks" if i % 10 == 0 else f"Shop {chr(65 + i % 26)}", 4.5, i))
+    deps = FinanceDependencies(expense_repo=expense_repo, income_repo=InMemoryTransactionRepository(TransactionType.INCOME))
+
+    def respond(messages, info):
+        last = messages[-1].parts[-1]
+        if isinstance(last, ToolReturnPart):
+            return ModelResponse(parts=[TextPart(last.content)])
+        return ModelResponse(parts=[ToolCallPart("search_transactions", {"query": "starbucks", "limit": 5})])
+
+    result = asyncio.run(finance_agent.run("How much at Starbucks?", deps=deps, model=FunctionModel(respond)))
+    assert "30 matches | spent $135.00" in result.output
+    assert "25 more matches not listed" in result.output
+
+
+def test_search_tool_flags_truncated_totals(monkeypatch):
+    monkeypatch.setattr("agents.finance.SEARCH_TOTAL_CAP", 20)
+    expense_repo = InMemoryTransactionRepository(TransactionType.EXPENSE)
+    for i in range(30):
+        expense_repo.add(expense("Starbucks", 4.5, i))
+    deps = FinanceDependencies(expense_repo=expense_repo, income_repo=InMemoryTransactionRepository(TransactionType.INCOME))
+
+    def respond(messages, info):
+        last = messages[-1].parts[-1]
+        if isinstance(last, ToolReturnPart):
+            return ModelResponse(parts=[TextPart(last.content)])
+        return ModelResponse(parts=[ToolCallPart("search_transactions", {"query": "starbucks", "limit": 5})])
+
+    result = asyncio.run(finance_agent.run("How much at Starbucks?", deps=deps, model=FunctionModel(respond)))
+    assert "20+ matches (totals cover the first 20 only) | spent $90.00" in result.output
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import numpy as np
+
+from finance.models.finance_goal import FinancialGoal
+from finance.simulation import simulate_goal, simulate_goals
+
+NOW = datetime(2026, 1, 15)
+
+
+def test_deterministic_history_gives_certain_outcomes():
+    flat = [1000.0] * 6
+    reachable = simulate_goal(FinancialGoal(name="Car", target_amount=5000, deadline=datetime(2026, 7, 1)), flat, now=NOW)
+    unreachable = simulate_goal(FinancialGoal(name="House", target_amount=10000, deadline=datetime(2026, 7, 1)), flat, now=NOW)
+
+    assert reachable.months == 6
+    assert reachable.probability == 1.0 and unreachable.probability == 0.0
+    assert reachable.final_percentiles[50] == 6000.0
+
+
+def test_probability_and_bands_are_ordered():
+    history = [2500, -400, 1200, 900, -1500, 3000, 800, 100]
+    goal = FinancialGoal(name="Emergency fund", target_amount=8000, deadline=datetime(2027, 1, 1))
+    result = simulate_goal(goal, history, starting_balance=1000, n_paths=50_000, now=NOW, seed=7)
+
+    assert 0.0 < result.probability < 1.0
+    final = result.final_percentiles
+    assert final[5] < final[25] < final[50] < final[75] < final[95]
+    assert len(result.percentile_bands[50]) == result.months == 12
+
+
+def test_single_goal_matches_path_by_path_simulation():
+    goal = FinancialGoal(name="Trip", target_amount=7000, deadline=datetime(2027, 1, 1))
+    history = [1500, -200, 900, 1100, 400]
+    result = simulate_goal(goal, history, starting_balance=500, n_paths=2_000, now=NOW, seed=3)
+
+    draws = np.random.default_rng(3).choice(np.asarray(history, dtype=np.float64), size=(2_000, result.months))
+    hits = 0
+    for path in draws:
+        balance = 500.0
+        for month in path:
+            balance += month
+            if balance >= goal.target_amount:
+                hits += 1
+                break
+    assert result.probability == hits / 2_000
+
+
+def test_portfolio_uses_process_pool_and_priority_order():
+    goals = [
+        FinancialGoal(name=f"Goal {i}", target_amount=1000 * (i + 1), deadline=datetime(2026, 12, 1), priority=5 - i)
+        for i in range(5)
+    ]
+    results = simulate_goals(goals, [800, 1200, 1000], n_paths=5_000, now=NOW, seed=1, max_workers=2)
+
+    assert [r.goal_name for r in results] == ["Goal 4", "Goal 3", "Goal 2", "Goal 1", "Goal 0"]
+    assert all(r.probability == 1.0 for r in results)
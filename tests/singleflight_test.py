@@ -0,0 +1,70 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from core.concurrency import to_thread
+from core.singleflight import SingleFlight, SingleFlightRepository
+from data.memory import InMemoryTransactionRepository
+from finance.models.enums import TransactionCategory, TransactionType
+from finance.models.transaction import Transaction
+
+
+class SlowRepository(InMemoryTransactionRepository):
+    def __init__(self):
+        super().__init__(TransactionType.EXPENSE)
+        self.queries = 0
+        self.fail = False
+
+    def list_all(self):
+        self.queries += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise ConnectionError("backend down")
+        return super().list_all()
+
+
+def expense(amount):
+    return Transaction(type=TransactionType.EXPENSE, amount=amount, category=TransactionCategory.FOOD,
+                       description="Lunch", date=datetime(2025, 1, 1))
+
+
+def test_concurrent_thread_reads_share_one_query():
+    inner = SlowRepository()
+    inner.add(expense(10))
+    repo = SingleFlightRepository(inner, SingleFlight())
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(lambda _: repo.list_all(), range(20)))
+    assert inner.queries == 1
+    assert all(r == results[0] for r in results)
+    # Each caller gets its own list
+    results[0].clear()
+    assert len(results[1]) == 1
+    assert repo.flight.stats.coalescing_rate == 19 / 20
+
+    # A read that starts after a write does not join a flight started before it
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        before = pool.submit(repo.list_all)
+        while inner.queries < 2:
+            time.sleep(0.001)
+        repo.add(expense(20))
+        after = repo.list_all()
+    before.result()
+    assert len(after) == 2 and inner.queries == 3
+
+
+def test_coroutine_callers_coalesce_on_the_blocking_pool_and_share_errors():
+    inner = SlowRepository()
+    repo = SingleFlightRepository(inner, SingleFlight())
+
+    async def burst():
+        # How sync agent tools and web endpoints reach the repositories
+        return await asyncio.gather(*(to_thread(repo.list_all) for _ in range(10)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert inner.queries == 1 and all(r == [] for r in results)
+
+    inner.fail = True
+    errors = asyncio.run(burst())
+    assert inner.queries == 2
+    assert all(isinstance(e, ConnectionError) for e in errors)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+from core.streaming import AgentStream
+
+
+def build_agent() -> Agent:
+    agent = Agent(TestModel(custom_output_text="Recorded $15.00 under food."))
+
+    @agent.tool_plain
+    def add_expense(amount: float, category: str) -> str:
+        return f"ok {amount} {category}"
+
+    return agent
+
+
+def test_stream_yields_tool_progress_and_text():
+    async def run():
+        stream = AgentStream(build_agent(), "I spent $15 on lunch")
+        return stream, [chunk async for chunk in stream]
+
+    stream, chunks = asyncio.run(run())
+    kinds = [c.kind for c in chunks]
+
+    assert kinds.index("tool_call") < kinds.index("tool_result") < kinds.index("text")
+    assert kinds[-1] == "done"
+    assert "".join(c.content for c in chunks if c.kind == "text") == "Recorded $15.00 under food."
+    assert chunks[-1].content == stream.result.output
+
+    metrics = stream.stats.as_metrics()
+    assert metrics["tool_calls"] == 1
+    assert 0 <= metrics["ttfb"] <= metrics["total_latency"]
+
+
+def test_latency_is_measured_from_run_start():
+    async def run():
+        stream = AgentStream(build_agent(), "I spent $15 on lunch")
+        time.sleep(0.2)
+        return stream, [chunk async for chunk in stream]
+
+    stream, _ = asyncio.run(run())
+    assert stream.stats.total_latency < 0.2
+
+
+def test_stream_endpoint_is_reachable_and_validates_body():
+    from app import app
+
+    async def post_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            return [await client.post("/api/stream", content=body, headers={"content-type": "application/json"})
+                    for body in ("{}", "[]", '"x"', "not json")]
+
+    responses = asyncio.run(post_all())
+    assert [r.status_code for r in responses] == [400, 400, 400, 400]
+    assert responses[0].json()["error"] == "Missing 'query'."
+    assert responses[1].json()["error"] == "Body must be a JSON object."
+
+
+if __name__ == "__main__":
+    test_stream_yields_tool_progress_and_text()
+    test_latency_is_measured_from_run_start()
+    test_stream_endpoint_is_reachable_and_validates_body()
+    print("✅ Streaming test passed.")
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from core import observability
+from core.observability import TelemetryExporter, log_agent_metrics, log_agent_result, track_agent_run
+
+STORE_LATENCY = 0.05
+
+
+class SlowTrackingClient:
+    """
+    Stand-in for MlflowClient against a slow tracking store.
+    """
+    def __init__(self):
+        self.runs = {}
+        self.calls = 0
+        self.threads = set()
+
+    def _call(self):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(STORE_LATENCY)
+
+    def create_run(self, experiment_id, start_time, run_name):
+        self._call()
+        run_id = f"run-{len(self.runs)}"
+        self.runs[run_id] = {"name": run_name}
+        return SimpleNamespace(info=SimpleNamespace(run_id=run_id))
+
+    def log_batch(self, run_id, metrics, params):
+        self._call()
+        self.runs[run_id]["metrics"] = {m.key: m.value for m in metrics}
+        self.runs[run_id]["params"] = {p.key: p.value for p in params}
+
+    def log_text(self, run_id, text, artifact_file):
+        self._call()
+        self.runs[run_id][artifact_file] = text
+
+    def set_terminated(self, run_id, status, end_time):
+        self._call()
+        self.runs[run_id]["status"] = status
+
+
+def test_runs_are_exported_off_the_request_path(monkeypatch):
+    client = SlowTrackingClient()
+    exporter = TelemetryExporter(max_queue=10, flush_interval=0.05, client_factory=lambda: (client, "exp"))
+    monkeypatch.setattr(observability, "telemetry", exporter)
+
+    async def turn(query: str, fail: bool = False):
+        async with track_agent_run("Finance Clerk CLI", "openai:gpt-4o", {"query": query}):
+            log_agent_metrics({"ttfb": 0.2})
+            if fail:
+                raise RuntimeError("model unavailable")
+            log_agent_result(f"answer to {query}")
+
+    asyncio.run(turn("balance?"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(turn("spending?", fail=True))
+
+    assert exporter.flush(timeout=5)
+    ok, failed = client.runs["run-0"], client.runs["run-1"]
+    assert ok["params"] == {"model": "openai:gpt-4o", "input_query": "balance?"}
+    assert ok["metrics"]["ttfb"] == 0.2 and "latency" in ok["metrics"]
+    assert ok["output.txt"] == "answer to balance?" and ok["status"] == "FINISHED"
+    assert failed["status"] == "FAILED" and failed["params"]["error"] == "model unavailable"
+    assert failed["metrics"]["success"] == 0
+    # Every store call ran on the exporter thread, none on the caller's
+    assert client.threads == {"telemetry-exporter"}
+    assert exporter.stats.exported == 2 and exporter.stats.dropped == 0
+    exporter.close()
+
+
+def test_queue_is_bounded_and_drops_are_counted():
+    client = SlowTrackingClient()
+    # A long interval keeps the worker asleep while the burst arrives
+    exporter = TelemetryExporter(max_queue=3, flush_interval=60, client_factory=lambda: (client, "exp"))
+    accepted = [exporter.submit(observability.RunRecord(run_name=f"run {i}")) for i in range(8)]
+
+    assert accepted == [True] * 3 + [False] * 5
+    assert exporter.stats.enqueued == 3 and exporter.stats.dropped == 5
+    assert exporter.flush(timeout=5)
+    assert len(client.runs) == 3 and exporter.queue_depth == 0
+    exporter.close()
+
+
+def test_unreachable_store_is_counted_not_raised():
+    def unavailable():
+        raise ConnectionError("tracking store down")
+
+    exporter = TelemetryExporter(max_queue=5, flush_interval=0.01, client_factory=unavailable)
+    exporter.submit(observability.RunRecord(run_name="lost"))
+    assert exporter.flush(timeout=5)
+    assert exporter.stats.failed == 1 and exporter.stats.exported == 0
+    exporter.close()